@@ -5,6 +5,7 @@ Used for pytest directory-specific hook implementations and directory inclusion
 """
 # Imports #
 # Standard Libraries #
+from pathlib import Path
 from typing import Dict
 from typing import Tuple
 
@@ -18,8 +19,53 @@ import pytest
 # Definitions #
 _test_failed_incremental: Dict[str, Dict[Tuple[int, ...], str]] = {}
 
+BENCHMARK_DIRECTORY = Path(__file__).parent / "tests" / "performance"
+
 
 # Functions #
+def pytest_addoption(parser):
+    """Adds the options of the performance benchmarks."""
+    group = parser.getgroup("benchmark", "performance benchmarks")
+    group.addoption(
+        "--performance",
+        action="store_true",
+        help="Runs the performance benchmarks, which are deselected by default, as does selecting -m performance.",
+    )
+    group.addoption(
+        "--benchmark-json",
+        default=str(Path(__file__).parent / ".benchmarks" / "results.json"),
+        help="The path to write the benchmark results to as JSON.",
+    )
+    group.addoption(
+        "--benchmark-baseline",
+        default=str(BENCHMARK_DIRECTORY / "baseline.json"),
+        help="The path to the local baseline results the benchmarks are compared against, if it exists.",
+    )
+    group.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=0.25,
+        help="The fraction of its baseline time a benchmark may be slower by before it fails.",
+    )
+    group.addoption(
+        "--benchmark-save-baseline",
+        action="store_true",
+        help="Saves the benchmark results as the baseline instead of comparing against it.",
+    )
+    group.addoption(
+        "--benchmark-large",
+        action="store_true",
+        help="Runs the benchmarks of the largest datasets, which take several minutes.",
+    )
+
+
+def pytest_configure(config):
+    """Registers the markers of the test suite."""
+    config.addinivalue_line("markers", "incremental: makes each test in a class depend on the previous tests.")
+    config.addinivalue_line("markers", "performance: a performance benchmark which only runs with --performance.")
+    config.addinivalue_line("markers", "benchmark_large: a benchmark which only runs with --benchmark-large.")
+
+
 def pytest_runtest_makereport(item, call):
     """Handles reports on incremental test calls which are dependent on the success of previous test calls."""
     if "incremental" in item.keywords:
@@ -14,5 +14,6 @@ __email__ = __email__
 # Imports #
 # Local Packages #
 from .dataset import Dataset
+from .participantstable import ParticipantsTable
 from .exporters import *
 from .importers import *
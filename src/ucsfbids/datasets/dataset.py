@@ -11,6 +11,7 @@ __maintainer__ = __maintainer__
 __email__ = __email__
 
 
+from functools import partial
 from pathlib import Path
 from typing import Any
 
@@ -19,6 +20,7 @@ from typing import Any
 from baseobjects import BaseComposite
 
 # Local Packages #
+from ..loading import DatasetIndex, ElectrodeCatalog, LazyChildMap, construct_children, scan_directories
 from ..subjects import Subject
 
 # Third-Party Packages #
@@ -43,6 +45,9 @@ class Dataset(BaseComposite):
         mode: The file mode to set this subject to.
         create: Determines if this subject will be created if it does not exist.
         load: Determines if the sessions will be loaded from the subject's directory.
+        lazy: Determines if the subjects will only be constructed when they are first accessed.
+        use_index: Determines if the dataset tree will be loaded from its persistent index.
+        jobs: The number of threads to load the subjects with.
         init: Determines if this object will construct.
         kwargs: The keyword arguments for inheritance if any.
     """
@@ -60,6 +65,9 @@ class Dataset(BaseComposite):
         mode: str = "r",
         create: bool = False,
         load: bool = True,
+        lazy: bool = False,
+        use_index: bool = False,
+        jobs: int | None = None,
         *,
         init: bool = True,
         **kwargs: Any,
@@ -67,10 +75,13 @@ class Dataset(BaseComposite):
         # New Attributes #
         self._path: Path | None = None
         self._mode: str = "r"
+        self._lazy: bool = False
 
         self.name: str | None = None
+        self.index: DatasetIndex | None = None
+        self.electrode_catalog: ElectrodeCatalog | None = None
 
-        self.subjects: dict[str, Subject] = {}
+        self.subjects: dict[str, Subject] | LazyChildMap = {}
 
         self.importers: dict[str, type] = self.default_importers.copy()
         self.exporters: dict[str, type] = self.default_exporters.copy()
@@ -87,6 +98,9 @@ class Dataset(BaseComposite):
                 mode=mode,
                 create=create,
                 load=load,
+                lazy=lazy,
+                use_index=use_index,
+                jobs=jobs,
                 **kwargs,
             )
 
@@ -112,6 +126,9 @@ class Dataset(BaseComposite):
         mode: str | None = None,
         create: bool = False,
         load: bool = False,
+        lazy: bool | None = None,
+        use_index: bool = False,
+        jobs: int | None = None,
         **kwargs: Any,
     ) -> None:
         """Constructs this object.
@@ -123,6 +140,9 @@ class Dataset(BaseComposite):
             mode: The file mode to set this subject to.
             create: Determines if this subject will be created if it does not exist.
             load: Determines if the sessions will be loaded from the subject's directory.
+            lazy: Determines if the subjects will only be constructed when they are first accessed.
+            use_index: Determines if the dataset tree will be loaded from its persistent index.
+            jobs: The number of threads to load the subjects with.
             kwargs: The keyword arguments for inheritance if any.
         """
         if name is not None:
@@ -134,6 +154,9 @@ class Dataset(BaseComposite):
         if mode is not None:
             self._mode = mode
 
+        if lazy is not None:
+            self._lazy = lazy
+
         if self.path is not None:
             if name is None:
                 self.name = self.path.stem
@@ -142,7 +165,9 @@ class Dataset(BaseComposite):
 
         if self.path is not None:
             if load and self.path.exists():
-                self.load_subjects()
+                if use_index:
+                    self.open_index()
+                self.load_subjects(jobs=jobs)
             elif create:
                 self.create()
 
@@ -153,17 +178,73 @@ class Dataset(BaseComposite):
         assert self.path is not None
         self.path.mkdir(exist_ok=True)
 
-    def load_subjects(self, mode: str | None = None, load: bool = True) -> None:
-        """Loads all sessions in this subject."""
+    def open_index(self, refresh: bool = True, check_meta: bool = False) -> DatasetIndex:
+        """Opens the persistent index of this dataset, creating it if it does not exist.
+
+        Args:
+            refresh: Determines if the index will be updated from the directories whose modification times changed.
+            check_meta: Determines if the meta information files will be checked for changes when refreshed.
+
+        Returns:
+            The index of this dataset.
+        """
+        if self.index is None:
+            self.index = DatasetIndex(root=self.path, refresh=refresh, check_meta=check_meta)
+        elif refresh:
+            self.index.refresh(check_meta=check_meta)
+        return self.index
+
+    def open_electrode_catalog(self, refresh: bool = True, jobs: int | None = None) -> ElectrodeCatalog:
+        """Opens the persistent catalog of the electrodes of every subject and session, creating it if needed.
+
+        Args:
+            refresh: Determines if the catalog will be updated from the electrode tables which changed.
+            jobs: The number of threads to load the changed electrode tables with, uses the number of CPUs if None.
+
+        Returns:
+            The electrode catalog of this dataset.
+        """
+        if self.electrode_catalog is None:
+            self.electrode_catalog = ElectrodeCatalog(root=self.path, refresh=refresh, jobs=jobs)
+        elif refresh:
+            self.electrode_catalog.refresh(jobs=jobs)
+        return self.electrode_catalog
+
+    def close_index(self) -> None:
+        """Closes the persistent index of this dataset."""
+        if self.index is not None:
+            self.index.close()
+            self.index = None
+
+    def load_subjects(
+        self,
+        mode: str | None = None,
+        load: bool = True,
+        lazy: bool | None = None,
+        jobs: int | None = None,
+    ) -> None:
+        """Loads all sessions in this subject.
+
+        Args:
+            mode: The file mode to set the subjects to, defaults to the dataset's mode.
+            load: Determines if the subjects will load their sessions.
+            lazy: Determines if the subjects will only be constructed when they are first accessed.
+            jobs: The number of threads to load the subjects with, loads them serially if None or 1.
+        """
         m = self._mode if mode is None else mode
-        self.subjects.clear()
-        self.subjects.update(
-            {
-                s.name: s
-                for p in self.path.iterdir()
-                if p.is_dir() and (s := Subject(path=p, mode=m, load=load)) is not None
-            },
-        )
+        lazy = self._lazy if lazy is None else lazy
+        paths = None if self.index is None else self.index.get_children(self.path)
+        if paths is None:
+            paths = scan_directories(self.path, prefix=4)
+        factory = partial(Subject, mode=m, load=load, lazy=lazy, index=self.index)
+
+        if lazy:
+            self.subjects = LazyChildMap(factory=factory, paths=paths)
+        else:
+            if isinstance(self.subjects, LazyChildMap):
+                self.subjects = {}
+            self.subjects.clear()
+            self.subjects.update(construct_children(factory, paths, jobs=jobs))
 
     def generate_latest_subject_name(self) -> str:
         """Generates a session name for a new latest session.
@@ -213,8 +294,8 @@ class Dataset(BaseComposite):
     def create_importer(self, type_: str, src_root: Path | None, **kwargs) -> Any:
         return self.importers[type_](dataset=self, src_root=src_root, **kwargs)
 
-    def create_exporter(self, type_: str) -> Any:
-        return self.exporters[type_](dataset=self)
+    def create_exporter(self, type_: str, **kwargs) -> Any:
+        return self.exporters[type_](dataset=self, **kwargs)
 
     def add_importer(self, type_: str, importer: type, overwrite: bool = False):
         if type_ not in self.importers or overwrite:
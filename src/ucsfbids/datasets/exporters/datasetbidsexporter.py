@@ -11,7 +11,11 @@ __maintainer__ = __maintainer__
 __email__ = __email__
 
 
-import shutil
+import os
+import traceback
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Any
 
@@ -20,6 +24,10 @@ from typing import Any
 from baseobjects import BaseObject
 
 # Local Packages #
+from ...importspec import TaskResult
+from ...modalities.exporters import ModalityBIDSExporter
+from ...subjects import Subject
+from ...transfer import ArchiveWriter, BlobStore, CopyEngine, DestinationLimiter, destination_limiter, prune_manifests
 from ..dataset import Dataset
 
 # Third-Party Packages #
@@ -28,6 +36,10 @@ from ..dataset import Dataset
 # Definitions #
 # Classes #
 class DatasetBIDSExporter(BaseObject):
+    copy_engine: CopyEngine = CopyEngine()
+    # The limiter which caps the subjects exported to the same destination at once, shared by all exporters.
+    destination_limiter: DestinationLimiter = destination_limiter
+
     # Magic Methods #
     # Construction/Destruction
     def __init__(
@@ -39,6 +51,12 @@ class DatasetBIDSExporter(BaseObject):
     ) -> None:
         # New Attributes #
         self.dataset: Dataset | None = None
+        self.blob_store: BlobStore | None = None
+        self.view: bool = False
+        self.sync: bool = False
+        self.prune: bool = False
+        self.record_manifest: bool = False
+        self.archive: ArchiveWriter | None = None
 
         # Parent Attributes #
         super().__init__(init=False)
@@ -55,33 +73,248 @@ class DatasetBIDSExporter(BaseObject):
     def construct(
         self,
         dataset: Dataset | None = None,
+        copy_engine: CopyEngine | None = None,
+        blob_store: BlobStore | None = None,
+        view: bool | None = None,
+        sync: bool | None = None,
+        prune: bool | None = None,
+        record_manifest: bool | None = None,
+        destination_limiter: DestinationLimiter | None = None,
+        archive: ArchiveWriter | None = None,
         **kwargs: Any,
     ) -> None:
         """Constructs this object.
 
         Args:
+            copy_engine: The engine which copies the files of the dataset directory, uses the class engine if None.
+            blob_store: The store which the exported files of the subjects are stored in and linked from, copies them
+                if None.
+            view: Determines if the exported files will be hardlinks to the files of the dataset, or symlinks when the
+                export is on another file system, instead of copies.
+            sync: Determines if the files which changed since they were exported will be exported again, instead of
+                only exporting the files which are not in the export.
+            prune: Determines if a sync will remove the exported files whose sources are no longer exported.
+            record_manifest: Determines if the digests of the exported files will be recorded in a manifest in each
+                exported directory, which a sync always does.
+            destination_limiter: The limiter which caps the subjects exported to a destination at once, uses the
+                class limiter if None.
+            archive: The archive to write the exported files into, which paths are then within, instead of a directory.
             kwargs: The keyword arguments for inheritance if any.
         """
         if dataset is not None:
             self.dataset = dataset
 
+        if copy_engine is not None:
+            self.copy_engine = copy_engine
+
+        if blob_store is not None:
+            self.blob_store = blob_store
+
+        if view is not None:
+            self.view = view
+
+        if sync is not None:
+            self.sync = sync
+
+        if prune is not None:
+            self.prune = prune
+
+        if record_manifest is not None:
+            self.record_manifest = record_manifest
+
+        if destination_limiter is not None:
+            self.destination_limiter = destination_limiter
+
+        if archive is not None:
+            self.archive = archive
+
         super().construct(**kwargs)
 
-    def export_subjects(self, path: Path, sub_name_map: dict[str, str]):
+    def create_subject_exporter(self, subject: Subject) -> Any:
+        """Creates the exporter of a subject.
+
+        Args:
+            subject: The subject to export.
+
+        Returns:
+            The exporter of the subject.
+        """
+        return subject.create_exporter(
+            "BIDS",
+            blob_store=self.blob_store,
+            view=self.view,
+            sync=self.sync,
+            prune=self.prune,
+            record_manifest=self.record_manifest,
+            archive=self.archive,
+        )
+
+    def _export_subject(
+        self,
+        item: tuple[Subject, Any],
+        path: Path,
+        new_name: str,
+        limiter: DestinationLimiter,
+    ) -> TaskResult:
+        subject, exporter = item
+        assert subject.name is not None
+        try:
+            # An archive export is limited by the file system of the archive rather than the path within it.
+            with limiter.slot(path if self.archive is None else self.archive.path):
+                exporter.execute_export(path, new_name)
+        except Exception:
+            return TaskResult(subject.name, False, traceback.format_exc())
+        return TaskResult(subject.name, True)
+
+    def export_subjects(
+        self,
+        path: Path,
+        sub_name_map: dict[str, str],
+        jobs: int | None = None,
+        limiter: DestinationLimiter | None = None,
+    ) -> list[TaskResult]:
+        """Exports the subjects of the dataset.
+
+        Each subject export is a chain of copies, which is bound by the latency of each copy on a network share rather
+        than by its bandwidth, so when jobs is more than one the subjects are exported concurrently by threads. A
+        failed subject is reported in the results instead of raised, serially or not, so it does not stop the other
+        subjects. The destination limiter caps the subjects exported to the destination at once across all exports.
+
+        Args:
+            path: The path to the dataset directory to export into.
+            sub_name_map: The names of the subjects in the export keyed by their names in the dataset.
+            jobs: The number of threads to export the subjects with, exports them serially if None or 1.
+            limiter: The limiter which caps the subjects exported to the destination at once, uses the destination
+                limiter of this exporter if None.
+
+        Returns:
+            The name of each subject and whether its export succeeded.
+        """
         assert self.dataset is not None
-        for subject in self.dataset.subjects.values():
-            assert subject.name is not None
-            new_name = sub_name_map[subject.name]
-            subject.create_exporter("BIDS").execute_export(path, new_name)
+        if limiter is None:
+            limiter = self.destination_limiter
+        # The exporters are created before any thread starts, since creating one can register it on the subject.
+        items = [(s, self.create_subject_exporter(s)) for s in self.dataset.subjects.values()]
+        if jobs is None or jobs <= 1:
+            return [self._export_subject(item, path, sub_name_map[item[0].name], limiter) for item in items]
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(self._export_subject, item, path, sub_name_map[item[0].name], limiter)
+                for item in items
+            ]
+            return [f.result() for f in futures]
+
+    def prune_subjects(self, path: Path, names: Iterable[str]) -> list[Path]:
+        """Removes the exported files of the subject directories in an export which are not in a set of names.
 
-    def execute_export(self, path: Path, name: str, sub_name_map: dict[str, str]) -> None:
+        Only the files recorded in the export manifests are removed, along with the directories they leave empty.
+
+        Args:
+            path: The path to the exported dataset directory.
+            names: The names of the subjects in the export to keep.
+
+        Returns:
+            The paths to the removed files.
+        """
+        keep = {f"sub-{n}" for n in names}
+        removed = []
+        for subject_path in path.glob("sub-*"):
+            if subject_path.is_dir() and subject_path.name not in keep:
+                removed.extend(prune_manifests(subject_path, ModalityBIDSExporter.manifest_name))
+        return removed
+
+    def _is_synced(self, source: Path, target: Path) -> bool:
+        try:
+            target_stat = os.stat(target)
+        except FileNotFoundError:
+            return False
+        source_stat = os.stat(source)
+        return source_stat.st_size == target_stat.st_size and source_stat.st_mtime_ns == target_stat.st_mtime_ns
+
+    def execute_export(
+        self,
+        path: Path,
+        name: str,
+        sub_name_map: dict[str, str],
+        jobs: int | None = None,
+        destination_limit: int | None = None,
+    ) -> list[TaskResult]:
+        """Exports the dataset.
+
+        With sync, only the files which changed since the last export are exported, and with prune, the files of the
+        subjects which are no longer exported are removed along with the files whose sources were removed.
+
+        Args:
+            path: The path to the directory to export the dataset into.
+            name: The name of the exported dataset directory.
+            sub_name_map: The names of the subjects in the export keyed by their names in the dataset.
+            jobs: The number of threads to export the subjects with, exports them serially if None or 1.
+            destination_limit: The maximum number of subjects of this export exported at once, which replaces the
+                destination limiter for this export only. Uses the destination limiter if None.
+
+        Returns:
+            The name of each subject and whether its export succeeded, which reports a failed subject instead of
+            raising it.
+        """
         new_path = path / name
-        new_path.mkdir(exist_ok=True)
         assert self.dataset is not None
         assert self.dataset.path is not None
+        limiter = None
+        if destination_limit is not None:
+            limiter = DestinationLimiter({new_path if self.archive is None else self.archive.path: destination_limit})
+
+        if self.archive is not None:
+            for file in [f for f in self.dataset.path.iterdir() if f.is_file()]:
+                self.archive.add_file(file, new_path / file.name)
+            return self.export_subjects(path=new_path, sub_name_map=sub_name_map, jobs=jobs, limiter=limiter)
+
+        new_path.mkdir(exist_ok=True)
         for file in [f for f in self.dataset.path.iterdir() if f.is_file()]:
-            shutil.copy2(file, new_path / file.name)
-        self.export_subjects(path=new_path, sub_name_map=sub_name_map)
+            # The copies keep the times of the dataset files, so a sync skips the files with the same size and time.
+            if not (self.sync and self._is_synced(file, new_path / file.name)):
+                # The dataset files, such as the participants table, are often edited after an export, so never linked.
+                self.copy_engine.copy(file, new_path / file.name, metadata=True, link=False)
+        results = self.export_subjects(path=new_path, sub_name_map=sub_name_map, jobs=jobs, limiter=limiter)
+        if self.sync and self.prune:
+            self.prune_subjects(new_path, (sub_name_map[s] for s in self.dataset.subjects))
+        return results
+
+    def export_archive(
+        self,
+        path: Path,
+        name: str,
+        sub_name_map: dict[str, str],
+        format: str | None = None,
+        volume_size: int | None = None,
+        jobs: int | None = None,
+    ) -> tuple[list[Path], list[TaskResult]]:
+        """Exports the dataset directly into a tar, tar.gz, or zip archive without staging it in a directory.
+
+        The files are streamed into the archive under the dataset directory name with their export names, so each
+        file is read once and written once. The files of the subjects are written one at a time, even with jobs, since
+        an archive is a single stream. An archive export is always a full export, so the sync, prune, view, and blob
+        store options do not apply to it.
+
+        Args:
+            path: The path to the archive, or the name the volume paths are derived from when split into volumes.
+            name: The name of the exported dataset directory within the archive.
+            sub_name_map: The names of the subjects in the export keyed by their names in the dataset.
+            format: The format of the archive, "tar", "tar.gz", or "zip", derived from the suffixes of the path if None.
+            volume_size: The maximum size of each volume in bytes, writes one archive if None.
+            jobs: The number of threads to export the subjects with, exports them serially if None or 1.
+
+        Returns:
+            The paths to the written volumes, and the name of each subject and whether its export succeeded.
+        """
+        previous = self.archive
+        with ArchiveWriter(path, format=format, volume_size=volume_size) as archive:
+            self.archive = archive
+            try:
+                results = self.execute_export(Path(), name, sub_name_map, jobs=jobs)
+            finally:
+                self.archive = previous
+        return archive.volumes, results
 
 
 # Assign Exporter
@@ -1,14 +1,38 @@
 from pathlib import Path
+from typing import Any
 
 from ucsfbids.datasets.exporters import DatasetBIDSExporter
+from ucsfbids.subjects import Subject
 from ucsfbids.subjects.exporters.subjectupennexporter import SubjectUPENNExporter
 
 
 class DatasetUPENNExporter(DatasetBIDSExporter):
-    def export_subjects(self, path: Path, sub_name_map: dict[str, str]):
-        assert self.dataset is not None
-        for subject in self.dataset.subjects.values():
-            subject.add_exporter("UPENN", SubjectUPENNExporter)
-            assert subject.name is not None
-            new_name = sub_name_map[subject.name]
-            subject.create_exporter("UPENN").execute_export(path, new_name)
+    def check_modes(self) -> None:
+        """Checks that no export mode is set which the UPENN session exporters do not support.
+
+        Raises:
+            ValueError: If the archive, view, sync, prune, record manifest, or blob store mode is set.
+        """
+        modes = {
+            "archive": self.archive is not None,
+            "view": self.view,
+            "sync": self.sync,
+            "prune": self.prune,
+            "record_manifest": self.record_manifest,
+            "blob_store": self.blob_store is not None,
+        }
+        unsupported = [m for m, is_set in modes.items() if is_set]
+        if unsupported:
+            raise ValueError(f"The UPENN export does not support the {', '.join(unsupported)} mode(s).")
+
+    def create_subject_exporter(self, subject: Subject) -> Any:
+        self.check_modes()
+        subject.add_exporter("UPENN", SubjectUPENNExporter)
+        return subject.create_exporter("UPENN")
+
+    def execute_export(self, path: Path, name: str, sub_name_map: dict[str, str], **kwargs: Any) -> list:
+        self.check_modes()
+        return super().execute_export(path, name, sub_name_map, **kwargs)
+
+    def export_archive(self, path: Path, name: str, sub_name_map: dict[str, str], **kwargs: Any) -> tuple:
+        raise ValueError("The UPENN export does not support the archive mode.")
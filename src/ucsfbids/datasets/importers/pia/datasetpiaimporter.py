@@ -8,15 +8,20 @@ __credits__ = __credits__
 __email__ = __email__
 
 import json
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any, List, Optional
 
 import pandas as pd
 
-from ucsfbids.datasets import Dataset
+from ucsfbids.datasets import Dataset, ParticipantsTable
 from ucsfbids.datasets.importers import DatasetImporter
+from ucsfbids.importspec import ImportAction, SubjectImportTask, TaskResult, create_plan_frame, resolve_import_plan
 from ucsfbids.subjects import Subject
 from ucsfbids.subjects.importers.pia import SubjectPiaImporter
+from ucsfbids.subjects.importers.subjectimporter import run_subject_import_task
+from ucsfbids.transfer import BlobStore, CommandPool, ImportJournal, SourceInventory
 
 DEFAULT_DESC = {
     "Name": "Default name, should be updated",
@@ -52,6 +57,10 @@ def _update_ignore(path, entries):
 
 
 class DatasetPiaImporter(DatasetImporter):
+    source_directory: Path = Path("data_store2/imaging/subjects")
+    # The keys of the subject meta information to add as participant columns, mapped to the names of the columns.
+    participant_meta_columns: dict[str, str] = {}
+
     def _process_subjects(self, subjects: list[str]):
         assert self.dataset is not None
 
@@ -78,26 +87,208 @@ class DatasetPiaImporter(DatasetImporter):
             self._process_subjects(subjects)
         super().construct(process=False, **kwargs)
 
-    def import_subjects(self, path: Path, source_patients: list[str], overwrite: bool = False):
+    def _read_participants(self, path: Path) -> ParticipantsTable:
+        return ParticipantsTable(path / "participants.tsv")
+
+    def _pending_subjects(
+        self,
+        participants: ParticipantsTable,
+        source_patients: list[str],
+        overwrite: bool = False,
+    ) -> list[tuple[Subject, str]]:
         assert self.dataset is not None
+        return [
+            (subject, source_patient)
+            for subject, source_patient in zip(self.dataset.subjects.values(), source_patients)
+            if overwrite or subject.name not in participants
+        ]
+
+    def plan_subjects(
+        self,
+        path: Path,
+        source_patients: list[str],
+        overwrite: bool = False,
+        jobs: int | None = None,
+        inventory: SourceInventory | None = None,
+    ) -> list[ImportAction]:
+        """Plans the import of the subjects by resolving the source of every file without importing any.
+
+        The candidate source paths of every file of every subject are stated together in one batch.
 
-        participants_tsv_path = path / "participants.tsv"
-        if participants_tsv_path.is_file():
-            participants_tsv_data = pd.read_csv(participants_tsv_path, sep="\t")
-        else:
-            participants_tsv_data = pd.DataFrame(columns=["participant_id"])
-
-        for subject, source_patient in zip(self.dataset.subjects.values(), source_patients):
-            if subject in participants_tsv_data["participant_id"].values and not overwrite:
-                continue
-            subject.create_importer("Pia", self.src_root).execute_import(path, source_patient)
-            subject_frame = pd.DataFrame(data=[subject.name], columns=["participant_id"])
-            participants_tsv_data = pd.concat(
-                [participants_tsv_data, subject_frame],
-                ignore_index=True,
+        Args:
+            path: The path to the dataset directory to import into.
+            source_patients: The names of the source patients in the same order as the subjects.
+            overwrite: Determines if subjects already in the participants file will be planned again.
+            jobs: The number of threads to stat the source paths with, stats them serially if None or 1.
+            inventory: The inventory of the source which the source paths are looked up in instead of stated.
+
+        Returns:
+            The resolved import actions of every file.
+        """
+        pending = self._pending_subjects(self._read_participants(path), source_patients, overwrite)
+        actions = [
+            action
+            for subject, source_patient in pending
+            for action in subject.create_importer("Pia", self.src_root, inventory=inventory).plan_import(
+                path, source_patient
             )
+        ]
+        return resolve_import_plan(actions, jobs=jobs, inventory=inventory)
+
+    def _import_subject(
+        self,
+        subject: Subject,
+        path: Path,
+        source_patient: str,
+        command_pool: CommandPool | None = None,
+        **kwargs: Any,
+    ) -> TaskResult:
+        """Imports a subject in this process, reporting a failure in the result instead of raising it.
+
+        Args:
+            subject: The subject to import.
+            path: The path to the dataset directory to import into.
+            source_patient: The name of the source patient.
+            command_pool: The pool which runs external commands in the background, runs them in place if None.
+            kwargs: The keyword arguments of the subject importer.
+
+        Returns:
+            The name of the subject and whether its import succeeded.
+        """
+        assert subject.name is not None
+        try:
+            importer = subject.create_importer("Pia", self.src_root, command_pool=command_pool, **kwargs)
+            importer.execute_import(path, source_patient)
+            # The commands of the subject finish before its result, so their failures are reported by the subject.
+            if command_pool is not None:
+                command_pool.wait()
+        except Exception:
+            return TaskResult(subject.name, False, traceback.format_exc())
+        return TaskResult(subject.name, True)
 
-        participants_tsv_data.to_csv(participants_tsv_path, sep="\t")
+    def import_subjects(
+        self,
+        path: Path,
+        source_patients: list[str],
+        overwrite: bool = False,
+        jobs: int | None = None,
+        journal: ImportJournal | None = None,
+        inventory: SourceInventory | None = None,
+        command_pool: CommandPool | None = None,
+        blob_store: BlobStore | None = None,
+        modality_jobs: int | None = None,
+        record_hashes: bool = False,
+    ) -> list[TaskResult]:
+        """Imports the subjects and adds them to the participants file.
+
+        When jobs is more than one, each subject is imported in a worker process from a picklable description. A
+        failed subject is reported in the results instead of raised, so it does not stop the other subjects, and the
+        subjects which succeeded are always saved to the participants file, even when the import is interrupted.
+
+        Args:
+            path: The path to the dataset directory to import into.
+            source_patients: The names of the source patients in the same order as the subjects.
+            overwrite: Determines if subjects already in the participants file will be imported again.
+            jobs: The number of processes to import the subjects with, imports them serially if None or 1.
+            journal: The journal which records the imported files so an interrupted import can be resumed.
+            inventory: The inventory of the source which the source files are looked up in.
+            command_pool: The pool which runs external commands in the background, runs them in place if None.
+            blob_store: The store which the imported files are stored in and linked from, copies them if None.
+            modality_jobs: The number of threads each session imports its modalities with, serially if None or 1.
+            record_hashes: Determines if the digests of the imported files will be recorded in their import manifests.
+
+        Returns:
+            The name of each subject and whether its import succeeded.
+        """
+        assert self.dataset is not None
+
+        participants = self._read_participants(path)
+        pending = self._pending_subjects(participants, source_patients, overwrite)
+        results = []
+        try:
+            if jobs is None or jobs <= 1:
+                for subject, source_patient in pending:
+                    result = self._import_subject(
+                        subject,
+                        path,
+                        source_patient,
+                        command_pool=command_pool,
+                        journal=journal,
+                        inventory=inventory,
+                        blob_store=blob_store,
+                        modality_jobs=modality_jobs,
+                        record_hashes=record_hashes,
+                    )
+                    results.append(result)
+            else:
+                self._import_subject_tasks(
+                    path=path,
+                    pending=pending,
+                    results=results,
+                    jobs=jobs,
+                    journal=journal,
+                    inventory=inventory,
+                    command_pool=command_pool,
+                    blob_store=blob_store,
+                    modality_jobs=modality_jobs,
+                    record_hashes=record_hashes,
+                )
+        finally:
+            subjects = {s.name: s for s, _ in pending}
+            for result in results:
+                if result.succeeded:
+                    participants.upsert_subject(subjects[result.name], self.participant_meta_columns)
+            participants.save()
+        return results
+
+    def _import_subject_tasks(
+        self,
+        path: Path,
+        pending: list[tuple[Subject, str]],
+        results: list[TaskResult],
+        jobs: int,
+        journal: ImportJournal | None = None,
+        inventory: SourceInventory | None = None,
+        command_pool: CommandPool | None = None,
+        blob_store: BlobStore | None = None,
+        modality_jobs: int | None = None,
+        record_hashes: bool = False,
+    ) -> None:
+        """Imports subjects in worker processes, appending each result as soon as it is available.
+
+        Args:
+            path: The path to the dataset directory to import into.
+            pending: The subjects to import and the names of their source patients.
+            results: The list to append the results to, which keeps the finished results if the import is interrupted.
+            jobs: The number of processes to import the subjects with.
+            journal: The journal which records the imported files so an interrupted import can be resumed.
+            inventory: The inventory of the source which the source files are looked up in.
+            command_pool: The pool which runs external commands in the background, runs them in place if None.
+            blob_store: The store which the imported files are stored in and linked from, copies them if None.
+            modality_jobs: The number of threads each session imports its modalities with, serially if None or 1.
+            record_hashes: Determines if the digests of the imported files will be recorded in their import manifests.
+        """
+        tasks = [
+            SubjectImportTask(
+                subject_path=subject.path,
+                mode=subject._mode,
+                importer_key="Pia",
+                importer_type=subject.importers["Pia"],
+                src_root=self.src_root,
+                path=path,
+                source_patient=source_patient,
+                journal=journal,
+                inventory=None if inventory is None else inventory.select([source_patient]),
+                command_pool=command_pool,
+                blob_store=blob_store,
+                modality_jobs=modality_jobs,
+                record_hashes=record_hashes,
+            )
+            for subject, source_patient in pending
+        ]
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for result in executor.map(run_subject_import_task, tasks):
+                results.append(result)
 
     def execute_import(
         self,
@@ -107,7 +298,57 @@ class DatasetPiaImporter(DatasetImporter):
         desc: dict = DEFAULT_DESC,
         ignore_entries: list[str] = ["ct\n"],
         participants_json_data: dict = DEFAULT_PARTICIPANT_JSON,
-    ) -> None:
+        jobs: int | None = None,
+        overwrite: bool = False,
+        resume: bool = False,
+        dry_run: bool = False,
+        command_jobs: int | None = None,
+        command_timeout: float | None = None,
+        deduplicate: bool = False,
+        blob_store: BlobStore | None = None,
+        modality_jobs: int | None = None,
+        stat_jobs: int | None = None,
+        record_hashes: bool = False,
+    ) -> list[TaskResult] | pd.DataFrame:
+        """Imports the dataset from Pia.
+
+        The source directories of all subjects are listed into an inventory that every importer resolves its source
+        files against, instead of stating each candidate file separately. A dry run resolves the whole plan at once
+        and returns it, while an import resolves the files of each subject as it imports them.
+
+        Every imported file is recorded in a journal in the dataset, so an import which was interrupted can be resumed.
+        Resuming skips the files which were committed and removes the partial files of the imports which were not.
+
+        Args:
+            path: The path to the directory to create the dataset in.
+            source_patients: The names of the source patients in the same order as the subjects.
+            name: The name of the dataset directory.
+            desc: The dataset description.
+            ignore_entries: The entries to add to the .bidsignore file.
+            participants_json_data: The description of the participants file columns.
+            jobs: The number of processes to import the subjects with, imports them serially if None or 1.
+            overwrite: Determines if subjects already in the participants file will be imported again.
+            resume: Determines if the journal of a previous import will be resumed, otherwise it is cleared.
+            dry_run: Determines if the import will only be planned, which returns the plan without importing any files.
+            command_jobs: The number of external commands, such as conversions, each process runs in the background
+                while it continues copying. Commands are run in place if None.
+            command_timeout: The number of seconds after which an external command is killed, None for no limit.
+            deduplicate: Determines if the copied files will be stored once by their contents in a store in the dataset
+                and linked into place, so identical files share their disk space.
+            blob_store: The store to deduplicate the copied files in, which can be shared by datasets on the same file
+                system. Uses a store in the dataset if None and deduplicate is True.
+            modality_jobs: The number of threads each session imports its modalities with, such as a conversion, a
+                large copy, and parsing side by side. Imports them serially if None or 1.
+            stat_jobs: The number of threads a dry run lists the source directories with, serially if None or 1.
+            record_hashes: Determines if the digests of the imported files will be recorded in their import manifests,
+                so the import can be verified. This reads every imported file through this process, which is slower
+                than a copy within the kernel, so only the sizes and times which detect changed files are recorded
+                if False.
+
+        Returns:
+            The name of each subject and whether its import succeeded, or the import plan with one row per file when
+            dry_run is True.
+        """
         assert self.dataset is not None
         if name is None:
             name = self.dataset.name
@@ -118,6 +359,17 @@ class DatasetPiaImporter(DatasetImporter):
         assert name is not None
 
         new_path = path / name
+        inventory = SourceInventory(self.src_root / self.source_directory)
+        if dry_run:
+            plan = self.plan_subjects(
+                path=new_path,
+                source_patients=source_patients,
+                overwrite=overwrite,
+                jobs=stat_jobs,
+                inventory=inventory,
+            )
+            return create_plan_frame(plan)
+
         new_path.mkdir(exist_ok=True)
 
         desc_path = new_path / "dataset_description.json"
@@ -128,4 +380,25 @@ class DatasetPiaImporter(DatasetImporter):
         _update_ignore(ignore_path, ignore_entries)
         _update_json(participants_json_path, participants_json_data)
 
-        self.import_subjects(path=new_path, source_patients=source_patients)
+        journal = ImportJournal(new_path / ImportJournal.default_directory, resume=resume)
+        journal.recover()
+        command_pool = None if command_jobs is None else CommandPool(command_jobs, timeout=command_timeout)
+        if blob_store is None and deduplicate:
+            blob_store = BlobStore(new_path / BlobStore.default_directory)
+        try:
+            return self.import_subjects(
+                path=new_path,
+                source_patients=source_patients,
+                overwrite=overwrite,
+                jobs=jobs,
+                journal=journal,
+                inventory=inventory,
+                command_pool=command_pool,
+                blob_store=blob_store,
+                modality_jobs=modality_jobs,
+                record_hashes=record_hashes,
+            )
+        finally:
+            if command_pool is not None:
+                command_pool.shutdown()
+            journal.close()
@@ -0,0 +1,193 @@
+"""participantstable.py
+A buffered participants table which upserts rows by participant and writes its file once.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import csv
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+import pandas as pd
+
+# Local Packages #
+
+
+# Definitions #
+# Constants #
+MISSING_VALUE = "n/a"
+
+
+# Classes #
+class ParticipantsTable(BaseObject):
+    """A buffered participants table which upserts rows by participant and writes its file once.
+
+    The rows are kept in a dictionary keyed by participant ID, so adding or updating a participant takes constant time
+    and a participant is never listed twice. The file is only written when the table is saved, and is replaced
+    atomically so an interrupted write cannot leave a partial table. Missing values are written as "n/a".
+
+    Attributes:
+        path: The path to the participants file.
+        columns: The names of the columns in order, starting with participant_id.
+        rows: The values of each participant keyed by participant ID.
+
+    Args:
+        path: The path to the participants file.
+        load: Determines if the table will be loaded from its file if it exists.
+        init: Determines if this object will construct.
+        kwargs: The keyword arguments for inheritance if any.
+    """
+
+    id_column: str = "participant_id"
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        load: bool = True,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self.path: Path | None = None
+        self.columns: list[str] = [self.id_column]
+        self.rows: dict[str, dict[str, Any]] = {}
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(path=path, load=load, **kwargs)
+
+    def __len__(self) -> int:
+        """The number of participants in the table."""
+        return len(self.rows)
+
+    def __contains__(self, participant_id: Any) -> bool:
+        """Determines if a participant is in the table."""
+        return participant_id in self.rows
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(self, path: Path | str | None = None, load: bool = True, **kwargs: Any) -> None:
+        """Constructs this object.
+
+        Args:
+            path: The path to the participants file.
+            load: Determines if the table will be loaded from its file if it exists.
+            kwargs: The keyword arguments for inheritance if any.
+        """
+        if path is not None:
+            self.path = Path(path)
+
+        super().construct(**kwargs)
+
+        if load and self.path is not None and self.path.is_file():
+            self.load()
+
+    def load(self) -> None:
+        """Loads the rows from the participants file, merging the rows of participants listed more than once."""
+        self.columns = [self.id_column]
+        self.rows.clear()
+        with self.path.open("r", newline="") as file:
+            for row in csv.DictReader(file, delimiter="\t"):
+                # Tables written with a pandas index have it as an unnamed first column.
+                row.pop("", None)
+                participant_id = row.pop(self.id_column, None)
+                if participant_id:
+                    for column in row:
+                        if column is not None and column not in self.columns:
+                            self.columns.append(column)
+                    values = {k: v for k, v in row.items() if k is not None and v not in ("", MISSING_VALUE)}
+                    self.upsert(participant_id, **values)
+
+    def save(self) -> None:
+        """Writes the table to the participants file, replacing it atomically."""
+        temporary_path = self.path.with_name(f".{self.path.name}.tmp")
+        try:
+            with temporary_path.open("w", newline="") as file:
+                writer = csv.writer(file, delimiter="\t", lineterminator="\n")
+                writer.writerow(self.columns)
+                for participant_id, values in self.rows.items():
+                    writer.writerow([participant_id, *(self._format(values.get(c, None)) for c in self.columns[1:])])
+            os.replace(temporary_path, self.path)
+        finally:
+            temporary_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _format(value: Any) -> Any:
+        if value is None or value == "" or (isinstance(value, float) and value != value):
+            return MISSING_VALUE
+        return value
+
+    def get(self, participant_id: str) -> dict[str, Any] | None:
+        """Gets the values of a participant.
+
+        Args:
+            participant_id: The ID of the participant.
+
+        Returns:
+            The values of the participant keyed by column, None if the participant is not in the table.
+        """
+        return self.rows.get(participant_id, None)
+
+    def upsert(self, participant_id: str, **values: Any) -> None:
+        """Adds a participant or updates the values of a participant, adding any new columns.
+
+        Args:
+            participant_id: The ID of the participant.
+            **values: The values of the participant keyed by column.
+        """
+        for column in values:
+            if column not in self.columns:
+                self.columns.append(column)
+        self.rows.setdefault(participant_id, {}).update(values)
+
+    def upsert_subject(self, subject: Any, meta_columns: dict[str, str] | Iterable[str] = ()) -> None:
+        """Adds or updates a subject, with columns from the meta information of the subject.
+
+        Args:
+            subject: The subject to add, which is keyed by its name.
+            meta_columns: The keys of the meta information to add as columns, or a dictionary of the keys and the
+                names of their columns.
+        """
+        if not isinstance(meta_columns, dict):
+            meta_columns = {k: k for k in meta_columns}
+        meta_info = subject.meta_info
+        self.upsert(subject.name, **{c: meta_info[k] for k, c in meta_columns.items() if k in meta_info})
+
+    def remove(self, participant_id: str) -> dict[str, Any] | None:
+        """Removes a participant.
+
+        Args:
+            participant_id: The ID of the participant.
+
+        Returns:
+            The values of the removed participant, None if the participant was not in the table.
+        """
+        return self.rows.pop(participant_id, None)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Creates a DataFrame of the table.
+
+        Returns:
+            The table with one row per participant.
+        """
+        rows = [{self.id_column: k, **v} for k, v in self.rows.items()]
+        return pd.DataFrame(rows, columns=self.columns)
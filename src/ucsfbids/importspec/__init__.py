@@ -8,3 +8,5 @@ __email__ = __email__
 from .filespec import FileSpec
 from .modalityspec import ModalitySpec
 from .sessionspec import SessionSpec
+from .importtask import SubjectImportTask, TaskResult
+from .importplan import ImportAction, resolve_import_plan, create_plan_frame
@@ -8,3 +8,4 @@ class FileSpec(NamedTuple):
     path_from_root: list[Path]
     copy_command: str | Callable[[Path, Path], None] | None = None
     post_command: str | None = None
+    timeout: float | None = None
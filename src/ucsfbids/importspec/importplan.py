@@ -0,0 +1,138 @@
+"""importplan.py
+Import plans, which list the files of an import and resolve their sources before any file is imported.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from pathlib import Path
+from stat import S_ISREG
+from typing import NamedTuple
+
+# Third-Party Packages #
+import pandas as pd
+
+# Local Packages #
+from ..loading.scanning import stat_paths
+from ..transfer.sourceinventory import SourceInventory
+from .filespec import FileSpec
+
+
+# Definitions #
+# Constants #
+PLAN_COLUMNS = [
+    "subject",
+    "session",
+    "modality",
+    "suffix",
+    "extension",
+    "source",
+    "destination",
+    "copy_command",
+    "post_command",
+    "size",
+]
+
+
+# Classes #
+class ImportAction(NamedTuple):
+    """The import of a file, with the candidate paths of its source and the source they resolved to.
+
+    Attributes:
+        file: The specification of the file.
+        destination: The path to import the file to.
+        candidates: The paths the source of the file may be at, in order of preference.
+        source: The candidate which is a file, or the first candidate if none is, None if it is not resolved.
+        size: The size of the source file, None if it does not exist or is not resolved.
+        mtime_ns: The modification time of the source file, None if it does not exist or is not resolved.
+        subject: The name of the subject the file belongs to.
+        session: The name of the session the file belongs to.
+        modality: The name of the modality the file belongs to.
+    """
+
+    file: FileSpec
+    destination: Path
+    candidates: tuple[Path, ...]
+    source: Path | None = None
+    size: int | None = None
+    mtime_ns: int | None = None
+    subject: str | None = None
+    session: str | None = None
+    modality: str | None = None
+
+
+# Functions #
+def resolve_import_plan(
+    actions: list[ImportAction],
+    jobs: int | None = None,
+    inventory: SourceInventory | None = None,
+) -> list[ImportAction]:
+    """Resolves the source of every action in an import plan, stating all candidate paths in one batch.
+
+    The source of an action is its first candidate which is a file. An action with no such candidate keeps its first
+    candidate as its source, so a file which is generated rather than copied still has a path to be generated from,
+    and has no size.
+
+    Args:
+        actions: The unresolved actions of the plan.
+        jobs: The number of threads to stat the candidates with, stats them serially if None or 1.
+        inventory: The inventory to look the candidates up in instead of stating them.
+
+    Returns:
+        The resolved actions of the plan.
+    """
+    candidates = [c for a in actions for c in a.candidates]
+    if inventory is None:
+        stats = stat_paths(candidates, jobs=jobs)
+        files = {p: (s.st_size, s.st_mtime_ns) for p, s in stats.items() if s is not None and S_ISREG(s.st_mode)}
+    else:
+        inventory.prefetch(candidates, jobs=jobs)
+        files = {p: e for p in candidates if (e := inventory.stat(p)) is not None}
+
+    resolved = []
+    for action in actions:
+        for candidate in action.candidates:
+            if candidate in files:
+                size, mtime_ns = files[candidate]
+                resolved.append(action._replace(source=candidate, size=size, mtime_ns=mtime_ns))
+                break
+        else:
+            resolved.append(action._replace(source=action.candidates[0] if action.candidates else None))
+    return resolved
+
+
+def create_plan_frame(actions: list[ImportAction]) -> pd.DataFrame:
+    """Creates a table of an import plan with one row per file.
+
+    Args:
+        actions: The resolved actions of the plan.
+
+    Returns:
+        The plan as a DataFrame, where the size is missing for files without a source file.
+    """
+    rows = [
+        (
+            a.subject,
+            a.session,
+            a.modality,
+            a.file.suffix,
+            a.file.extension,
+            a.source,
+            a.destination,
+            getattr(a.file.copy_command, "__name__", a.file.copy_command),
+            a.file.post_command,
+            a.size,
+        )
+        for a in actions
+    ]
+    frame = pd.DataFrame(rows, columns=PLAN_COLUMNS)
+    frame["size"] = frame["size"].astype("Int64")
+    return frame
@@ -0,0 +1,72 @@
+"""importtask.py
+Picklable descriptions of subject imports and the results of import tasks.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from pathlib import Path
+from typing import NamedTuple
+
+# Third-Party Packages #
+
+# Local Packages #
+from ..transfer import BlobStore, CommandPool, ImportJournal, SourceInventory
+
+
+# Definitions #
+# Classes #
+class SubjectImportTask(NamedTuple):
+    """A picklable description of the import of a subject, so the subject can be imported in a worker process.
+
+    Attributes:
+        subject_path: The path to the subject directory.
+        mode: The file mode to open the subject with.
+        importer_key: The name the subject importer is registered under.
+        importer_type: The type of the subject importer.
+        src_root: The root of the source the subject is imported from.
+        path: The path to the dataset directory to import into.
+        source_patient: The name of the source patient.
+        journal: The journal which records the imported files so an interrupted import can be resumed.
+        inventory: The inventory of the source which the source files are looked up in.
+        command_pool: The pool which runs external commands in the background, runs them in place if None.
+        blob_store: The store which the imported files are stored in and linked from, copies them if None.
+        modality_jobs: The number of threads each session imports its modalities with, serially if None or 1.
+        record_hashes: Determines if the digests of the imported files will be recorded in their import manifests.
+    """
+
+    subject_path: Path
+    mode: str
+    importer_key: str
+    importer_type: type
+    src_root: Path | None
+    path: Path
+    source_patient: str
+    journal: ImportJournal | None = None
+    inventory: SourceInventory | None = None
+    command_pool: CommandPool | None = None
+    blob_store: BlobStore | None = None
+    modality_jobs: int | None = None
+    record_hashes: bool = False
+
+
+class TaskResult(NamedTuple):
+    """The result of a task, such as the import or export of a subject.
+
+    Attributes:
+        name: The name of what the task imported or exported.
+        succeeded: Determines if the task succeeded.
+        error: The traceback of the exception which failed the task, None if it succeeded.
+    """
+
+    name: str
+    succeeded: bool
+    error: str | None = None
@@ -0,0 +1,21 @@
+""" __init__.py
+Tools for loading the directory tree of a UCSF BIDS dataset.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Local Packages #
+from .scanning import is_child_directory, scan_directories, construct_children, stat_paths
+from .lazychildmap import LazyChildMap
+from .metainfocache import MetaInfoCache, meta_info_cache
+from .datasetindex import IndexEntry, DatasetIndex
+from .electrodetables import ElectrodeTableCache, electrode_table_cache, read_electrodes_tsv, write_electrodes_tsv
+from .electrodecatalog import CatalogSource, ElectrodeCatalog
@@ -0,0 +1,447 @@
+"""datasetindex.py
+A persistent SQLite index of the subjects, sessions, and modalities of a dataset and their meta information.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, NamedTuple
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+from .metainfocache import meta_info_cache
+from .scanning import is_child_directory
+
+
+# Definitions #
+# Constants #
+SUBJECT_LEVEL = 1
+SESSION_LEVEL = 2
+MODALITY_LEVEL = 3
+
+NAMESPACE_KEYS = {
+    SUBJECT_LEVEL: ("SubjectNamespace", None),
+    SESSION_LEVEL: ("SessionNamespace", "SessionType"),
+    MODALITY_LEVEL: ("ModalityNamespace", "ModalityType"),
+}
+
+CREATE_ENTRIES = """
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    level INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    namespace TEXT,
+    type TEXT,
+    meta_info TEXT,
+    mtime_ns INTEGER,
+    meta_mtime_ns INTEGER
+)
+"""
+CREATE_PARENT_INDEX = "CREATE INDEX IF NOT EXISTS entries_parent ON entries (parent)"
+
+
+# Classes #
+class IndexEntry(NamedTuple):
+    """An entry of a directory in the dataset index.
+
+    Attributes:
+        path: The path of the directory relative to the dataset root.
+        parent: The relative path of the parent directory, None for the dataset root.
+        level: The depth of the directory, 0 for the root, 1 for subjects, 2 for sessions, and 3 for modalities.
+        name: The name of the subject, session, or modality.
+        namespace: The namespace from the meta information, None if there is no meta information.
+        type: The type from the meta information, None if there is no meta information.
+        meta_info: The meta information of the directory.
+        mtime_ns: The modification time of the directory when its children were last listed.
+        meta_mtime_ns: The modification time of the meta information file when it was last read.
+    """
+
+    path: str
+    parent: str | None
+    level: int
+    name: str
+    namespace: str | None = None
+    type: str | None = None
+    meta_info: dict[str, Any] | None = None
+    mtime_ns: int | None = None
+    meta_mtime_ns: int | None = None
+
+
+class DatasetIndex(BaseObject):
+    """A persistent SQLite index of the subjects, sessions, and modalities of a dataset and their meta information.
+
+    The index records every directory in the dataset tree with its meta information and modification time. When it
+    is refreshed, only the directories whose modification times changed are listed again, so a dataset can be opened
+    without walking its whole tree or reading every meta information file.
+
+    Attributes:
+        root: The path to the root directory of the dataset.
+        path: The path to the SQLite file of the index.
+        entries: The entries of the index keyed by their relative paths.
+        children: The relative paths of the children of each entry keyed by the relative path of the parent.
+
+    Args:
+        root: The path to the root directory of the dataset.
+        path: The path to the SQLite file, defaults to ".ucsfbids/index.sqlite3" in the root.
+        refresh: Determines if the index will be refreshed from the file system when it is opened.
+        check_meta: Determines if the meta information files will be checked for changes when refreshed.
+        init: Determines if this object will construct.
+        kwargs: The keyword arguments for inheritance if any.
+    """
+
+    default_directory: str = ".ucsfbids"
+    default_file_name: str = "index.sqlite3"
+
+    # Static Methods #
+    @staticmethod
+    def meta_info_name(level: int, parts: tuple[str, ...]) -> str | None:
+        """Creates the meta information file name of a directory from the parts of its relative path.
+
+        Args:
+            level: The depth of the directory.
+            parts: The parts of the relative path of the directory.
+
+        Returns:
+            The name of the meta information file, None if the directory does not have one.
+        """
+        if level == SUBJECT_LEVEL:
+            return f"{parts[0]}_meta.json"
+        elif level == SESSION_LEVEL:
+            return f"{parts[0]}_{parts[1]}_meta.json"
+        elif level == MODALITY_LEVEL:
+            return f"{parts[0]}_{parts[1]}_{parts[2]}-meta.json"
+        else:
+            return None
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        path: Path | str | None = None,
+        refresh: bool = True,
+        check_meta: bool = False,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self.root: Path | None = None
+        self.path: Path | None = None
+        self.connection: sqlite3.Connection | None = None
+
+        self.entries: dict[str, IndexEntry] = {}
+        self.children: dict[str, dict[str, str]] = {}
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(
+                root=root,
+                path=path,
+                refresh=refresh,
+                check_meta=check_meta,
+                **kwargs,
+            )
+
+    @property
+    def is_open(self) -> bool:
+        """Determines if the SQLite file is open."""
+        return self.connection is not None
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(
+        self,
+        root: Path | str | None = None,
+        path: Path | str | None = None,
+        refresh: bool = True,
+        check_meta: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """Constructs this object.
+
+        Args:
+            root: The path to the root directory of the dataset.
+            path: The path to the SQLite file, defaults to ".ucsfbids/index.sqlite3" in the root.
+            refresh: Determines if the index will be refreshed from the file system when it is opened.
+            check_meta: Determines if the meta information files will be checked for changes when refreshed.
+            kwargs: The keyword arguments for inheritance if any.
+        """
+        if root is not None:
+            self.root = Path(root)
+
+        if path is not None:
+            self.path = Path(path)
+        elif self.path is None and self.root is not None:
+            self.path = self.root / self.default_directory / self.default_file_name
+
+        super().construct(**kwargs)
+
+        if self.path is not None and self.root is not None:
+            self.open()
+            if refresh:
+                self.refresh(check_meta=check_meta)
+
+    def open(self) -> "DatasetIndex":
+        """Opens the SQLite file and loads its entries, creating it if it does not exist.
+
+        Returns:
+            This object.
+        """
+        if self.connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            with self.connection:
+                self.connection.execute(CREATE_ENTRIES)
+                self.connection.execute(CREATE_PARENT_INDEX)
+            self.load_entries()
+        return self
+
+    def close(self) -> None:
+        """Closes the SQLite file."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def load_entries(self) -> None:
+        """Loads all entries from the SQLite file into memory."""
+        self.entries.clear()
+        self.children.clear()
+        for row in self.connection.execute("SELECT * FROM entries"):
+            meta_info = None if row[6] is None else json.loads(row[6])
+            self._add_entry(IndexEntry(*row[:6], meta_info, *row[7:]))
+
+    def _add_entry(self, entry: IndexEntry) -> None:
+        """Adds an entry to the in memory tables.
+
+        Args:
+            entry: The entry to add.
+        """
+        self.entries[entry.path] = entry
+        if entry.parent is not None:
+            self.children.setdefault(entry.parent, {})[entry.name] = entry.path
+
+    def _remove_entry(self, relative: str) -> list[str]:
+        """Removes an entry and all of its descendants from the in memory tables.
+
+        Args:
+            relative: The relative path of the entry to remove.
+
+        Returns:
+            The relative paths of all removed entries.
+        """
+        entry = self.entries.pop(relative, None)
+        if entry is None:
+            return []
+        if entry.parent is not None:
+            self.children.get(entry.parent, {}).pop(entry.name, None)
+
+        removed = [relative]
+        for child in list(self.children.pop(relative, {}).values()):
+            removed.extend(self._remove_entry(child))
+        return removed
+
+    def _read_entry(self, relative: str, parent: str | None, level: int, mtime_ns: int | None = None) -> IndexEntry:
+        """Creates an entry for a directory by reading its meta information file.
+
+        Args:
+            relative: The relative path of the directory.
+            parent: The relative path of the parent directory.
+            level: The depth of the directory.
+            mtime_ns: The modification time of the directory when its children were listed.
+
+        Returns:
+            The new entry.
+        """
+        parts = Path(relative).parts
+        name = parts[-1] if level == MODALITY_LEVEL or not parts else parts[-1][4:]
+        meta_name = self.meta_info_name(level, parts)
+        if meta_name is None:
+            return IndexEntry(relative, parent, level, name, mtime_ns=mtime_ns)
+
+        meta_path = self.root / relative / meta_name
+        try:
+            stat = meta_path.stat()
+            meta_info = meta_info_cache.get(meta_path, stat=stat)
+        except (FileNotFoundError, NotADirectoryError, json.JSONDecodeError):
+            return IndexEntry(relative, parent, level, name, mtime_ns=mtime_ns)
+
+        namespace_key, type_key = NAMESPACE_KEYS[level]
+        return IndexEntry(
+            path=relative,
+            parent=parent,
+            level=level,
+            name=name,
+            namespace=meta_info.get(namespace_key, None),
+            type=None if type_key is None else meta_info.get(type_key, None),
+            meta_info=meta_info,
+            mtime_ns=mtime_ns,
+            meta_mtime_ns=stat.st_mtime_ns,
+        )
+
+    def _list_children(self, entry: IndexEntry, mtime_ns: int, upserts: dict, removed: list) -> None:
+        """Lists the children of a directory and adds or removes the entries which changed.
+
+        Args:
+            entry: The entry of the directory to list.
+            mtime_ns: The current modification time of the directory.
+            upserts: The entries to write to the SQLite file keyed by their relative paths.
+            removed: The relative paths of the entries to delete from the SQLite file.
+        """
+        relative = entry.path
+        with os.scandir(self.root / relative) as it:
+            names = {e.name for e in it if is_child_directory(e)}
+
+        known = self.children.get(relative, {})
+        for child in list(known.values()):
+            if Path(child).name not in names:
+                removed.extend(self._remove_entry(child))
+
+        for name in names.difference(Path(c).name for c in known.values()):
+            child = f"{relative}/{name}" if relative else name
+            upserts[child] = child_entry = self._read_entry(child, relative, entry.level + 1)
+            self._add_entry(child_entry)
+
+        upserts[relative] = entry = entry._replace(mtime_ns=mtime_ns)
+        self._add_entry(entry)
+
+    def _check_meta_info(self, entry: IndexEntry, upserts: dict) -> None:
+        """Reads the meta information file of a directory again if it was modified.
+
+        Args:
+            entry: The entry of the directory to check.
+            upserts: The entries to write to the SQLite file keyed by their relative paths.
+        """
+        meta_name = self.meta_info_name(entry.level, Path(entry.path).parts)
+        if meta_name is None:
+            return
+
+        try:
+            meta_mtime_ns = (self.root / entry.path / meta_name).stat().st_mtime_ns
+        except FileNotFoundError:
+            meta_mtime_ns = None
+
+        if meta_mtime_ns != entry.meta_mtime_ns:
+            upserts[entry.path] = entry = self._read_entry(entry.path, entry.parent, entry.level, entry.mtime_ns)
+            self._add_entry(entry)
+
+    def refresh(self, check_meta: bool = False) -> int:
+        """Updates the index from the file system, listing only the directories whose modification times changed.
+
+        Meta information files are rewritten in place, which does not change the modification time of their directory,
+        so they are only checked for changes when check_meta is True.
+
+        Args:
+            check_meta: Determines if the meta information files of unchanged directories will be checked for changes.
+
+        Returns:
+            The number of directories which were listed.
+        """
+        if "" not in self.entries:
+            self._add_entry(IndexEntry("", None, 0, self.root.name))
+
+        upserts = {}
+        removed = []
+        listed = 0
+        stack = [""]
+        while stack:
+            relative = stack.pop()
+            entry = self.entries[relative]
+            if check_meta:
+                self._check_meta_info(entry, upserts)
+
+            if entry.level >= MODALITY_LEVEL:
+                continue
+
+            try:
+                mtime_ns = os.stat(self.root / relative).st_mtime_ns
+            except FileNotFoundError:
+                removed.extend(self._remove_entry(relative))
+                continue
+
+            if mtime_ns != entry.mtime_ns:
+                listed += 1
+                self._list_children(entry, mtime_ns, upserts, removed)
+
+            stack.extend(self.children.get(relative, {}).values())
+
+        self.save(upserts=(e for r, e in upserts.items() if r in self.entries), removed=removed)
+        return listed
+
+    def save(self, upserts: Any = (), removed: Any = ()) -> None:
+        """Writes changed entries to the SQLite file in a single transaction.
+
+        Args:
+            upserts: The entries to insert or replace.
+            removed: The relative paths of the entries to delete.
+        """
+        with self.connection:
+            self.connection.executemany("DELETE FROM entries WHERE path = ?", ((r,) for r in removed))
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (*e[:6], None if e.meta_info is None else json.dumps(e.meta_info), e.mtime_ns, e.meta_mtime_ns)
+                    for e in upserts
+                ),
+            )
+
+    def relative_path(self, path: Path | str) -> str:
+        """Gets the path of a directory relative to the dataset root as it is stored in the index.
+
+        Args:
+            path: The path to the directory.
+
+        Returns:
+            The relative path of the directory.
+        """
+        relative = Path(path).relative_to(self.root).as_posix()
+        return "" if relative == "." else relative
+
+    def get_entry(self, path: Path | str) -> IndexEntry | None:
+        """Gets the entry of a directory.
+
+        Args:
+            path: The path to the directory.
+
+        Returns:
+            The entry of the directory, None if it is not in the index.
+        """
+        try:
+            return self.entries.get(self.relative_path(path), None)
+        except ValueError:
+            return None
+
+    def get_children(self, path: Path | str) -> dict[str, Path] | None:
+        """Gets the paths of the children of a directory.
+
+        Args:
+            path: The path to the directory.
+
+        Returns:
+            The paths of the children keyed by their names, None if the directory is not in the index.
+        """
+        try:
+            relative = self.relative_path(path)
+        except ValueError:
+            return None
+        if relative not in self.entries:
+            return None
+        return {name: self.root / child for name, child in self.children.get(relative, {}).items()}
@@ -0,0 +1,278 @@
+"""electrodecatalog.py
+A persistent catalog of the electrodes of every subject and session in a dataset with a spatial index.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import os
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, NamedTuple
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+# Local Packages #
+from .electrodetables import ELECTRODE_DTYPES, load_electrode_table, load_table_npz, save_table_npz
+from .scanning import stat_paths
+
+
+# Definitions #
+# Constants #
+KEY_COLUMNS = ["subject", "session", "modality"]
+ELECTRODES_PATTERN = "sub-*/ses-*/*/*_electrodes.tsv"
+
+
+# Classes #
+class CatalogSource(NamedTuple):
+    """An electrode table in the catalog.
+
+    Attributes:
+        mtime_ns: The modification time of the table file when it was loaded.
+        size: The size of the table file when it was loaded.
+        start: The first row of the electrodes of the table in the catalog.
+        stop: The row after the last row of the electrodes of the table in the catalog.
+    """
+
+    mtime_ns: int
+    size: int
+    start: int
+    stop: int
+
+
+class ElectrodeCatalog(BaseObject):
+    """A persistent catalog of the electrodes of every subject and session in a dataset with a spatial index.
+
+    The catalog is one table of every electrode table in the dataset, with the subject, session, and modality of each
+    electrode. It is saved in the dataset and refreshed incrementally, so only the tables whose files changed are
+    loaded again. A KD-tree of the electrode coordinates answers radius and nearest neighbor queries, and is built
+    when it is first queried after the catalog changes.
+
+    Attributes:
+        root: The path to the root directory of the dataset.
+        path: The path to the catalog file.
+        table: The electrodes of the dataset.
+        sources: The tables in the catalog keyed by their paths relative to the root.
+
+    Args:
+        root: The path to the root directory of the dataset.
+        path: The path to the catalog file, defaults to ".ucsfbids/electrodes.npz" in the root.
+        refresh: Determines if the catalog will be refreshed from the file system when it is opened.
+        jobs: The number of threads to load the tables with, uses the number of CPUs if None.
+        init: Determines if this object will construct.
+        kwargs: The keyword arguments for inheritance if any.
+    """
+
+    default_directory: str = ".ucsfbids"
+    default_file_name: str = "electrodes.npz"
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        path: Path | str | None = None,
+        refresh: bool = True,
+        jobs: int | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self._tree: cKDTree | None = None
+        self._tree_rows: np.ndarray | None = None
+
+        self.root: Path | None = None
+        self.path: Path | None = None
+        self.table: pd.DataFrame = pd.DataFrame(columns=KEY_COLUMNS)
+        self.sources: dict[str, CatalogSource] = {}
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(root=root, path=path, refresh=refresh, jobs=jobs, **kwargs)
+
+    def __len__(self) -> int:
+        """The number of electrodes in the catalog."""
+        return len(self.table)
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(
+        self,
+        root: Path | str | None = None,
+        path: Path | str | None = None,
+        refresh: bool = True,
+        jobs: int | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Constructs this object.
+
+        Args:
+            root: The path to the root directory of the dataset.
+            path: The path to the catalog file, defaults to ".ucsfbids/electrodes.npz" in the root.
+            refresh: Determines if the catalog will be refreshed from the file system when it is opened.
+            jobs: The number of threads to load the tables with, uses the number of CPUs if None.
+            kwargs: The keyword arguments for inheritance if any.
+        """
+        if root is not None:
+            self.root = Path(root)
+
+        if path is not None:
+            self.path = Path(path)
+        elif self.path is None and self.root is not None:
+            self.path = self.root / self.default_directory / self.default_file_name
+
+        super().construct(**kwargs)
+
+        if self.path is not None and self.root is not None:
+            self.load()
+            if refresh:
+                self.refresh(jobs=jobs)
+
+    def load(self) -> None:
+        """Loads the catalog from its file if it exists."""
+        loaded = load_table_npz(self.path)
+        if loaded is not None:
+            self.table, meta = loaded
+            self.sources = {k: CatalogSource(*v) for k, v in meta["sources"].items()}
+            self._tree = None
+
+    def save(self) -> None:
+        """Saves the catalog to its file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        save_table_npz(self.table, self.path, {"sources": {k: list(v) for k, v in self.sources.items()}})
+
+    def _load_source(self, item: tuple[str, os.stat_result]) -> pd.DataFrame:
+        relative, stat = item
+        table = load_electrode_table(self.root / relative, stat)
+        subject, session, modality = Path(relative).parts[:3]
+        keys = pd.DataFrame(
+            {
+                "subject": subject.removeprefix("sub-"),
+                "session": session.removeprefix("ses-"),
+                "modality": modality,
+            },
+            index=table.index,
+        )
+        return pd.concat([keys, table], axis=1)
+
+    def refresh(self, jobs: int | None = None) -> int:
+        """Updates the catalog from the electrode tables whose files were added, changed, or removed.
+
+        Args:
+            jobs: The number of threads to stat and load the tables with. The tables are stated serially and loaded
+                with the number of CPUs if None.
+
+        Returns:
+            The number of tables which were loaded or removed.
+        """
+        paths = sorted(self.root.glob(ELECTRODES_PATTERN))
+        stats = stat_paths(paths, jobs=jobs)
+        current = {p.relative_to(self.root).as_posix(): s for p, s in stats.items() if s is not None}
+
+        changed = {
+            k: s
+            for k, s in current.items()
+            if (source := self.sources.get(k, None)) is None
+            or source.mtime_ns != s.st_mtime_ns
+            or source.size != s.st_size
+        }
+        removed = self.sources.keys() - current.keys()
+        if not changed and not removed:
+            return 0
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            loaded = dict(zip(changed, executor.map(self._load_source, changed.items())))
+
+        pieces = []
+        sources = {}
+        start = 0
+        for relative in sorted(current):
+            if relative in loaded:
+                piece = loaded[relative]
+            else:
+                source = self.sources[relative]
+                piece = self.table.iloc[source.start : source.stop]
+            stat = current[relative]
+            sources[relative] = CatalogSource(stat.st_mtime_ns, stat.st_size, start, start + len(piece))
+            start += len(piece)
+            pieces.append(piece)
+
+        table = pd.concat(pieces, ignore_index=True) if pieces else pd.DataFrame(columns=KEY_COLUMNS)
+        # Concatenated categoricals with different categories become objects, so they are made categorical again.
+        categorical = [*KEY_COLUMNS, *(k for k, v in ELECTRODE_DTYPES.items() if v == "category")]
+        for column in categorical:
+            if column in table.columns:
+                table[column] = table[column].astype("category")
+
+        self.table = table
+        self.sources = sources
+        self._tree = None
+        self.save()
+        return len(changed) + len(removed)
+
+    def _build_tree(self) -> cKDTree:
+        """Builds the KD-tree of the electrodes which have coordinates.
+
+        Returns:
+            The KD-tree.
+        """
+        if self._tree is None:
+            if len(self.table) > 0:
+                xyz = self.table[["x", "y", "z"]].to_numpy(dtype=np.float64)
+            else:
+                xyz = np.empty((0, 3))
+            self._tree_rows = np.flatnonzero(np.isfinite(xyz).all(axis=1))
+            self._tree = cKDTree(xyz[self._tree_rows])
+        return self._tree
+
+    def within(self, point: Sequence[float], radius: float) -> pd.DataFrame:
+        """Finds the electrodes within a distance of a point.
+
+        Args:
+            point: The x, y, and z coordinates of the point.
+            radius: The distance from the point.
+
+        Returns:
+            The electrodes within the distance with their distances, from the nearest to the farthest.
+        """
+        tree = self._build_tree()
+        indices = np.asarray(tree.query_ball_point(point, radius), dtype=np.intp)
+        rows = self._tree_rows[indices]
+        distances = np.linalg.norm(tree.data[indices] - np.asarray(point, dtype=np.float64), axis=1)
+        order = np.argsort(distances, kind="stable")
+        return self.table.iloc[rows[order]].assign(distance=distances[order])
+
+    def nearest(self, point: Sequence[float], k: int = 1) -> pd.DataFrame:
+        """Finds the electrodes nearest to a point.
+
+        Args:
+            point: The x, y, and z coordinates of the point.
+            k: The number of electrodes to find.
+
+        Returns:
+            The nearest electrodes with their distances, from the nearest to the farthest.
+        """
+        tree = self._build_tree()
+        k = min(k, tree.n)
+        if k == 0:
+            return self.table.iloc[[]].assign(distance=np.empty(0))
+        distances, indices = tree.query(point, k=k)
+        distances, indices = np.atleast_1d(distances), np.atleast_1d(indices)
+        return self.table.iloc[self._tree_rows[indices]].assign(distance=distances)
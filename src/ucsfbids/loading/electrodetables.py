@@ -0,0 +1,325 @@
+"""electrodetables.py
+Typed loading of electrode tables with a cache which is invalidated when a table changes and a binary sidecar.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import json
+import os
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+import numpy as np
+import pandas as pd
+
+# Local Packages #
+
+
+# Definitions #
+# Constants #
+# The types of the columns of a BIDS electrodes table, other columns have their types inferred.
+ELECTRODE_DTYPES = {
+    "name": str,
+    "x": np.float32,
+    "y": np.float32,
+    "z": np.float32,
+    "size": np.float32,
+    "material": "category",
+    "manufacturer": "category",
+    "group": "category",
+    "hemisphere": "category",
+    "type": "category",
+    "impedance": np.float32,
+}
+
+# The BIDS value of a missing entry, which the typed reader loads as NaN.
+MISSING_VALUE = "n/a"
+
+NPZ_VERSION = 1
+
+
+# Functions #
+def electrodes_sidecar_path(path: Path | str) -> Path:
+    """Gets the path to the binary sidecar of an electrode table.
+
+    The sidecar name ends with -meta, so exporters skip it like the other meta information files.
+
+    Args:
+        path: The path to the electrode table.
+
+    Returns:
+        The path to the sidecar.
+    """
+    path = Path(path)
+    return path.with_name(f"{path.stem}-meta.npz")
+
+
+def read_electrodes_tsv(path: Path | str) -> pd.DataFrame:
+    """Reads an electrode table from a TSV file with the types of the BIDS electrode columns.
+
+    Missing entries, such as an "n/a" size or impedance, are read as NaN, so the table must be written with
+    write_electrodes_tsv to write them as "n/a" again.
+
+    Args:
+        path: The path to the electrode table.
+
+    Returns:
+        The electrode table.
+    """
+    table = pd.read_csv(path, sep="\t", dtype=ELECTRODE_DTYPES)
+    # Tables written before the index was dropped have it as an unnamed first column.
+    if len(table.columns) > 0 and table.columns[0] == "Unnamed: 0":
+        table = table.drop(columns=table.columns[0])
+    return table
+
+
+def write_electrodes_tsv(table: pd.DataFrame, path: Path | str) -> None:
+    """Writes an electrode table to a TSV file with its missing entries as "n/a".
+
+    Args:
+        table: The electrode table to write.
+        path: The path to the electrode table.
+    """
+    table.to_csv(path, sep="\t", index=False, na_rep=MISSING_VALUE)
+
+
+def save_table_npz(table: pd.DataFrame, path: Path | str, meta: dict[str, Any] | None = None) -> None:
+    """Saves a table to an NPZ file, replacing the file atomically.
+
+    Numeric columns are saved as arrays and every other column as the codes and categories of a categorical, so the
+    table is loaded without parsing text or unpickling objects.
+
+    Args:
+        table: The table to save.
+        path: The path to the NPZ file.
+        meta: Information to save with the table, which must be JSON serializable.
+    """
+    path = Path(path)
+    arrays = {}
+    kinds = {}
+    for index, (name, column) in enumerate(table.items()):
+        if pd.api.types.is_numeric_dtype(column.dtype) and not isinstance(column.dtype, pd.CategoricalDtype):
+            arrays[f"values_{index}"] = column.to_numpy()
+            kinds[name] = "numeric"
+        else:
+            categorical = column if isinstance(column.dtype, pd.CategoricalDtype) else column.astype("category")
+            arrays[f"codes_{index}"] = categorical.cat.codes.to_numpy()
+            arrays[f"categories_{index}"] = categorical.cat.categories.to_numpy(dtype=str)
+            kinds[name] = "category" if categorical is column else "object"
+
+    meta = {**(meta or {}), "version": NPZ_VERSION, "columns": list(kinds), "kinds": list(kinds.values())}
+    temporary_path = path.with_name(f".tmp-{uuid.uuid4().hex}-{path.name}")
+    try:
+        with temporary_path.open("wb") as file:
+            np.savez(file, meta=np.array(json.dumps(meta)), **arrays)
+        os.replace(temporary_path, path)
+    finally:
+        temporary_path.unlink(missing_ok=True)
+
+
+def load_table_npz(path: Path | str) -> tuple[pd.DataFrame, dict[str, Any]] | None:
+    """Loads a table from an NPZ file saved by save_table_npz.
+
+    Args:
+        path: The path to the NPZ file.
+
+    Returns:
+        The table and the information saved with it, or None if the file does not exist or cannot be read.
+    """
+    try:
+        with np.load(path, allow_pickle=False) as arrays:
+            meta = json.loads(str(arrays["meta"]))
+            if meta["version"] != NPZ_VERSION:
+                return None
+
+            columns = {}
+            for index, (name, kind) in enumerate(zip(meta["columns"], meta["kinds"])):
+                if kind == "numeric":
+                    columns[name] = arrays[f"values_{index}"]
+                else:
+                    categorical = pd.Categorical.from_codes(arrays[f"codes_{index}"], arrays[f"categories_{index}"])
+                    columns[name] = categorical if kind == "category" else np.asarray(categorical, dtype=object)
+    except (OSError, KeyError, ValueError):
+        return None
+    return pd.DataFrame(columns, columns=meta["columns"]), meta
+
+
+def save_electrodes_sidecar(table: pd.DataFrame, path: Path | str, stat: os.stat_result) -> None:
+    """Saves an electrode table to a binary sidecar which is valid while the table file keeps its time and size.
+
+    Args:
+        table: The electrode table to save.
+        path: The path to the sidecar.
+        stat: The result of a stat of the table file the table was read from.
+    """
+    save_table_npz(table, path, {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size})
+
+
+def load_electrodes_sidecar(path: Path | str, stat: os.stat_result) -> pd.DataFrame | None:
+    """Loads an electrode table from its binary sidecar if the sidecar matches the current table file.
+
+    Args:
+        path: The path to the sidecar.
+        stat: The result of a stat of the table file.
+
+    Returns:
+        The electrode table, or None if the sidecar does not exist or is out of date.
+    """
+    loaded = load_table_npz(path)
+    if loaded is None:
+        return None
+    table, meta = loaded
+    if meta.get("mtime_ns", None) != stat.st_mtime_ns or meta.get("size", None) != stat.st_size:
+        return None
+    return table
+
+
+def load_electrode_table(path: Path | str, stat: os.stat_result | None = None, sidecar: bool = False) -> pd.DataFrame:
+    """Loads an electrode table from its binary sidecar if it is up to date, otherwise from the table file.
+
+    Args:
+        path: The path to the electrode table.
+        stat: The result of a stat of the table file if it was already done.
+        sidecar: Determines if a binary sidecar will be written when the table has to be parsed from its file.
+
+    Returns:
+        The electrode table.
+
+    Raises:
+        FileNotFoundError: If the table does not exist.
+    """
+    if stat is None:
+        stat = os.stat(path)
+    sidecar_path = electrodes_sidecar_path(path)
+    table = load_electrodes_sidecar(sidecar_path, stat)
+    if table is None:
+        table = read_electrodes_tsv(path)
+        if sidecar:
+            save_electrodes_sidecar(table, sidecar_path, stat)
+    return table
+
+
+# Classes #
+class ElectrodeTableCache(BaseObject):
+    """A cache of typed electrode tables which is invalidated when a table file changes.
+
+    Each table is keyed by its path and validated by its modification time and size, so a table is only loaded again
+    after it changes. A table which is not cached is loaded from its binary sidecar when the sidecar is up to date.
+    The least recently used tables are removed when the cache is full. The cached tables are shared, so they must be
+    copied before they are modified.
+
+    Attributes:
+        maxsize: The maximum number of tables to cache.
+        hits: The number of times a table was found in the cache.
+        misses: The number of times a table had to be loaded.
+
+    Args:
+        maxsize: The maximum number of tables to cache.
+        init: Determines if this object will construct.
+        kwargs: The keyword arguments for inheritance if any.
+    """
+
+    default_maxsize: int = 1024
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(self, maxsize: int | None = None, *, init: bool = True, **kwargs: Any) -> None:
+        # New Attributes #
+        self._lock: Lock = Lock()
+        self._cache: OrderedDict[str, tuple[int, int, pd.DataFrame]] = OrderedDict()
+
+        self.maxsize: int = self.default_maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(maxsize=maxsize, **kwargs)
+
+    def __len__(self) -> int:
+        """The number of tables in the cache."""
+        return len(self._cache)
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(self, maxsize: int | None = None, **kwargs: Any) -> None:
+        """Constructs this object.
+
+        Args:
+            maxsize: The maximum number of tables to cache.
+            kwargs: The keyword arguments for inheritance if any.
+        """
+        if maxsize is not None:
+            self.maxsize = maxsize
+
+        super().construct(**kwargs)
+
+    def get(self, path: Path | str, sidecar: bool = False) -> pd.DataFrame:
+        """Gets an electrode table, only loading the table if it is not cached or has changed.
+
+        Args:
+            path: The path to the electrode table.
+            sidecar: Determines if a binary sidecar will be written when the table has to be parsed from its file.
+
+        Returns:
+            The electrode table, which must not be modified.
+
+        Raises:
+            FileNotFoundError: If the table does not exist.
+        """
+        key = os.fspath(path)
+        stat = os.stat(key)
+
+        with self._lock:
+            cached = self._cache.get(key, None)
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached[2]
+            self.misses += 1
+
+        table = load_electrode_table(key, stat, sidecar=sidecar)
+
+        with self._lock:
+            self._cache[key] = (stat.st_mtime_ns, stat.st_size, table)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return table
+
+    def invalidate(self, path: Path | str) -> None:
+        """Removes a table from the cache.
+
+        Args:
+            path: The path to the electrode table.
+        """
+        with self._lock:
+            self._cache.pop(os.fspath(path), None)
+
+    def clear(self) -> None:
+        """Removes all tables from the cache."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Instances #
+electrode_table_cache = ElectrodeTableCache()
@@ -0,0 +1,133 @@
+"""lazychildmap.py
+A mapping of child names to child objects which only constructs a child the first time it is accessed.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections.abc import Callable, Iterator, MutableMapping
+from pathlib import Path
+from typing import Any
+
+# Third-Party Packages #
+
+# Local Packages #
+from .scanning import construct_children
+
+
+# Definitions #
+# Classes #
+class LazyChildMap(MutableMapping):
+    """A mapping of child names to child objects which only constructs a child the first time it is accessed.
+
+    The map only knows the names and paths of its children until they are accessed, so a parent can list its
+    directory once and defer the construction of every child, and their contents, until they are needed.
+
+    Attributes:
+        factory: The callable which constructs a child from its path.
+        paths: The paths of all children in this map, None if the child was added directly.
+        children: The children which have been constructed or added.
+
+    Args:
+        factory: The callable which constructs a child from its path.
+        paths: The paths of the children keyed by their names.
+    """
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        factory: Callable[[Path], Any] | None = None,
+        paths: dict[str, Path] | None = None,
+    ) -> None:
+        # New Attributes #
+        self.factory: Callable[[Path], Any] | None = factory
+        self.paths: dict[str, Path | None] = {} if paths is None else dict(paths)
+        self.children: dict[str, Any] = {}
+
+    # Container Methods
+    def __getitem__(self, key: str) -> Any:
+        """Gets a child, constructing it if it has not been accessed yet."""
+        child = self.children.get(key, None)
+        if child is None:
+            path = self.paths[key]
+            if path is None or self.factory is None:
+                raise KeyError(key)
+            self.children[key] = child = self.factory(path)
+        return child
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Adds an already constructed child to this map."""
+        self.paths.setdefault(key, None)
+        self.children[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        """Removes a child from this map."""
+        del self.paths[key]
+        self.children.pop(key, None)
+
+    def __contains__(self, key: object) -> bool:
+        """Checks if a child is in this map without constructing it."""
+        return key in self.paths
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterates over the names of the children."""
+        return iter(self.paths)
+
+    def __len__(self) -> int:
+        """The number of children in this map."""
+        return len(self.paths)
+
+    def __repr__(self) -> str:
+        """The representation of this map, which shows which children have been constructed."""
+        return f"{self.__class__.__name__}(loaded={list(self.children)}, unloaded={self.unloaded_names()})"
+
+    # Instance Methods #
+    def is_loaded(self, key: str) -> bool:
+        """Checks if a child has been constructed.
+
+        Args:
+            key: The name of the child.
+
+        Returns:
+            True if the child has been constructed.
+        """
+        return key in self.children
+
+    def unloaded_names(self) -> list[str]:
+        """Gets the names of the children which have not been constructed.
+
+        Returns:
+            The names of the unconstructed children.
+        """
+        return [n for n in self.paths if n not in self.children]
+
+    def loaded_items(self) -> Iterator[tuple[str, Any]]:
+        """Iterates over the children which have been constructed without constructing any others.
+
+        Returns:
+            An iterator of the names and constructed children.
+        """
+        return iter(self.children.items())
+
+    def load_all(self, jobs: int | None = None) -> None:
+        """Constructs every child in this map.
+
+        Args:
+            jobs: The number of threads to construct the children with, constructs them serially if None or 1.
+        """
+        unloaded = {n: self.paths[n] for n in self.unloaded_names() if self.paths[n] is not None}
+        self.children.update(construct_children(self.factory, unloaded, jobs=jobs))
+
+    def clear(self) -> None:
+        """Removes all children from this map."""
+        self.paths.clear()
+        self.children.clear()
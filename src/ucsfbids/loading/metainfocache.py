@@ -0,0 +1,163 @@
+"""metainfocache.py
+A process-wide cache of parsed meta information files which is invalidated when a file changes.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import json
+import os
+from collections import OrderedDict
+from copy import deepcopy
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+
+
+# Definitions #
+# Classes #
+class MetaInfoCache(BaseObject):
+    """A cache of parsed meta information files which is invalidated when a file changes.
+
+    Each file is keyed by its path and validated by its modification time and size, so a file is only parsed again
+    after it changes. The least recently used files are removed when the cache is full. The cached dictionaries are
+    shared, so the callers which modify the meta information get a deep copy of it.
+
+    Attributes:
+        maxsize: The maximum number of files to cache.
+        hits: The number of times a file was found in the cache.
+        misses: The number of times a file had to be parsed.
+
+    Args:
+        maxsize: The maximum number of files to cache.
+        init: Determines if this object will construct.
+        kwargs: The keyword arguments for inheritance if any.
+    """
+
+    default_maxsize: int = 8192
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(self, maxsize: int | None = None, *, init: bool = True, **kwargs: Any) -> None:
+        # New Attributes #
+        self._lock: Lock = Lock()
+        self._cache: OrderedDict[str, tuple[int, int, dict[str, Any]]] = OrderedDict()
+
+        self.maxsize: int = self.default_maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(maxsize=maxsize, **kwargs)
+
+    def __len__(self) -> int:
+        """The number of files in the cache."""
+        return len(self._cache)
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(self, maxsize: int | None = None, **kwargs: Any) -> None:
+        """Constructs this object.
+
+        Args:
+            maxsize: The maximum number of files to cache.
+            kwargs: The keyword arguments for inheritance if any.
+        """
+        if maxsize is not None:
+            self.maxsize = maxsize
+
+        super().construct(**kwargs)
+
+    def _store(self, key: str, mtime_ns: int, size: int, info: dict[str, Any]) -> None:
+        """Stores parsed meta information, removing the least recently used files if the cache is full.
+
+        Args:
+            key: The key of the file.
+            mtime_ns: The modification time of the file.
+            size: The size of the file.
+            info: The parsed meta information.
+        """
+        with self._lock:
+            self._cache[key] = (mtime_ns, size, info)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def get(self, path: Path | str, stat: os.stat_result | None = None, copy: bool = False) -> dict[str, Any]:
+        """Gets the meta information in a file, only parsing the file if it is not cached or has changed.
+
+        Args:
+            path: The path to the meta information file.
+            stat: The result of a stat of the file if it was already done.
+            copy: Determines if a deep copy of the meta information will be returned, which may be modified.
+
+        Returns:
+            The meta information in the file, which must not be modified unless it is a copy.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        key = os.fspath(path)
+        if stat is None:
+            stat = os.stat(key)
+
+        with self._lock:
+            cached = self._cache.get(key, None)
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return deepcopy(cached[2]) if copy else cached[2]
+            self.misses += 1
+
+        with open(key, "r") as file:
+            info = json.load(file)
+        self._store(key, stat.st_mtime_ns, stat.st_size, info)
+        return deepcopy(info) if copy else info
+
+    def put(self, path: Path | str, info: dict[str, Any]) -> None:
+        """Caches meta information which was just written to a file.
+
+        Args:
+            path: The path to the meta information file.
+            info: The meta information which was written.
+        """
+        key = os.fspath(path)
+        stat = os.stat(key)
+        self._store(key, stat.st_mtime_ns, stat.st_size, deepcopy(info))
+
+    def invalidate(self, path: Path | str) -> None:
+        """Removes a file from the cache.
+
+        Args:
+            path: The path to the meta information file.
+        """
+        with self._lock:
+            self._cache.pop(os.fspath(path), None)
+
+    def clear(self) -> None:
+        """Removes all files from the cache."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Instances #
+meta_info_cache = MetaInfoCache()
@@ -0,0 +1,111 @@
+"""scanning.py
+Functions for listing and constructing the children of directories in a dataset tree.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import os
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+# Third-Party Packages #
+
+# Local Packages #
+
+
+# Definitions #
+# Functions #
+def is_child_directory(entry: os.DirEntry, hidden: bool = False) -> bool:
+    """Determines if a directory entry is a child of a dataset tree, a subject, session, or modality directory.
+
+    Hidden directories, such as those of version control or of a blob store, are never children of the tree, so the
+    scan and the dataset index list the same children.
+
+    Args:
+        entry: The directory entry to check.
+        hidden: Determines if directories starting with "." will be included.
+
+    Returns:
+        True if the entry is a child directory.
+    """
+    return (hidden or not entry.name.startswith(".")) and entry.is_dir()
+
+
+def scan_directories(path: Path | str, prefix: int = 0, hidden: bool = False) -> dict[str, Path]:
+    """Lists the subdirectories of a directory using the file types cached by os.scandir.
+
+    The names are the stems of the subdirectories with a number of prefix characters removed, which matches how
+    subjects, sessions, and modalities name themselves from their paths.
+
+    Args:
+        path: The path to the directory to list.
+        prefix: The number of characters to remove from the start of each name, such as 4 for "sub-" or "ses-".
+        hidden: Determines if subdirectories starting with "." will be included.
+
+    Returns:
+        The paths to the subdirectories keyed by their names.
+    """
+    path = Path(path)
+    with os.scandir(path) as it:
+        return {os.path.splitext(e.name)[0][prefix:]: path / e.name for e in it if is_child_directory(e, hidden)}
+
+
+def construct_children(
+    factory: Callable[[Path], Any],
+    paths: dict[str, Path],
+    jobs: int | None = None,
+) -> dict[str, Any]:
+    """Constructs the children of a directory, optionally across a pool of threads.
+
+    Loading a dataset tree is dominated by the latency of file system metadata calls rather than by CPU, so on network
+    storage it scales with the number of threads.
+
+    Args:
+        factory: The callable which constructs a child from its path.
+        paths: The paths to the children keyed by their names.
+        jobs: The number of threads to construct the children with, constructs them serially if None or 1.
+
+    Returns:
+        The constructed children keyed by their names.
+    """
+    if jobs is None or jobs <= 1 or len(paths) <= 1:
+        return {name: factory(path) for name, path in paths.items()}
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return dict(zip(paths, executor.map(factory, paths.values())))
+
+
+def stat_paths(paths: Iterable[Path], jobs: int | None = None) -> dict[Path, os.stat_result | None]:
+    """Stats many paths at once, optionally across a pool of threads.
+
+    Args:
+        paths: The paths to stat.
+        jobs: The number of threads to stat the paths with, stats them serially if None or 1.
+
+    Returns:
+        The stat result of each path, None if the path does not exist.
+    """
+    paths = list(dict.fromkeys(paths))
+    if jobs is None or jobs <= 1 or len(paths) <= 1:
+        return {path: _stat_or_none(path) for path in paths}
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return dict(zip(paths, executor.map(_stat_or_none, paths)))
+
+
+def _stat_or_none(path: Path) -> os.stat_result | None:
+    try:
+        return os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
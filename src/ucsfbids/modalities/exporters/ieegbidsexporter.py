@@ -27,9 +27,10 @@ from .modalitybidsexporter import ModalityBIDSExporter
 # Classes #
 class IEEGBIDSExporter(ModalityBIDSExporter):
     export_file_names: set[str, ...] = {"ieeg", "coordsystem", "electrodes", "channels", "photo"}
-    export_exclude_names: set[str, ...] = {"ieeg-meta"}
+    export_exclude_names: set[str, ...] = {"-meta"}
 
     def execute_export(self, path: Path, name: str) -> None:
         new_path = path / f"{self.modality.name}"
-        new_path.mkdir(exist_ok=True)
+        if self.archive is None:
+            new_path.mkdir(exist_ok=True)
         self.export_select_files(path=new_path, name=name)
@@ -13,14 +13,24 @@ __email__ = __email__
 
 # Imports #
 # Standard Libraries #
+import os
 from baseobjects import BaseObject
 from pathlib import Path
-import shutil
 from typing import Any
 
 # Third-Party Packages #
 
 # Local Packages #
+from ...transfer import (
+    VIEW_STRATEGIES,
+    ArchiveWriter,
+    BlobStore,
+    CopyEngine,
+    NameMatcher,
+    TransferManifest,
+    compile_name_matcher,
+)
+from ...transfer.hashing import DEFAULT_ALGORITHM
 from ..modality import Modality
 
 
@@ -29,6 +39,10 @@ from ..modality import Modality
 class ModalityBIDSExporter(BaseObject):
     export_file_names: set[str, ...] = set()
     export_exclude_names: set[str, ...] = {"-meta"}
+    copy_engine: CopyEngine = CopyEngine()
+    view_engine: CopyEngine = CopyEngine(strategies=VIEW_STRATEGIES, allow_hardlink=True)
+    hash_algorithm: str = DEFAULT_ALGORITHM
+    manifest_name: str = ".export-meta.json"
 
     # Magic Methods #
     # Construction/Destruction
@@ -41,6 +55,12 @@ class ModalityBIDSExporter(BaseObject):
     ) -> None:
         # New Attributes #
         self.modality: Modality | None = None
+        self.blob_store: BlobStore | None = None
+        self.view: bool = False
+        self.sync: bool = False
+        self.prune: bool = False
+        self.record_manifest: bool = False
+        self.archive: ArchiveWriter | None = None
 
         # Parent Attributes #
         super().__init__(init=False)
@@ -57,42 +77,184 @@ class ModalityBIDSExporter(BaseObject):
     def construct(
         self,
         modality: Modality | None = None,
+        copy_engine: CopyEngine | None = None,
+        blob_store: BlobStore | None = None,
+        view: bool | None = None,
+        sync: bool | None = None,
+        prune: bool | None = None,
+        record_manifest: bool | None = None,
+        archive: ArchiveWriter | None = None,
         **kwargs: Any,
     ) -> None:
         """Constructs this object.
 
         Args:
+            copy_engine: The engine which copies the exported files, uses the class engine if None.
+            blob_store: The store which the exported files are stored in and linked from, copies them if None.
+            view: Determines if the exported files will be hardlinks to the files of the modality, or symlinks when
+                the export is on another file system, instead of copies.
+            sync: Determines if the files which changed since they were exported will be exported again, instead of
+                only exporting the files which are not in the export.
+            prune: Determines if a sync will remove the exported files whose sources are no longer exported.
+            record_manifest: Determines if the digests of the exported files will be recorded in a manifest in each
+                exported directory, which a sync always does.
+            archive: The archive to write the exported files into, which paths are then within, instead of a directory.
             kwargs: The keyword arguments for inheritance if any.
         """
         if modality is not None:
             self.modality = modality
 
+        if copy_engine is not None:
+            self.copy_engine = copy_engine
+
+        if blob_store is not None:
+            self.blob_store = blob_store
+
+        if view is not None:
+            self.view = view
+
+        if sync is not None:
+            self.sync = sync
+
+        if prune is not None:
+            self.prune = prune
+
+        if record_manifest is not None:
+            self.record_manifest = record_manifest
+
+        if archive is not None:
+            self.archive = archive
+
         super().construct(**kwargs)
 
+    def create_manifest(self, path: Path) -> TransferManifest:
+        """Creates or loads the manifest which records the digests of the files exported into a directory.
+
+        Args:
+            path: The path to the modality directory being exported into.
+
+        Returns:
+            The export manifest of the directory.
+        """
+        return TransferManifest(path / self.manifest_name, algorithm=self.hash_algorithm)
+
+    def _export_file(self, old_path: Path, new_path: Path, manifest: TransferManifest | None) -> None:
+        # The files are only hashed when they are recorded, so a plain copy can use the kernel copy strategy.
+        algorithm = None if manifest is None else manifest.algorithm
+        if self.view:
+            # A link has the contents of its source by construction, so it is recorded without being hashed.
+            self.view_engine.copy(old_path, new_path)
+            if manifest is not None:
+                manifest.record(old_path, new_path, hash_target=False)
+            return
+        elif self.blob_store is None:
+            hash_ = self.copy_engine.copy(old_path, new_path, algorithm=algorithm).hash
+        else:
+            hash_ = self.blob_store.store(old_path, new_path).hash
+            if self.blob_store.algorithm != algorithm:
+                hash_ = None
+        if manifest is not None:
+            manifest.record(old_path, new_path, hash_)
+
+    def archive_files(self, path: Path, name: str, old_paths: list[Path]) -> None:
+        """Writes files into the archive, renaming them as they are written.
+
+        Args:
+            path: The path of the modality directory within the archive.
+            name: The new name of the modality.
+            old_paths: The paths to the files to export.
+        """
+        for old_path in old_paths:
+            self.archive.add_file(old_path, path / old_path.name.replace(self.modality.full_name, name))
+
+    def export_files(self, path: Path, name: str, old_paths: list[Path]) -> None:
+        """Exports files into a directory, skipping the files which were already exported.
+
+        Without sync, a file is skipped when its target exists, and the exported files are only hashed and recorded in
+        a manifest when record_manifest is True. With sync, a file is skipped when the manifest records that its target
+        was exported from the current size and modification time of the file and the target still has its recorded
+        size, so only the files which changed are exported again. A sync with prune also removes the recorded targets
+        whose files are no longer exported. Files which are not in the manifest are never removed.
+
+        Args:
+            path: The path to the modality directory to export into.
+            name: The new name of the modality.
+            old_paths: The paths to the files to export.
+        """
+        if self.archive is not None:
+            self.archive_files(path, name, old_paths)
+            return
+
+        if not (self.sync or self.record_manifest):
+            for old_path in old_paths:
+                new_path = path / old_path.name.replace(self.modality.full_name, name)
+                if not new_path.exists():
+                    self._export_file(old_path, new_path, None)
+            return
+
+        manifest = self.create_manifest(path)
+        targets = set()
+        changed = False
+        for old_path in old_paths:
+            new_path = path / old_path.name.replace(self.modality.full_name, name)
+            targets.add(manifest.key(new_path))
+            if manifest.is_current(old_path, new_path) if self.sync else new_path.exists():
+                continue
+            # An outdated target is removed first, so a link from a view export is replaced rather than written through.
+            new_path.unlink(missing_ok=True)
+            self._export_file(old_path, new_path, manifest)
+            changed = True
+
+        if self.sync and self.prune:
+            for key in manifest.records.keys() - targets:
+                manifest.target_path(key).unlink(missing_ok=True)
+                manifest.remove(key)
+                changed = True
+
+        if changed:
+            if manifest.records:
+                manifest.save()
+            else:
+                manifest.path.unlink(missing_ok=True)
+
+    def create_name_matcher(self, select: bool = False) -> NameMatcher:
+        """Gets the matcher of the export file names, which is compiled once for each distinct set of names.
+
+        Args:
+            select: Determines if only the names matching the export file names will be included.
+
+        Returns:
+            The matcher of the export file names.
+        """
+        return compile_name_matcher(self.export_file_names if select else None, self.export_exclude_names)
+
+    def list_files(self, select: bool = False) -> list[Path]:
+        """Lists the files of the modality to export, skipping hidden files.
+
+        Args:
+            select: Determines if only the files matching the export file names will be included.
+
+        Returns:
+            The paths to the files to export.
+        """
+        matcher = self.create_name_matcher(select)
+        # The directory entries know their types, so the files are listed without a stat of each file. Hidden files,
+        # such as the partial files an interrupted import leaves behind, are never exported.
+        with os.scandir(self.modality.path) as entries:
+            return [
+                Path(e.path) for e in entries if not e.name.startswith(".") and e.is_file() and matcher.match(e.name)
+            ]
+
     def export_all_files(self, path: Path, name: str) -> None:
-        for old_path in self.modality.path.iterdir():
-            if old_path.is_file():
-                old_name = old_path.name
-                exclude = any(n in old_name for n in self.export_exclude_names)
-                if not exclude:
-                    new_path = path / old_path.name.replace(self.modality.full_name, name)
-                    if not new_path.exists():
-                        shutil.copy(old_path, new_path)
+        self.export_files(path, name, self.list_files())
 
     def export_select_files(self, path: Path, name: str) -> None:
-        for old_path in self.modality.path.iterdir():
-            if old_path.is_file():
-                old_name = old_path.name
-                include = any(n in old_name for n in self.export_file_names)
-                exclude = any(n in old_name for n in self.export_exclude_names)
-                if include and not exclude:
-                    new_path = path / old_path.name.replace(self.modality.full_name, name)
-                    if not new_path.exists():
-                        shutil.copy(old_path, path / old_name.replace(self.modality.full_name, name))
+        self.export_files(path, name, self.list_files(select=True))
 
     def execute_export(self, path: Path, name: str) -> None:
         new_path = path / f"{self.modality.name}"
-        new_path.mkdir(exist_ok=True)
+        if self.archive is None:
+            new_path.mkdir(exist_ok=True)
         self.export_all_files(path=new_path, name=name)
 
 
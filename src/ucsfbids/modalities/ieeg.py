@@ -24,6 +24,7 @@ from baseobjects.cachingtools import CachingObject, timed_keyless_cache
 # Third-Party Packages #
 from cdfs import CDFS
 
+from ..loading import electrode_table_cache, read_electrodes_tsv, write_electrodes_tsv
 from .exporters import IEEGBIDSExporter
 
 # Local Packages #
@@ -102,13 +103,32 @@ class IEEG(Modality):
         return self.path / f"{self.full_name}_electrodes.tsv"
 
     # Instance Methods #
-    def load_electrodes(self) -> pd.DataFrame:
+    def load_electrodes(self, cache: bool = True, sidecar: bool = False) -> pd.DataFrame:
         """Loads the electrode information from the file.
 
+        The columns have explicit types, with float32 coordinates and categorical descriptions, and missing entries
+        are NaN. A cached table is reused until the file changes, and a copy of it is returned, so it can be modified.
+
+        Args:
+            cache: Determines if the cached table will be copied, otherwise the file is parsed into a new table.
+            sidecar: Determines if a binary sidecar, which loads faster than the file, will be written when the file is
+                parsed. A sidecar which is up to date is always used.
+
         Returns:
             The electrode information.
         """
-        return pd.read_csv(self.electrodes_path, sep="\t")
+        if cache:
+            return electrode_table_cache.get(self.electrodes_path, sidecar=sidecar).copy()
+        return read_electrodes_tsv(self.electrodes_path)
+
+    def save_electrodes(self, electrodes: pd.DataFrame) -> None:
+        """Saves the electrode information to the file with its missing entries as "n/a".
+
+        Args:
+            electrodes: The electrode information to save.
+        """
+        write_electrodes_tsv(electrodes, self.electrodes_path)
+        electrode_table_cache.invalidate(self.electrodes_path)
 
     def create(self) -> None:
         """Creates and sets up the anat directory."""
@@ -13,25 +13,49 @@ __email__ = __email__
 
 # Imports #
 # Standard Libraries #
-import shutil
-import subprocess
+import logging
+import os
+from functools import partial
 from pathlib import Path
+from threading import Lock
 from typing import Any, Optional
 
 # Local Packages #
 from baseobjects import BaseObject
 
-from ucsfbids.importspec import FileSpec
+from ucsfbids.importspec import FileSpec, ImportAction, resolve_import_plan
+from ucsfbids.transfer import (
+    BlobStore,
+    CommandError,
+    CommandPool,
+    CommandResult,
+    CopyEngine,
+    ImportJournal,
+    SourceInventory,
+    TransferManifest,
+    compile_name_matcher,
+    describe_results,
+    run_commands,
+)
+from ucsfbids.transfer.hashing import DEFAULT_ALGORITHM
 
 # Third-Party Packages #
 from ucsfbids.modalities import Modality
 
 
 # Definitions #
+# Constants #
+logger = logging.getLogger(__name__)
+
+
 # Classes #
 class ModalityImporter(BaseObject):
     import_file_names: set[str] = set()
     import_exclude_names: set[str] = set()
+    source_directory: Path = Path("")
+    generate_missing_files: bool = False
+    copy_engine: CopyEngine = CopyEngine()
+    hash_algorithm: str = DEFAULT_ALGORITHM
 
     # Magic Methods #
     # Construction/Destruction
@@ -45,9 +69,16 @@ class ModalityImporter(BaseObject):
         **kwargs: Any,
     ) -> None:
         # New Attributes #
+        self._lock: Lock = Lock()
+
         self.modality: Optional[Modality] = None
         self.src_root: Optional[Path] = None
         self.files: list[FileSpec] = []
+        self.journal: Optional[ImportJournal] = None
+        self.inventory: Optional[SourceInventory] = None
+        self.command_pool: Optional[CommandPool] = None
+        self.blob_store: Optional[BlobStore] = None
+        self.record_hashes: bool = False
 
         # Parent Attributes #
         super().__init__(init=False)
@@ -68,11 +99,24 @@ class ModalityImporter(BaseObject):
         modality: Optional[Modality] = None,
         src_root: Optional[Path] = None,
         files: list[FileSpec] = [],
+        journal: Optional[ImportJournal] = None,
+        inventory: Optional[SourceInventory] = None,
+        command_pool: Optional[CommandPool] = None,
+        blob_store: Optional[BlobStore] = None,
+        copy_engine: Optional[CopyEngine] = None,
+        record_hashes: Optional[bool] = None,
         **kwargs: Any,
     ) -> None:
         """Constructs this object.
 
         Args:
+            journal: The journal which records the imported files so an interrupted import can be resumed.
+            inventory: The inventory of the source which the source files are looked up in.
+            command_pool: The pool which runs external commands in the background, runs them in place if None.
+            blob_store: The store which the imported files are stored in and linked from, copies them if None.
+            copy_engine: The engine which copies the files which have no copy command, uses the class engine if None.
+            record_hashes: Determines if the digests of the imported files will be recorded in their import manifest,
+                which lets the import be verified but hashes every file and keeps copies off the kernel copy path.
             kwargs: The keyword arguments for inheritance if any.
         """
         if modality is not None:
@@ -84,70 +128,204 @@ class ModalityImporter(BaseObject):
         if files:
             self.files = files
 
+        if journal is not None:
+            self.journal = journal
+
+        if inventory is not None:
+            self.inventory = inventory
+
+        if command_pool is not None:
+            self.command_pool = command_pool
+
+        if blob_store is not None:
+            self.blob_store = blob_store
+
+        if copy_engine is not None:
+            self.copy_engine = copy_engine
+
+        if record_hashes is not None:
+            self.record_hashes = record_hashes
+
         super().construct(**kwargs)
 
-    def _import_file(self, file: FileSpec, old_path: Path, new_path: Path):
-        if file.copy_command is None:
-            shutil.copy(old_path, new_path)
-        elif isinstance(file.copy_command, str):
-            # subprocess.run(f"{file.copy_command} {old_path} {new_path}")
-            subprocess.run([file.copy_command, old_path, new_path])
-        elif callable(file.copy_command):
-            file.copy_command(old_path, new_path)
+    def create_manifest(self, path: Path) -> TransferManifest:
+        """Creates or loads the manifest of the files imported into a modality directory.
 
-        if file.post_command is not None:
-            # subprocess.run(f"{file.post_command} {new_path}")
-            subprocess.run([file.post_command, new_path])
+        Args:
+            path: The path to the modality directory being imported into.
 
-    def import_all_files(self, path: Path, source_name: str) -> None:
+        Returns:
+            The import manifest of the directory.
+        """
         assert self.modality is not None
-        assert self.src_root is not None
+        manifest_path = path / f"{self.modality.full_name}_{self.modality.name}-import-meta.json"
+        return TransferManifest(manifest_path, algorithm=self.hash_algorithm)
 
-        for file in self.files:
-            new_path = path / f"{self.modality.full_name}_{file.suffix}{file.extension}"
-            for filepath in file.path_from_root:
-                old_path = self.src_root / source_name / filepath
-                old_name = old_path.name
-                exclude = any(n in old_name for n in self.import_exclude_names)
+    def _is_imported(self, action: ImportAction, manifest: TransferManifest) -> bool:
+        if self.journal is not None and self.journal.is_committed(action.destination):
+            return True
+        return manifest.is_current(action.source, action.destination, action.size, action.mtime_ns)
 
-                if not old_path.is_file():
-                    continue
+    def _import_file(
+        self,
+        file: FileSpec,
+        old_path: Path,
+        new_path: Path,
+        manifest: TransferManifest | None = None,
+    ) -> None:
+        # The file is written to a temporary name with the same extension, so tools which infer the format from the
+        # extension still work, then it is renamed into place so a crash cannot leave a partial file at new_path.
+        temporary_path = new_path.with_name(f".tmp-{new_path.name}")
+        if self.journal is not None:
+            self.journal.begin(new_path, temporary_path)
+
+        # A recorded plain copy is hashed while it is copied unless a post command will change it afterwards. Hashing
+        # passes every byte through this process, so it is opt-in and a plain copy otherwise stays in the kernel.
+        hashed = manifest is not None and self.record_hashes and file.post_command is None
+        algorithm = manifest.algorithm if hashed else None
+        hash_ = None
+        commands = []
+        if file.copy_command is None and file.post_command is None and self.blob_store is not None:
+            hash_ = self.blob_store.store(old_path, temporary_path).hash
+            if algorithm != self.blob_store.algorithm:
+                hash_ = None
+        elif file.copy_command is None:
+            # A hardlink would let the post command modify the source through the copy.
+            link = file.post_command is None
+            hash_ = self.copy_engine.copy(old_path, temporary_path, link=link, algorithm=algorithm).hash
+        elif isinstance(file.copy_command, str):
+            # subprocess.run(f"{file.copy_command} {old_path} {new_path}")
+            commands.append([file.copy_command, old_path, temporary_path])
+        elif callable(file.copy_command):
+            file.copy_command(old_path, temporary_path)
 
-                if exclude:
-                    continue
+        if file.post_command is not None:
+            # subprocess.run(f"{file.post_command} {new_path}")
+            commands.append([file.post_command, temporary_path])
+
+        # External commands are run by the pool while this importer continues, and the import is finished after them.
+        finish = partial(self._finish_import, old_path, new_path, temporary_path, manifest, hash_)
+        if not commands:
+            finish([])
+        elif self.command_pool is None:
+            finish(run_commands(commands, timeout=file.timeout))
+        else:
+            self.command_pool.submit(commands, timeout=file.timeout, callback=finish)
+
+    def _finish_import(
+        self,
+        old_path: Path,
+        new_path: Path,
+        temporary_path: Path,
+        manifest: TransferManifest | None,
+        hash_: str | None,
+        results: list[CommandResult],
+    ) -> None:
+        """Renames an imported file into place and records it after its external commands finish.
 
-                if new_path.exists():
-                    continue
+        Args:
+            old_path: The path to the source file.
+            new_path: The path to import the file to.
+            temporary_path: The path the file was imported to before it is renamed into place.
+            manifest: The manifest to record the file in, None to not record it.
+            hash_: The digest of the file if it was hashed while it was copied, which is otherwise hashed here when
+                record_hashes is True.
+            results: The results of the external commands of the file.
+
+        Raises:
+            CommandError: If an external command failed, so the failure is reported by the import of the subject.
+        """
+        # A failed or partial import is never renamed into place or recorded, so it is redone on the next run.
+        if any(r.returncode != 0 for r in results):
+            temporary_path.unlink(missing_ok=True)
+            description = describe_results(results)
+            logger.error("Failed to import %s.\n%s", new_path, description)
+            raise CommandError(f"Failed to import {new_path}.\n{description}", results)
+        elif not temporary_path.is_file():
+            return
+
+        os.replace(temporary_path, new_path)
+        with self._lock:
+            if manifest is not None:
+                manifest.record(old_path, new_path, hash_, hash_target=self.record_hashes)
+                manifest.save()
+        if self.journal is not None:
+            self.journal.commit(new_path)
+
+    def plan_files(self, path: Path, source_name: str, select: bool = False) -> list[ImportAction]:
+        """Lists the files to import and their candidate sources without accessing the source.
 
-                self._import_file(file, old_path, new_path)
-                break
+        Args:
+            path: The path to the modality directory to import into.
+            source_name: The name of the source patient.
+            select: Determines if only the candidates matching the import file names will be included.
 
-    def import_select_files(self, path: Path, source_name: str) -> None:
+        Returns:
+            The unresolved import actions of the files.
+        """
         assert self.modality is not None
         assert self.src_root is not None
 
+        source_root = self.src_root / self.source_directory / source_name
+        matcher = compile_name_matcher(self.import_file_names if select else None, self.import_exclude_names)
+        actions = []
         for file in self.files:
-            new_path = path / f"{self.modality.full_name}_{file.suffix}{file.extension}"
+            candidates = []
             for filepath in file.path_from_root:
-                old_path = self.src_root / source_name / filepath
-                old_name = old_path.name
-                include = any(n in old_name for n in self.import_file_names)
-                exclude = any(n in old_name for n in self.import_exclude_names)
+                old_path = source_root / filepath
+                if matcher.match(old_path.name):
+                    candidates.append(old_path)
+
+            actions.append(
+                ImportAction(
+                    file=file,
+                    destination=path / f"{self.modality.full_name}_{file.suffix}{file.extension}",
+                    candidates=tuple(candidates),
+                    modality=self.modality.name,
+                )
+            )
+        return actions
 
-                if not old_path.is_file():
-                    continue
+    def plan_import(self, path: Path, source_name: str) -> list[ImportAction]:
+        """Lists the files to import into the modality directory within a session directory.
 
-                if exclude:
-                    continue
+        Args:
+            path: The path to the session directory to import into.
+            source_name: The name of the source patient.
 
-                if not include:
-                    continue
+        Returns:
+            The unresolved import actions of the files.
+        """
+        assert self.modality is not None
+        return self.plan_files(path=path / f"{self.modality.name}", source_name=source_name)
 
-                if new_path.exists():
-                    continue
+    def import_planned_files(self, path: Path, actions: list[ImportAction]) -> None:
+        """Imports the files of resolved import actions.
 
+        Args:
+            path: The path to the modality directory to import into.
+            actions: The resolved import actions of the files.
+        """
+        manifest = self.create_manifest(path)
+        for action in actions:
+            file, old_path, new_path = action.file, action.source, action.destination
+            if action.size is not None:
+                if not self._is_imported(action, manifest):
+                    self._import_file(file, old_path, new_path, manifest)
+            elif not self.generate_missing_files or new_path.exists():
+                continue
+            elif not callable(file.copy_command):
+                raise RuntimeError(f"No source file for {new_path} but no function provided to gather data")
+            elif old_path is not None:
                 self._import_file(file, old_path, new_path)
-                break
+
+    def import_all_files(self, path: Path, source_name: str) -> None:
+        actions = resolve_import_plan(self.plan_files(path, source_name), inventory=self.inventory)
+        self.import_planned_files(path, actions)
+
+    def import_select_files(self, path: Path, source_name: str) -> None:
+        actions = resolve_import_plan(self.plan_files(path, source_name, select=True), inventory=self.inventory)
+        self.import_planned_files(path, actions)
 
     def execute_import(self, path: Path, source_name: str) -> None:
         assert self.modality is not None
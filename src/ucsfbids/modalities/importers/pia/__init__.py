@@ -15,4 +15,4 @@ __email__ = __email__
 # Local Packages #
 from .anatomypiaimporter import AnatomyPiaImporter
 from .ctpiaimporter import CTPiaImporter
-from .ieegpiaimporter import IEEGPiaImporter
+from .ieegpiaimporter import IEEGPiaImporter, convert_electrodes, convert_electrodes_batch
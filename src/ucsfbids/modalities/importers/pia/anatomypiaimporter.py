@@ -18,6 +18,7 @@ from typing import Any, Optional
 from ucsfbids.importspec import FileSpec
 from ucsfbids.modalities import Anatomy
 from ucsfbids.modalities.importers.base import AnatomyImporter
+from ucsfbids.transfer import MGHConverter
 
 
 def strip_json(old_path, new_path):
@@ -35,12 +36,15 @@ def strip_json(old_path, new_path):
 
 TO_STRIP = ["InstitutionName", "InstitutionalDepartmentName", "InstitutionAddress", "DeviceSerialNumber"]
 DEFAULT_FILES = [
-    FileSpec("T1w", ".nii.gz", [Path("mri/brain.mgz")], copy_command="mri_convert"),
+    FileSpec("T1w", ".nii.gz", [Path("mri/brain.mgz")], copy_command=MGHConverter(fallback="mri_convert")),
     FileSpec("T1w", ".json", [Path("acpc/T1_orig.json"), Path("acpc/T1.json")], copy_command=strip_json),
 ]
 
 
 class AnatomyPiaImporter(AnatomyImporter):
+    source_directory: Path = Path("data_store2/imaging/subjects")
+    generate_missing_files: bool = True
+
     def construct(
         self,
         modality: Optional[Anatomy] = None,
@@ -54,41 +58,8 @@ class AnatomyPiaImporter(AnatomyImporter):
         if src_root is not None:
             self.src_root = src_root
 
-        files.extend(DEFAULT_FILES)
-        self.files = files
+        self.files = [*files, *DEFAULT_FILES]
         super().construct(**kwargs)
 
-    def import_all_files(self, path: Path, source_name: str) -> None:
-        assert self.modality is not None
-        assert self.src_root is not None
-
-        for file in self.files:
-            imaging_root = self.src_root / "data_store2/imaging/subjects"
-            new_path = path / f"{self.modality.full_name}_{file.suffix}{file.extension}"
-            for filepath in file.path_from_root:
-                imaging_path = imaging_root / source_name / filepath
-                print(imaging_path)
-                old_name = imaging_path.name
-                exclude = any(n in old_name for n in self.import_exclude_names)
-
-                if new_path.exists():
-                    continue
-
-                if exclude:
-                    continue
-
-                if imaging_path.is_file():
-                    self._import_file(file, imaging_path, new_path)
-                    break
-
-                if not callable(file.copy_command):
-                    continue
-
-                file.copy_command(imaging_path, new_path)
-
-            if not callable(file.copy_command) and not new_path.exists():
-                print(new_path)
-                raise RuntimeError("No source file but no function provided to gather data")
-
 
 Anatomy.default_importers["Pia"] = AnatomyPiaImporter
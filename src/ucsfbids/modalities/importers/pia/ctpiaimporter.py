@@ -40,6 +40,9 @@ DEFAULT_FILES = [
 
 
 class CTPiaImporter(CTImporter):
+    source_directory: Path = Path("data_store2/imaging/subjects")
+    generate_missing_files: bool = True
+
     def construct(
         self,
         modality: Optional[CT] = None,
@@ -53,41 +56,8 @@ class CTPiaImporter(CTImporter):
         if src_root is not None:
             self.src_root = src_root
 
-        files.extend(DEFAULT_FILES)
-        self.files = files
+        self.files = [*files, *DEFAULT_FILES]
         super().construct(**kwargs)
 
-    def import_all_files(self, path: Path, source_name: str) -> None:
-        assert self.modality is not None
-        assert self.src_root is not None
-
-        for file in self.files:
-            imaging_root = self.src_root / "data_store2/imaging/subjects"
-            new_path = path / f"{self.modality.full_name}_{file.suffix}{file.extension}"
-            for filepath in file.path_from_root:
-                imaging_path = imaging_root / source_name / filepath
-                old_name = imaging_path.name
-                exclude = any(n in old_name for n in self.import_exclude_names)
-
-                if new_path.exists():
-                    continue
-
-                if exclude:
-                    continue
-
-                if imaging_path.is_file():
-                    self._import_file(file, imaging_path, new_path)
-                    continue
-
-                if not callable(file.copy_command):
-                    print(f"No source file for {imaging_path}, skipping...")
-                    continue
-
-                file.copy_command(imaging_path, new_path)
-
-            if not callable(file.copy_command) and not new_path.exists():
-                print(new_path)
-                raise RuntimeError("No source file but no function provided to gather data")
-
 
 CT.default_importers["Pia"] = CTPiaImporter
@@ -10,52 +10,114 @@ __maintainer__ = __maintainer__
 __email__ = __email__
 
 import json
+import traceback
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any, Optional
 
+import numpy as np
 import pandas as pd
 from scipy.io import loadmat
 
-from ucsfbids.importspec import FileSpec
+from ucsfbids.importspec import FileSpec, TaskResult
 from ucsfbids.modalities import IEEG
 from ucsfbids.modalities.importers.base import IEEGImporter
 
 
-def convert_electrodes(old_path, new_path):
-    if not old_path.is_file():
-        return
-    original_montage = loadmat(old_path, squeeze_me=True)
-    bids_montage = pd.DataFrame(
-        columns=[
-            "name",
-            "x",
-            "y",
-            "z",
-            "size",
-            "material",
-            "manufacturer",
-            "group",
-            "hemisphere",
-            "type",
-            "impedance",
-        ]
+ELECTRODE_COLUMNS = [
+    "name",
+    "x",
+    "y",
+    "z",
+    "size",
+    "material",
+    "manufacturer",
+    "group",
+    "hemisphere",
+    "type",
+    "impedance",
+]
+
+
+def create_electrodes_table(xyz: np.ndarray, eleclabels: np.ndarray) -> pd.DataFrame:
+    """Creates a BIDS electrodes table from the coordinates and labels of a Pia montage.
+
+    Args:
+        xyz: The coordinates of the electrodes with one row per electrode.
+        eleclabels: The labels of the electrodes with the name in the first column and the group in the third.
+
+    Returns:
+        The electrodes table.
+    """
+    xyz = np.atleast_2d(np.asarray(xyz, dtype=np.float64))
+    eleclabels = np.atleast_2d(eleclabels)
+    x = xyz[:, 0]
+    unknown = np.full(len(xyz), "n/a", dtype=object)
+    names = pd.Series(eleclabels[:, 0], dtype=object)
+    return pd.DataFrame(
+        {
+            "name": names.where(names.notna(), "NaN"),
+            "x": x,
+            "y": xyz[:, 1],
+            "z": xyz[:, 2],
+            "size": unknown,
+            "material": unknown,
+            "manufacturer": unknown,
+            "group": eleclabels[:, 2],
+            "hemisphere": np.select([x > 0, x <= 0], ["r", "l"], default=None).astype(object),
+            "type": unknown,
+            "impedance": unknown,
+        },
+        columns=ELECTRODE_COLUMNS,
     )
-    xyz = original_montage["elecmatrix"]
-    eleclabels = original_montage["eleclabels"]
-    bids_montage.loc[:, "x"] = xyz[:, 0]
-    bids_montage.loc[:, "y"] = xyz[:, 1]
-    bids_montage.loc[:, "z"] = xyz[:, 2]
-    bids_montage.loc[:, "name"] = eleclabels[:, 0]
-    bids_montage.loc[:, "group"] = eleclabels[:, 2]
-    bids_montage.loc[:, "size"] = "n/a"
-    bids_montage.loc[:, "material"] = "n/a"
-    bids_montage.loc[:, "manufacturer"] = "n/a"
-    bids_montage.loc[bids_montage["x"] > 0, "hemisphere"] = "r"
-    bids_montage.loc[bids_montage["x"] <= 0, "hemisphere"] = "l"
-    bids_montage.loc[:, "type"] = "n/a"
-    bids_montage.loc[:, "impedance"] = "n/a"
-    bids_montage.name = bids_montage.name.fillna("NaN")
-    bids_montage.to_csv(new_path, sep="\t")
+
+
+def convert_electrodes(old_path: Path, new_path: Path) -> bool:
+    """Converts a Pia montage to a BIDS electrodes file.
+
+    Args:
+        old_path: The path to the montage .mat file.
+        new_path: The path to the electrodes file to create.
+
+    Returns:
+        True if the montage was converted, False if it does not exist.
+    """
+    if not old_path.is_file():
+        return False
+    original_montage = loadmat(old_path, squeeze_me=True, variable_names=("elecmatrix", "eleclabels"))
+    bids_montage = create_electrodes_table(original_montage["elecmatrix"], original_montage["eleclabels"])
+    bids_montage.to_csv(new_path, sep="\t", index=False)
+    return True
+
+
+def _convert_electrodes_task(paths: tuple[Path, Path]) -> TaskResult:
+    old_path, new_path = paths
+    try:
+        if not convert_electrodes(Path(old_path), Path(new_path)):
+            return TaskResult(str(new_path), False, f"{old_path} does not exist.")
+    except Exception:
+        return TaskResult(str(new_path), False, traceback.format_exc())
+    return TaskResult(str(new_path), True)
+
+
+def convert_electrodes_batch(paths: Iterable[tuple[Path, Path]], jobs: int | None = None) -> list[TaskResult]:
+    """Converts many Pia montages to BIDS electrodes files in a pool of processes.
+
+    A montage which fails to convert is reported in the results instead of raised, so it does not stop the others.
+
+    Args:
+        paths: The path to each montage .mat file and the path to the electrodes file to create from it.
+        jobs: The number of processes to convert the montages with, uses the number of CPUs if None.
+
+    Returns:
+        The path to each electrodes file and whether its conversion succeeded.
+    """
+    paths = list(paths)
+    if jobs == 1 or len(paths) <= 1:
+        return [_convert_electrodes_task(p) for p in paths]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(_convert_electrodes_task, paths))
 
 
 def create_coords(_, new_path):
@@ -77,6 +139,9 @@ DEFAULT_FILES = [
 
 
 class IEEGPiaImporter(IEEGImporter):
+    source_directory: Path = Path("data_store2/imaging/subjects")
+    generate_missing_files: bool = True
+
     def construct(
         self,
         modality: Optional[IEEG] = None,
@@ -90,40 +155,8 @@ class IEEGPiaImporter(IEEGImporter):
         if src_root is not None:
             self.src_root = src_root
 
-        files.extend(DEFAULT_FILES)
-        self.files = files
+        self.files = [*files, *DEFAULT_FILES]
         super().construct(**kwargs)
 
-    def import_all_files(self, path: Path, source_name: str) -> None:
-        assert self.modality is not None
-        assert self.src_root is not None
-
-        for file in self.files:
-            imaging_root = self.src_root / "data_store2/imaging/subjects"
-            new_path = path / f"{self.modality.full_name}_{file.suffix}{file.extension}"
-            for filepath in file.path_from_root:
-                imaging_path = imaging_root / source_name / filepath
-                old_name = imaging_path.name
-                exclude = any(n in old_name for n in self.import_exclude_names)
-
-                if new_path.exists():
-                    continue
-
-                if exclude:
-                    continue
-
-                if imaging_path.is_file():
-                    self._import_file(file, imaging_path, new_path)
-                    break
-
-                if not callable(file.copy_command):
-                    continue
-
-                file.copy_command(imaging_path, new_path)
-
-            if not callable(file.copy_command) and not new_path.exists():
-                print(new_path)
-                raise RuntimeError("No source file but no function provided to gather data")
-
 
 IEEG.default_importers["Pia"] = IEEGPiaImporter
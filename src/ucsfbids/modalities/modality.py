@@ -25,6 +25,7 @@ from baseobjects.cachingtools.cachingobject import CachingObject
 from baseobjects.objects.dispatchableclass import DispatchableClass
 
 # Local Packages #
+from ..loading import DatasetIndex, meta_info_cache
 
 
 # Definitions #
@@ -87,6 +88,7 @@ class Modality(CachingObject, BaseComposite, DispatchableClass):
         name: str | None = None,
         parent_path: Path | str | None = None,
         *args: Any,
+        index: DatasetIndex | None = None,
         **kwargs: Any,
     ) -> tuple[str, str]:
         """Gets a class namespace and name from a given set of arguments.
@@ -96,6 +98,7 @@ class Modality(CachingObject, BaseComposite, DispatchableClass):
             name: The name of the session.
             parent_path: The path to the parent of the session.
             *args: The arguments to get the namespace and name from.
+            index: The index of the dataset which may contain the meta information of the modality.
             **kwargs: The keyword arguments to get the namespace and name from.
 
         Returns:
@@ -112,12 +115,14 @@ class Modality(CachingObject, BaseComposite, DispatchableClass):
         else:
             raise ValueError("Either path or (parent_path and name) must be given to disptach class.")
 
+        if index is not None and (entry := index.get_entry(path)) is not None and entry.namespace is not None:
+            return entry.namespace, entry.type
+
         subject_name = path.parts[-3][4:]
         session_name = path.parts[-2][4:]
 
         meta_info_path = path / f"sub-{subject_name}_ses-{session_name}_{name}-meta.json"
-        with meta_info_path.open("r") as file:
-            info = json.load(file)
+        info = meta_info_cache.get(meta_info_path)
 
         return info["ModalityNamespace"], info["ModalityType"]
 
@@ -233,6 +238,7 @@ class Modality(CachingObject, BaseComposite, DispatchableClass):
         """Creates meta information file and saves the meta information."""
         with self.meta_info_path.open(self._mode) as file:
             json.dump(self.meta_info, file)
+        meta_info_cache.put(self.meta_info_path, self.meta_info)
 
     def load_meta_info(self) -> dict:
         """Loads the meta information from the file.
@@ -241,14 +247,14 @@ class Modality(CachingObject, BaseComposite, DispatchableClass):
             The modality meta information.
         """
         self.meta_info.clear()
-        with self.meta_info_path.open("r") as file:
-            self.meta_info.update(json.load(file))
+        self.meta_info.update(meta_info_cache.get(self.meta_info_path, copy=True))
         return self.meta_info
 
     def save_meta_info(self) -> None:
         """Saves the meta information to the file."""
         with self.meta_info_path.open(self._mode) as file:
             json.dump(self.meta_info, file)
+        meta_info_cache.put(self.meta_info_path, self.meta_info)
 
     def create(self) -> None:
         """Creates all contents of the modality."""
@@ -259,8 +265,8 @@ class Modality(CachingObject, BaseComposite, DispatchableClass):
         return self.importers[type_](modality=self, src_root=src_root, **kwargs)
 
 
-    def create_exporter(self, type_: str) -> Any:
-        return self.exporters[type_](modality=self)
+    def create_exporter(self, type_: str, **kwargs) -> Any:
+        return self.exporters[type_](modality=self, **kwargs)
 
     def add_importer(self, type_: str, importer: type, overwrite: bool = False):
         if type_ not in self.importers or overwrite:
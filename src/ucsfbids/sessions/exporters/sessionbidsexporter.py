@@ -20,6 +20,7 @@ from typing import Any
 # Third-Party Packages #
 
 # Local Packages #
+from ...transfer import ArchiveWriter, BlobStore
 from ..session import Session
 
 
@@ -37,6 +38,12 @@ class SessionBIDSExporter(BaseObject):
     ) -> None:
         # New Attributes #
         self.session: Session | None = None
+        self.blob_store: BlobStore | None = None
+        self.view: bool = False
+        self.sync: bool = False
+        self.prune: bool = False
+        self.record_manifest: bool = False
+        self.archive: ArchiveWriter | None = None
 
         # Parent Attributes #
         super().__init__(init=False)
@@ -53,21 +60,63 @@ class SessionBIDSExporter(BaseObject):
     def construct(
         self,
         session: Session | None = None,
+        blob_store: BlobStore | None = None,
+        view: bool | None = None,
+        sync: bool | None = None,
+        prune: bool | None = None,
+        record_manifest: bool | None = None,
+        archive: ArchiveWriter | None = None,
         **kwargs: Any,
     ) -> None:
         """Constructs this object.
 
         Args:
+            blob_store: The store which the exported files are stored in and linked from, copies them if None.
+            view: Determines if the exported files will be hardlinks to the files of the dataset, or symlinks when the
+                export is on another file system, instead of copies.
+            sync: Determines if the files which changed since they were exported will be exported again, instead of
+                only exporting the files which are not in the export.
+            prune: Determines if a sync will remove the exported files whose sources are no longer exported.
+            record_manifest: Determines if the digests of the exported files will be recorded in a manifest in each
+                exported directory, which a sync always does.
+            archive: The archive to write the exported files into, which paths are then within, instead of a directory.
             kwargs: The keyword arguments for inheritance if any.
         """
         if session is not None:
             self.session = session
 
+        if blob_store is not None:
+            self.blob_store = blob_store
+
+        if view is not None:
+            self.view = view
+
+        if sync is not None:
+            self.sync = sync
+
+        if prune is not None:
+            self.prune = prune
+
+        if record_manifest is not None:
+            self.record_manifest = record_manifest
+
+        if archive is not None:
+            self.archive = archive
+
         super().construct(**kwargs)
 
     def export_modalities(self, path: Path, name: str):
         for modality in self.session.modalities.values():
-            modality.create_exporter("BIDS").execute_export(path, name=name)
+            exporter = modality.create_exporter(
+                "BIDS",
+                blob_store=self.blob_store,
+                view=self.view,
+                sync=self.sync,
+                prune=self.prune,
+                record_manifest=self.record_manifest,
+                archive=self.archive,
+            )
+            exporter.execute_export(path, name=name)
 
     def execute_export(self, path: Path, name: str | None = None) -> None:
         if name is None:
@@ -75,7 +124,8 @@ class SessionBIDSExporter(BaseObject):
 
         full_name = f"{path.parts[-1]}_ses-{name}"
         new_path = path / f"ses-{name}"
-        new_path.mkdir(exist_ok=True)
+        if self.archive is None:
+            new_path.mkdir(exist_ok=True)
         self.export_modalities(path=new_path, name=full_name)
 
 
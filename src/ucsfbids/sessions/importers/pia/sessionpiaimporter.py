@@ -11,7 +11,7 @@ __email__ = __email__
 from pathlib import Path
 from typing import Any
 
-from ucsfbids.importspec import ModalitySpec
+from ucsfbids.importspec import ImportAction, ModalitySpec, TaskResult
 from ucsfbids.modalities import CT, IEEG, Anatomy
 from ucsfbids.modalities.importers.pia import AnatomyPiaImporter, CTPiaImporter, IEEGPiaImporter
 from ucsfbids.sessions import Session
@@ -38,15 +38,19 @@ class SessionPiaImporter(SessionImporter):
         if src_root is not None:
             self.src_root = src_root
 
-        modalities.extend(DEFAULT_MODALITIES)
-
-        self._process_modalities(modalities)
+        self._process_modalities([*modalities, *DEFAULT_MODALITIES])
         super().construct(**kwargs)
 
-    def import_modalities(self, path: Path, source_patient: str):
+    def import_modalities(self, path: Path, source_patient: str) -> list[TaskResult]:
+        return self.run_modality_imports("Pia", path, source_patient)
+
+    def plan_modalities(self, path: Path, source_patient: str) -> list[ImportAction]:
         assert self.session is not None
+        actions = []
         for modality in self.session.modalities.values():
-            modality.create_importer("Pia", self.src_root).execute_import(path, source_patient)
+            importer = modality.create_importer("Pia", self.src_root, inventory=self.inventory)
+            actions.extend(importer.plan_import(path, source_patient))
+        return actions
 
     def execute_import(self, path: Path, source_patient: str, name: str | None = None) -> None:
         assert self.session is not None
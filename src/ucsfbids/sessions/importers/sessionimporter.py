@@ -12,13 +12,17 @@ __maintainer__ = __maintainer__
 __email__ = __email__
 
 
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Any, Optional
 
 from baseobjects import BaseObject
 
-from ucsfbids.importspec import ModalitySpec
+from ucsfbids.importspec import ImportAction, ModalitySpec, TaskResult
 from ucsfbids.sessions.session import Session
+from ucsfbids.transfer import BlobStore, CommandPool, ImportJournal, SourceInventory
 
 
 class SessionImporter(BaseObject):
@@ -33,6 +37,12 @@ class SessionImporter(BaseObject):
     ) -> None:
         self.session: Optional[Session] = None
         self.src_root: Optional[Path] = None
+        self.journal: Optional[ImportJournal] = None
+        self.inventory: Optional[SourceInventory] = None
+        self.command_pool: Optional[CommandPool] = None
+        self.blob_store: Optional[BlobStore] = None
+        self.modality_jobs: Optional[int] = None
+        self.record_hashes: bool = False
 
         super().__init__(init=False)
 
@@ -60,11 +70,23 @@ class SessionImporter(BaseObject):
         session: Optional[Session] = None,
         src_root: Optional[Path] = None,
         modalities: list[ModalitySpec] = [],
+        journal: Optional[ImportJournal] = None,
+        inventory: Optional[SourceInventory] = None,
+        command_pool: Optional[CommandPool] = None,
+        blob_store: Optional[BlobStore] = None,
+        modality_jobs: Optional[int] = None,
+        record_hashes: Optional[bool] = None,
         **kwargs: Any,
     ) -> None:
         """Constructs this object.
 
         Args:
+            journal: The journal which records the imported files so an interrupted import can be resumed.
+            inventory: The inventory of the source which the source files are looked up in.
+            command_pool: The pool which runs external commands in the background, runs them in place if None.
+            blob_store: The store which the imported files are stored in and linked from, copies them if None.
+            modality_jobs: The number of threads to import the modalities with, imports them serially if None or 1.
+            record_hashes: Determines if the digests of the imported files will be recorded in their import manifests.
             kwargs: The keyword arguments for inheritance if any.
         """
         if session is not None:
@@ -73,14 +95,118 @@ class SessionImporter(BaseObject):
         if src_root is not None:
             self.src_root = src_root
 
+        if journal is not None:
+            self.journal = journal
+
+        if inventory is not None:
+            self.inventory = inventory
+
+        if command_pool is not None:
+            self.command_pool = command_pool
+
+        if blob_store is not None:
+            self.blob_store = blob_store
+
+        if modality_jobs is not None:
+            self.modality_jobs = modality_jobs
+
+        if record_hashes is not None:
+            self.record_hashes = record_hashes
+
         self._process_modalities(modalities)
         super().construct(**kwargs)
 
-    def import_modalities(self, path: Path, source_patient: str):
-        assert self.session is not None
+    def _import_modality(
+        self,
+        item: tuple[str, Modality],
+        importer_key: str,
+        path: Path,
+        source_patient: str,
+    ) -> TaskResult:
+        name, modality = item
+        try:
+            importer = modality.create_importer(
+                importer_key,
+                self.src_root,
+                journal=self.journal,
+                inventory=self.inventory,
+                command_pool=self.command_pool,
+                blob_store=self.blob_store,
+                record_hashes=self.record_hashes,
+            )
+            importer.execute_import(path, source_patient)
+        except Exception:
+            return TaskResult(name, False, traceback.format_exc())
+        return TaskResult(name, True)
+
+    def run_modality_imports(self, importer_key: str, path: Path, source_patient: str) -> list[TaskResult]:
+        """Imports every modality of the session with the importers of a type.
+
+        The modalities are bound by different resources, such as conversion commands, large copies, and parsing, so
+        when modality_jobs is more than one they are imported concurrently by threads, which overlap these. A failed
+        modality does not stop the others, and the failures are raised together after all modalities finish.
+
+        Args:
+            importer_key: The type of the modality importers.
+            path: The path to the session directory to import into.
+            source_patient: The name of the source patient.
+
+        Returns:
+            The name of each modality and whether its import succeeded.
 
+        Raises:
+            RuntimeError: If any modality failed to import.
+        """
+        assert self.session is not None
+        import_modality = partial(
+            self._import_modality,
+            importer_key=importer_key,
+            path=path,
+            source_patient=source_patient,
+        )
+        items = list(self.session.modalities.items())
+        if self.modality_jobs is None or self.modality_jobs <= 1:
+            results = [import_modality(item) for item in items]
+        else:
+            with ThreadPoolExecutor(max_workers=self.modality_jobs) as executor:
+                results = list(executor.map(import_modality, items))
+
+        failed = [r for r in results if not r.succeeded]
+        if failed:
+            names = [r.name for r in failed]
+            errors = "\n".join(f"{r.name}:\n{r.error}" for r in failed)
+            raise RuntimeError(f"Failed to import the modalities {names} of {self.session.path}.\n{errors}")
+        return results
+
+    def import_modalities(self, path: Path, source_patient: str) -> list[TaskResult]:
+        return self.run_modality_imports("BIDS", path, source_patient)
+
+    def plan_modalities(self, path: Path, source_patient: str) -> list[ImportAction]:
+        assert self.session is not None
+        actions = []
         for modality in self.session.modalities.values():
-            modality.create_importer("BIDS", self.src_root).execute_import(path, source_patient)
+            importer = modality.create_importer("BIDS", self.src_root, inventory=self.inventory)
+            actions.extend(importer.plan_import(path, source_patient))
+        return actions
+
+    def plan_import(self, path: Path, source_patient: str, name: str | None = None) -> list[ImportAction]:
+        """Lists the files to import into the session directory without importing them.
+
+        Args:
+            path: The path to the subject directory to import into.
+            source_patient: The name of the source patient.
+            name: The name of the session, uses the name of the session object if None.
+
+        Returns:
+            The unresolved import actions of the files.
+        """
+        assert self.session is not None
+        if name is None:
+            name = self.session.name
+        assert name is not None
+
+        new_path = path / f"ses-{name}"
+        return [a._replace(session=name) for a in self.plan_modalities(path=new_path, source_patient=source_patient)]
 
     def execute_import(self, path: Path, source_patient: str, name: str | None = None) -> None:
         assert self.session is not None
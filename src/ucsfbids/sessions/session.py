@@ -14,6 +14,7 @@ __email__ = __email__
 # Imports #
 # Standard Libraries #
 import json
+from functools import partial
 from pathlib import Path
 from typing import Any
 
@@ -25,6 +26,7 @@ from baseobjects.cachingtools.cachingobject import CachingObject
 from baseobjects.objects.dispatchableclass import DispatchableClass
 
 # Local Packages #
+from ..loading import DatasetIndex, LazyChildMap, meta_info_cache, scan_directories
 from ..modalities import Modality
 
 
@@ -54,6 +56,9 @@ class Session(CachingObject, DispatchableClass):
         parent_path: The parent path of this session.
         mode: The file mode to set this session to.
         create: Determines if this session will be created if it does not exist.
+        load: Determines if the modalities will be loaded from the session's directory.
+        lazy: Determines if the modalities will only be constructed when they are first accessed.
+        index: The index of the dataset to load the modalities from.
         init: Determines if this object will construct.
         kwargs: The keyword arguments for inheritance if any.
     """
@@ -88,6 +93,7 @@ class Session(CachingObject, DispatchableClass):
         name: str | None = None,
         parent_path: Path | str | None = None,
         *args: Any,
+        index: DatasetIndex | None = None,
         **kwargs: Any,
     ) -> tuple[str, str]:
         """Gets a class namespace and name from a given set of arguments.
@@ -97,6 +103,7 @@ class Session(CachingObject, DispatchableClass):
             name: The name of the session.
             parent_path: The path to the parent of the session.
             *args: The arguments to get the namespace and name from.
+            index: The index of the dataset which may contain the meta information of the session.
             **kwargs: The keyword arguments to get the namespace and name from.
 
         Returns:
@@ -113,14 +120,16 @@ class Session(CachingObject, DispatchableClass):
         else:
             raise ValueError("Either path or (parent_path and name) must be given to disptach class.")
 
+        if index is not None and (entry := index.get_entry(path)) is not None and entry.namespace is not None:
+            return entry.namespace, entry.type
+
         parent_name = path.parts[-2][4:]
 
         meta_info_path = path / f"sub-{parent_name}_ses-{name}_meta.json"
-        if not meta_info_path.exists():
+        try:
+            info = meta_info_cache.get(meta_info_path)
+        except FileNotFoundError:
             info = cls.default_meta_info
-        else:
-            with meta_info_path.open("r") as file:
-                info = json.load(file)
         return info["SessionNamespace"], info["SessionType"]
 
     # Magic Methods #
@@ -133,6 +142,8 @@ class Session(CachingObject, DispatchableClass):
         mode: str = "r",
         create: bool = False,
         load: bool = True,
+        lazy: bool = False,
+        index: DatasetIndex | None = None,
         *,
         init: bool = True,
         **kwargs: Any,
@@ -141,12 +152,14 @@ class Session(CachingObject, DispatchableClass):
         self._path: Path | None = None
         self._is_open: bool = False
         self._mode: str = "r"
+        self._lazy: bool = False
+        self.index: DatasetIndex | None = None
 
         self.name: str | None = None
         self.parent_name: str | None = None
 
         self.meta_info: dict = self.default_meta_info.copy()
-        self.modalities: dict[str, Any] = {}
+        self.modalities: dict[str, Any] | LazyChildMap = {}
 
         self.importers: dict[str, type] = self.default_importers.copy()
         self.exporters: dict[str, type] = self.default_exporters.copy()
@@ -163,6 +176,8 @@ class Session(CachingObject, DispatchableClass):
                 mode=mode,
                 create=create,
                 load=load,
+                lazy=lazy,
+                index=index,
                 **kwargs,
             )
 
@@ -199,6 +214,8 @@ class Session(CachingObject, DispatchableClass):
         mode: str | None = None,
         create: bool = False,
         load: bool = False,
+        lazy: bool | None = None,
+        index: DatasetIndex | None = None,
         **kwargs: Any,
     ) -> None:
         """Constructs this object.
@@ -209,6 +226,9 @@ class Session(CachingObject, DispatchableClass):
             parent_path: The parent path of this session.
             mode: The file mode to set this session to.
             create: Determines if this session will be created if it does not exist.
+            load: Determines if the modalities will be loaded from the session's directory.
+            lazy: Determines if the modalities will only be constructed when they are first accessed.
+            index: The index of the dataset to load the modalities from.
             kwargs: The keyword arguments for inheritance if any.
         """
         if name is not None:
@@ -230,6 +250,12 @@ class Session(CachingObject, DispatchableClass):
         if mode is not None:
             self._mode = mode
 
+        if lazy is not None:
+            self._lazy = lazy
+
+        if index is not None:
+            self.index = index
+
         if not load:
             self.build_default_modalities()
 
@@ -245,6 +271,7 @@ class Session(CachingObject, DispatchableClass):
         """Creates meta information file and saves the meta information."""
         with self.meta_info_path.open(self._mode) as file:
             json.dump(self.meta_info, file)
+        meta_info_cache.put(self.meta_info_path, self.meta_info)
 
     def load_meta_info(self) -> dict:
         """Loads the meta information from the file.
@@ -253,14 +280,14 @@ class Session(CachingObject, DispatchableClass):
             The session meta information.
         """
         self.meta_info.clear()
-        with self.meta_info_path.open("r") as file:
-            self.meta_info.update(json.load(file))
+        self.meta_info.update(meta_info_cache.get(self.meta_info_path, copy=True))
         return self.meta_info
 
     def save_meta_info(self) -> None:
         """Saves the meta information to the file."""
         with self.meta_info_path.open(self._mode) as file:
             json.dump(self.meta_info, file)
+        meta_info_cache.put(self.meta_info_path, self.meta_info)
 
     def build_default_modalities(self) -> None:
         for name, modality_type in self.default_modalities.items():
@@ -277,19 +304,33 @@ class Session(CachingObject, DispatchableClass):
         self.create_meta_info()
         self.create_modalities()
 
-    def load_modalities(self, mode: str | None = None) -> None:
-        """Loads all modalities in this session."""
+    def load_modalities(self, mode: str | None = None, lazy: bool | None = None) -> None:
+        """Loads all modalities in this session.
+
+        Args:
+            mode: The file mode to set the modalities to, defaults to the session's mode.
+            lazy: Determines if the modalities will only be constructed when they are first accessed.
+        """
         mode = self._mode if mode is None else mode
-        self.modalities.clear()
-        self.modalities.update(
-            {m.name: m for p in self.path.iterdir() if p.is_dir() and (m := Modality(path=p, mode=mode)) is not None},
-        )
+        lazy = self._lazy if lazy is None else lazy
+        paths = None if self.index is None else self.index.get_children(self.path)
+        if paths is None:
+            paths = scan_directories(self.path)
+        factory = partial(Modality, mode=mode, index=self.index)
+
+        if lazy:
+            self.modalities = LazyChildMap(factory=factory, paths=paths)
+        else:
+            if isinstance(self.modalities, LazyChildMap):
+                self.modalities = {}
+            self.modalities.clear()
+            self.modalities.update({name: factory(path) for name, path in paths.items()})
 
     def create_importer(self, type_: str, src_root: Path | None, **kwargs) -> Any:
         return self.importers[type_](session=self, src_root=src_root, **kwargs)
 
-    def create_exporter(self, type_):
-        return self.exporters[type_](session=self)
+    def create_exporter(self, type_, **kwargs):
+        return self.exporters[type_](session=self, **kwargs)
 
     def add_importer(self, type_: str, importer: type, overwrite: bool = False):
         if type_ not in self.importers or overwrite:
@@ -19,6 +19,7 @@ from typing import Any
 from baseobjects import BaseObject
 
 # Local Packages #
+from ...transfer import ArchiveWriter, BlobStore
 from ..subject import Subject
 
 # Third-Party Packages #
@@ -38,6 +39,12 @@ class SubjectBIDSExporter(BaseObject):
     ) -> None:
         # New Attributes #
         self.subject: Subject | None = None
+        self.blob_store: BlobStore | None = None
+        self.view: bool = False
+        self.sync: bool = False
+        self.prune: bool = False
+        self.record_manifest: bool = False
+        self.archive: ArchiveWriter | None = None
 
         # Parent Attributes #
         super().__init__(init=False)
@@ -54,29 +61,72 @@ class SubjectBIDSExporter(BaseObject):
     def construct(
         self,
         subject: Subject | None = None,
+        blob_store: BlobStore | None = None,
+        view: bool | None = None,
+        sync: bool | None = None,
+        prune: bool | None = None,
+        record_manifest: bool | None = None,
+        archive: ArchiveWriter | None = None,
         **kwargs: Any,
     ) -> None:
         """Constructs this object.
 
         Args:
+            blob_store: The store which the exported files are stored in and linked from, copies them if None.
+            view: Determines if the exported files will be hardlinks to the files of the dataset, or symlinks when the
+                export is on another file system, instead of copies.
+            sync: Determines if the files which changed since they were exported will be exported again, instead of
+                only exporting the files which are not in the export.
+            prune: Determines if a sync will remove the exported files whose sources are no longer exported.
+            record_manifest: Determines if the digests of the exported files will be recorded in a manifest in each
+                exported directory, which a sync always does.
+            archive: The archive to write the exported files into, which paths are then within, instead of a directory.
             kwargs: The keyword arguments for inheritance if any.
         """
         if subject is not None:
             self.subject = subject
 
+        if blob_store is not None:
+            self.blob_store = blob_store
+
+        if view is not None:
+            self.view = view
+
+        if sync is not None:
+            self.sync = sync
+
+        if prune is not None:
+            self.prune = prune
+
+        if record_manifest is not None:
+            self.record_manifest = record_manifest
+
+        if archive is not None:
+            self.archive = archive
+
         super().construct(**kwargs)
 
     def export_sessions(self, path: Path):
         assert self.subject is not None
         for session in self.subject.sessions.values():
-            session.create_exporter("BIDS").execute_export(path)
+            exporter = session.create_exporter(
+                "BIDS",
+                blob_store=self.blob_store,
+                view=self.view,
+                sync=self.sync,
+                prune=self.prune,
+                record_manifest=self.record_manifest,
+                archive=self.archive,
+            )
+            exporter.execute_export(path)
 
     def execute_export(self, path: Path, name: str | None = None) -> None:
         assert self.subject is not None
         if name is None:
             name = self.subject.name
         new_path = path / f"sub-{name}"
-        new_path.mkdir(exist_ok=True)
+        if self.archive is None:
+            new_path.mkdir(exist_ok=True)
         self.export_sessions(path=new_path)
 
 
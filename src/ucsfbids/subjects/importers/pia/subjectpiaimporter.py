@@ -12,7 +12,7 @@ __email__ = __email__
 from pathlib import Path
 from typing import Any, Optional
 
-from ucsfbids.importspec import SessionSpec
+from ucsfbids.importspec import ImportAction, SessionSpec
 from ucsfbids.sessions.importers.pia.sessionpiaimporter import SessionPiaImporter
 from ucsfbids.subjects.importers.subjectimporter import SubjectImporter
 from ucsfbids.subjects.subject import Subject
@@ -35,10 +35,8 @@ class SubjectPiaImporter(SubjectImporter):
         if src_root is not None:
             self.src_root = src_root
 
-        sessions.extend(PIA_SESSIONS)
-
         if process:
-            self._process_sessions(sessions)
+            self._process_sessions([*sessions, *PIA_SESSIONS])
 
         super().construct(process=False, **kwargs)
 
@@ -46,10 +44,28 @@ class SubjectPiaImporter(SubjectImporter):
         assert self.subject is not None
 
         for session in self.subject.sessions.values():
-            session.create_importer("Pia", self.src_root).execute_import(
+            importer = session.create_importer(
+                "Pia",
+                self.src_root,
+                journal=self.journal,
+                inventory=self.inventory,
+                command_pool=self.command_pool,
+                blob_store=self.blob_store,
+                modality_jobs=self.modality_jobs,
+                record_hashes=self.record_hashes,
+            )
+            importer.execute_import(
                 path, source_patient=source_patient, name=session.name
             )
 
+    def plan_sessions(self, path: Path, source_patient: str) -> list[ImportAction]:
+        assert self.subject is not None
+        actions = []
+        for session in self.subject.sessions.values():
+            importer = session.create_importer("Pia", self.src_root, inventory=self.inventory)
+            actions.extend(importer.plan_import(path, source_patient=source_patient, name=session.name))
+        return actions
+
     def execute_import(self, path: Path, source_patient: str, name: Optional[str] = None) -> None:
         assert self.subject is not None
         if name is None:
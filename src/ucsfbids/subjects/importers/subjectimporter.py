@@ -10,14 +10,17 @@ __maintainer__ = __maintainer__
 __email__ = __email__
 
 
+import traceback
 from pathlib import Path
 from typing import Any, Optional
 
 from baseobjects import BaseObject
 
+from ucsfbids.importspec import ImportAction, SubjectImportTask, TaskResult
 from ucsfbids.importspec.sessionspec import SessionSpec
 from ucsfbids.sessions import Session
 from ucsfbids.subjects.subject import Subject
+from ucsfbids.transfer import BlobStore, CommandPool, ImportJournal, SourceInventory
 
 
 class SubjectImporter(BaseObject):
@@ -32,6 +35,12 @@ class SubjectImporter(BaseObject):
     ) -> None:
         self.subject: Optional[Subject] = None
         self.src_root: Optional[Path] = None
+        self.journal: Optional[ImportJournal] = None
+        self.inventory: Optional[SourceInventory] = None
+        self.command_pool: Optional[CommandPool] = None
+        self.blob_store: Optional[BlobStore] = None
+        self.modality_jobs: Optional[int] = None
+        self.record_hashes: bool = False
 
         super().__init__(init=False)
 
@@ -58,11 +67,23 @@ class SubjectImporter(BaseObject):
         src_root: Path | None = None,
         sessions: list[SessionSpec] = [],
         process: bool = True,
+        journal: Optional[ImportJournal] = None,
+        inventory: Optional[SourceInventory] = None,
+        command_pool: Optional[CommandPool] = None,
+        blob_store: Optional[BlobStore] = None,
+        modality_jobs: Optional[int] = None,
+        record_hashes: Optional[bool] = None,
         **kwargs: Any,
     ) -> None:
         """Constructs this object.
 
         Args:
+            journal: The journal which records the imported files so an interrupted import can be resumed.
+            inventory: The inventory of the source which the source files are looked up in.
+            command_pool: The pool which runs external commands in the background, runs them in place if None.
+            blob_store: The store which the imported files are stored in and linked from, copies them if None.
+            modality_jobs: The number of threads each session imports its modalities with, serially if None or 1.
+            record_hashes: Determines if the digests of the imported files will be recorded in their import manifests.
             kwargs: The keyword arguments for inheritance if any.
         """
         if subject is not None:
@@ -71,6 +92,24 @@ class SubjectImporter(BaseObject):
         if src_root is not None:
             self.src_root = src_root
 
+        if journal is not None:
+            self.journal = journal
+
+        if inventory is not None:
+            self.inventory = inventory
+
+        if command_pool is not None:
+            self.command_pool = command_pool
+
+        if blob_store is not None:
+            self.blob_store = blob_store
+
+        if modality_jobs is not None:
+            self.modality_jobs = modality_jobs
+
+        if record_hashes is not None:
+            self.record_hashes = record_hashes
+
         if process:
             self._process_sessions(sessions)
 
@@ -80,7 +119,44 @@ class SubjectImporter(BaseObject):
         assert self.subject is not None
 
         for session in self.subject.sessions.values():
-            session.create_importer("BIDS", self.src_root).execute_import(path, source_patient)
+            importer = session.create_importer(
+                "BIDS",
+                self.src_root,
+                journal=self.journal,
+                inventory=self.inventory,
+                command_pool=self.command_pool,
+                blob_store=self.blob_store,
+                modality_jobs=self.modality_jobs,
+                record_hashes=self.record_hashes,
+            )
+            importer.execute_import(path, source_patient)
+
+    def plan_sessions(self, path: Path, source_patient: str) -> list[ImportAction]:
+        assert self.subject is not None
+        actions = []
+        for session in self.subject.sessions.values():
+            importer = session.create_importer("BIDS", self.src_root, inventory=self.inventory)
+            actions.extend(importer.plan_import(path, source_patient))
+        return actions
+
+    def plan_import(self, path: Path, source_patient: str, name: Optional[str] = None) -> list[ImportAction]:
+        """Lists the files to import into the subject directory without importing them.
+
+        Args:
+            path: The path to the dataset directory to import into.
+            source_patient: The name of the source patient.
+            name: The name of the subject, uses the name of the subject object if None.
+
+        Returns:
+            The unresolved import actions of the files.
+        """
+        assert self.subject is not None
+        if name is None:
+            name = self.subject.name
+        assert name is not None
+
+        new_path = path / f"sub-{name}"
+        return [a._replace(subject=name) for a in self.plan_sessions(path=new_path, source_patient=source_patient)]
 
     def execute_import(self, path: Path, source_patient: str, name: Optional[str] = None) -> None:
         assert self.subject is not None
@@ -93,4 +169,40 @@ class SubjectImporter(BaseObject):
         self.import_sessions(path=new_path, source_patient=source_patient)
 
 
+def run_subject_import_task(task: SubjectImportTask) -> TaskResult:
+    """Imports a subject from a picklable description, so subjects can be imported in worker processes.
+
+    Args:
+        task: The description of the subject and the import to run.
+
+    Returns:
+        The name of the subject and whether its import succeeded.
+    """
+    subject = Subject(path=task.subject_path, mode=task.mode, load=False)
+    assert subject.name is not None
+    try:
+        subject.add_importer(task.importer_key, task.importer_type)
+        importer = subject.create_importer(
+            task.importer_key,
+            task.src_root,
+            journal=task.journal,
+            inventory=task.inventory,
+            command_pool=task.command_pool,
+            blob_store=task.blob_store,
+            modality_jobs=task.modality_jobs,
+            record_hashes=task.record_hashes,
+        )
+        importer.execute_import(task.path, task.source_patient)
+        if task.command_pool is not None:
+            task.command_pool.wait()
+    except Exception:
+        return TaskResult(subject.name, False, traceback.format_exc())
+    finally:
+        if task.command_pool is not None:
+            task.command_pool.shutdown()
+        if task.journal is not None:
+            task.journal.close()
+    return TaskResult(subject.name, True)
+
+
 Subject.default_importers["BIDS"] = SubjectImporter
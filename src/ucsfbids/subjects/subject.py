@@ -12,6 +12,7 @@ __email__ = __email__
 
 
 import json
+from functools import partial
 from pathlib import Path
 from typing import Any, Optional
 
@@ -20,6 +21,7 @@ from typing import Any, Optional
 from baseobjects import BaseComposite
 
 # Local Packages #
+from ..loading import DatasetIndex, LazyChildMap, meta_info_cache, scan_directories
 from ..sessions import Session
 
 # Third-Party Packages #
@@ -44,6 +46,8 @@ class Subject(BaseComposite):
         mode: The file mode to set this subject to.
         create: Determines if this subject will be created if it does not exist.
         load: Determines if the sessions will be loaded from the subject's directory.
+        lazy: Determines if the sessions will only be constructed when they are first accessed.
+        index: The index of the dataset to load the sessions from.
         init: Determines if this object will construct.
         kwargs: The keyword arguments for inheritance if any.
     """
@@ -102,6 +106,8 @@ class Subject(BaseComposite):
         mode: str = "r",
         create: bool = False,
         load: bool = True,
+        lazy: bool = False,
+        index: DatasetIndex | None = None,
         *,
         init: bool = True,
         **kwargs: Any,
@@ -109,12 +115,14 @@ class Subject(BaseComposite):
         # New Attributes #
         self._path: Path | None = None
         self._mode: str = "r"
+        self._lazy: bool = False
+        self.index: DatasetIndex | None = None
 
         self.name: str | None = None
         self.parent_name: Optional[str] = None
 
         self.meta_info: dict = self.default_meta_info.copy()
-        self.sessions: dict[str, Session] = {}
+        self.sessions: dict[str, Session] | LazyChildMap = {}
 
         self.importers: dict[str, type] = self.default_importers.copy()
         self.exporters: dict[str, type] = self.default_exporters.copy()
@@ -131,6 +139,8 @@ class Subject(BaseComposite):
                 mode=mode,
                 create=create,
                 load=load,
+                lazy=lazy,
+                index=index,
                 **kwargs,
             )
 
@@ -165,6 +175,8 @@ class Subject(BaseComposite):
         mode: str | None = None,
         create: bool = False,
         load: bool = False,
+        lazy: bool | None = None,
+        index: DatasetIndex | None = None,
         **kwargs: Any,
     ) -> None:
         """Constructs this object.
@@ -176,6 +188,8 @@ class Subject(BaseComposite):
             mode: The file mode to set this subject to.
             create: Determines if this subject will be created if it does not exist.
             load: Determines if the sessions will be loaded from the subject's directory.
+            lazy: Determines if the sessions will only be constructed when they are first accessed.
+            index: The index of the dataset to load the sessions from.
             kwargs: The keyword arguments for inheritance if any.
         """
         if name is not None:
@@ -187,6 +201,12 @@ class Subject(BaseComposite):
         if mode is not None:
             self._mode = mode
 
+        if lazy is not None:
+            self._lazy = lazy
+
+        if index is not None:
+            self.index = index
+
         if parent_path is not None and self.name is not None and self.path is None:
             self.path = (parent_path if isinstance(parent_path, Path) else Path(parent_path)) / f"sub-{self.name}"
 
@@ -209,16 +229,17 @@ class Subject(BaseComposite):
     def create_meta_info(self) -> None:
         with self.meta_info_path.open(self._mode) as file:
             json.dump(self.meta_info, file)
+        meta_info_cache.put(self.meta_info_path, self.meta_info)
 
     def load_meta_info(self) -> dict:
         self.meta_info.clear()
-        with self.meta_info_path.open("r") as file:
-            self.meta_info.update(json.load(file))
+        self.meta_info.update(meta_info_cache.get(self.meta_info_path, copy=True))
         return self.meta_info
 
     def save_meta_info(self) -> None:
         with self.meta_info_path.open(self._mode) as file:
             json.dump(self.meta_info, file)
+        meta_info_cache.put(self.meta_info_path, self.meta_info)
 
     def create_sessions(self) -> None:
         for session in self.sessions.values():
@@ -230,18 +251,29 @@ class Subject(BaseComposite):
         self.path.mkdir(exist_ok=True)
         self.create_meta_info()
 
-    def load_sessions(self, mode: str | None = None, load: bool = True) -> None:
-        """Loads all sessions in this subject."""
+    def load_sessions(self, mode: str | None = None, load: bool = True, lazy: bool | None = None) -> None:
+        """Loads all sessions in this subject.
+
+        Args:
+            mode: The file mode to set the sessions to, defaults to the subject's mode.
+            load: Determines if the sessions will load their modalities.
+            lazy: Determines if the sessions will only be constructed when they are first accessed.
+        """
         assert self.path is not None
         m = self._mode if mode is None else mode
-        self.sessions.clear()
-        self.sessions.update(
-            {
-                s.name: s
-                for p in self.path.iterdir()
-                if p.is_dir() and (s := Session(path=p, mode=m, load=load)) is not None
-            },
-        )
+        lazy = self._lazy if lazy is None else lazy
+        paths = None if self.index is None else self.index.get_children(self.path)
+        if paths is None:
+            paths = scan_directories(self.path, prefix=4)
+        factory = partial(Session, mode=m, load=load, lazy=lazy, index=self.index)
+
+        if lazy:
+            self.sessions = LazyChildMap(factory=factory, paths=paths)
+        else:
+            if isinstance(self.sessions, LazyChildMap):
+                self.sessions = {}
+            self.sessions.clear()
+            self.sessions.update({name: factory(path) for name, path in paths.items()})
 
     def generate_latest_session_name(self) -> str:
         """Generates a session name for a new latest session.
@@ -292,8 +324,8 @@ class Subject(BaseComposite):
     def create_importer(self, type_: str, src_root: Path | None, **kwargs) -> Any:
         return self.importers[type_](subject=self, src_root=src_root, **kwargs)
 
-    def create_exporter(self, type_: str) -> Any:
-        return self.exporters[type_](subject=self)
+    def create_exporter(self, type_: str, **kwargs) -> Any:
+        return self.exporters[type_](subject=self, **kwargs)
 
     def add_importer(self, type_: str, importer: type, overwrite: bool = False):
         if type_ not in self.importers or overwrite:
@@ -0,0 +1,27 @@
+""" __init__.py
+Tools for transferring files into and out of a UCSF BIDS dataset.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Local Packages #
+from .hashing import hash_file
+from .transfermanifest import TransferRecord, TransferManifest, prune_manifests, verify_manifests
+from .importjournal import ImportJournal
+from .sourceinventory import InventoryEntry, SourceInventory
+from .parallelgzip import ParallelGzipWriter
+from .mghconversion import MGHConverter, convert_mgh_to_nifti
+from .commandpool import CommandResult, CommandError, CommandPool, describe_results, run_command, run_commands
+from .copyengine import VIEW_STRATEGIES, CopyResult, CopyEngine
+from .blobstore import BlobStore
+from .destinationlimiter import DestinationLimiter, destination_limiter, find_mount_point
+from .archivewriter import ArchiveWriter, archive_format
+from .namematcher import NameMatcher, compile_name_matcher
@@ -0,0 +1,328 @@
+"""archivewriter.py
+A streaming writer of tar, tar.gz, and zip archives which can split the archive into size-capped volumes.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import io
+import os
+import stat
+import tarfile
+import time
+import zipfile
+from pathlib import Path, PurePath
+from threading import Lock
+from typing import Any, BinaryIO
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+from .parallelgzip import ParallelGzipWriter
+
+
+# Definitions #
+# Constants #
+TAR = "tar"
+TAR_GZ = "tar.gz"
+ZIP = "zip"
+SUFFIX_FORMATS = {".tar": TAR, ".tar.gz": TAR_GZ, ".tgz": TAR_GZ, ".zip": ZIP}
+
+# The size of the blocks which pad each tar entry and the size the end of a tar archive is padded to.
+TAR_BLOCK_SIZE = tarfile.BLOCKSIZE
+TAR_RECORD_SIZE = tarfile.RECORDSIZE
+# The sizes of the local and central directory headers of each zip entry, and of the end of the central directory.
+ZIP_LOCAL_HEADER_SIZE = 30 + 20
+ZIP_CENTRAL_HEADER_SIZE = 46 + 28
+ZIP_END_SIZE = 22 + 56 + 20
+# The earliest time a zip entry can have.
+ZIP_MIN_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+# Functions #
+def archive_format(path: Path | str) -> str:
+    """Gets the format of an archive from the suffixes of its path.
+
+    Args:
+        path: The path to the archive.
+
+    Returns:
+        The format of the archive.
+
+    Raises:
+        ValueError: If the suffixes are not of a supported format.
+    """
+    suffixes = PurePath(path).suffixes
+    for suffix in ("".join(suffixes[-2:]), "".join(suffixes[-1:])):
+        if suffix in SUFFIX_FORMATS:
+            return SUFFIX_FORMATS[suffix]
+    raise ValueError(f"{path} does not have the suffix of a supported archive format: {list(SUFFIX_FORMATS)}.")
+
+
+def zip_date_time(mtime: float) -> tuple[int, int, int, int, int, int]:
+    """Gets the date and time of a zip entry from a modification time, clamping the times zip cannot represent.
+
+    Args:
+        mtime: The modification time in seconds since the epoch.
+
+    Returns:
+        The year, month, day, hour, minute, and second of the entry.
+    """
+    return max(tuple(time.localtime(mtime)[:6]), ZIP_MIN_DATE_TIME)
+
+
+# Classes #
+class ArchiveWriter(BaseObject):
+    """A streaming writer of tar, tar.gz, and zip archives which can split the archive into size-capped volumes.
+
+    Each file is read once and streamed into the archive, so an export into an archive needs no staging directory.
+    When a volume size is given, the archive is split into volumes which are each a complete archive, named with
+    their index before their suffixes, such as "dataset.part001.tar.gz". A new volume is started when the next entry
+    would make the current volume exceed the volume size, so a volume only exceeds it when it has a single entry
+    larger than the volume size. The size of an entry is estimated before it is compressed, so compressed volumes are
+    smaller than the volume size.
+
+    The entries are written under a lock, so exporters in several threads can write into the same archive.
+
+    Attributes:
+        path: The path to the archive, or the name the volume paths are derived from.
+        format: The format of the archive, "tar", "tar.gz", or "zip".
+        volume_size: The maximum size of each volume in bytes, None to write one archive.
+        compression_level: The compression level of tar.gz archives and deflated zip entries.
+        zip_compression: The zipfile compression of zip entries, stored by default since imaging is already compressed.
+        volumes: The paths to the volumes which were written.
+
+    Args:
+        path: The path to the archive, or the name the volume paths are derived from.
+        format: The format of the archive, derived from the suffixes of the path if None.
+        volume_size: The maximum size of each volume in bytes, None to write one archive.
+        compression_level: The compression level of tar.gz archives and deflated zip entries.
+        zip_compression: The zipfile compression of zip entries.
+        init: Determines if this object will construct.
+        kwargs: The keyword arguments for inheritance if any.
+    """
+
+    default_compression_level: int = 6
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        format: str | None = None,
+        volume_size: int | None = None,
+        compression_level: int | None = None,
+        zip_compression: int | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self._lock: Lock = Lock()
+        self._file: BinaryIO | None = None
+        self._gzip: ParallelGzipWriter | None = None
+        self._archive: tarfile.TarFile | zipfile.ZipFile | None = None
+        self._entries: int = 0
+        self._reserve: int = 0
+
+        self.path: Path | None = None
+        self.format: str = TAR
+        self.volume_size: int | None = None
+        self.compression_level: int = self.default_compression_level
+        self.zip_compression: int = zipfile.ZIP_STORED
+        self.volumes: list[Path] = []
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(
+                path=path,
+                format=format,
+                volume_size=volume_size,
+                compression_level=compression_level,
+                zip_compression=zip_compression,
+                **kwargs,
+            )
+
+    def __enter__(self) -> "ArchiveWriter":
+        """Returns this writer, which closes its archive when the context exits."""
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Closes the archive."""
+        self.close()
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(
+        self,
+        path: Path | str | None = None,
+        format: str | None = None,
+        volume_size: int | None = None,
+        compression_level: int | None = None,
+        zip_compression: int | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Constructs this object.
+
+        Args:
+            path: The path to the archive, or the name the volume paths are derived from.
+            format: The format of the archive, derived from the suffixes of the path if None.
+            volume_size: The maximum size of each volume in bytes, None to write one archive.
+            compression_level: The compression level of tar.gz archives and deflated zip entries.
+            zip_compression: The zipfile compression of zip entries.
+            kwargs: The keyword arguments for inheritance if any.
+        """
+        if path is not None:
+            self.path = Path(path)
+
+        if format is not None:
+            self.format = format
+        elif path is not None:
+            self.format = archive_format(path)
+
+        if volume_size is not None:
+            self.volume_size = volume_size
+
+        if compression_level is not None:
+            self.compression_level = compression_level
+
+        if zip_compression is not None:
+            self.zip_compression = zip_compression
+
+        super().construct(**kwargs)
+
+    def volume_path(self, index: int) -> Path:
+        """Gets the path to a volume.
+
+        Args:
+            index: The index of the volume, starting at one.
+
+        Returns:
+            The path to the volume.
+        """
+        if self.volume_size is None:
+            return self.path
+        suffix = f".{self.format}"
+        stem = self.path.name.removesuffix(suffix) if self.path.name.endswith(suffix) else self.path.stem
+        return self.path.with_name(f"{stem}.part{index:03d}{suffix}")
+
+    def _open_volume(self) -> None:
+        path = self.volume_path(len(self.volumes) + 1)
+        self._file = path.open("wb")
+        if self.format == ZIP:
+            self._archive = zipfile.ZipFile(
+                self._file,
+                "w",
+                compression=self.zip_compression,
+                compresslevel=self.compression_level,
+            )
+            self._reserve = ZIP_END_SIZE
+        else:
+            # A tar.gz archive is compressed across threads, so the compression keeps up with the reads of the files.
+            if self.format == TAR_GZ:
+                self._gzip = stream = ParallelGzipWriter(self._file, level=self.compression_level)
+            else:
+                stream = self._file
+            self._archive = tarfile.open(fileobj=stream, mode="w|", format=tarfile.PAX_FORMAT)
+            self._reserve = TAR_RECORD_SIZE
+        self._entries = 0
+        self.volumes.append(path)
+
+    def _close_volume(self) -> None:
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+        if self._gzip is not None:
+            self._gzip.close()
+            self._gzip = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _entry_size(self, name: str, size: int) -> int:
+        if self.format == ZIP:
+            return ZIP_LOCAL_HEADER_SIZE + len(name.encode()) + size
+        header_size = TAR_BLOCK_SIZE * (3 if len(name.encode()) > 100 else 1)
+        return header_size + -(-size // TAR_BLOCK_SIZE) * TAR_BLOCK_SIZE
+
+    def _prepare(self, name: str, size: int) -> None:
+        """Opens the volume an entry is written to, starting a new volume if the entry would not fit in the current."""
+        if self._archive is not None and self.volume_size is not None and self._entries > 0:
+            # The size of a tar volume is its size before compression, which is an upper bound of its compressed size.
+            written = self._file.tell() if self.format == ZIP else self._archive.offset
+            volume_size = written + self._entry_size(name, size) + self._reserve
+            if volume_size > self.volume_size:
+                self._close_volume()
+        if self._archive is None:
+            self._open_volume()
+        self._entries += 1
+        if self.format == ZIP:
+            self._reserve += ZIP_CENTRAL_HEADER_SIZE + len(name.encode())
+
+    def add_file(self, source: Path | str, name: PurePath | str) -> None:
+        """Streams a file into the archive, following symbolic links.
+
+        Args:
+            source: The path to the file to add.
+            name: The path of the entry in the archive.
+        """
+        name = PurePath(name).as_posix()
+        source_stat = os.stat(source)
+        with self._lock, open(source, "rb") as file:
+            self._prepare(name, source_stat.st_size)
+            if self.format == ZIP:
+                info = zipfile.ZipInfo(name, zip_date_time(source_stat.st_mtime))
+                info.compress_type = self.zip_compression
+                info.external_attr = (stat.S_IFREG | stat.S_IMODE(source_stat.st_mode)) << 16
+                info.file_size = source_stat.st_size
+                with self._archive.open(info, "w", force_zip64=source_stat.st_size > zipfile.ZIP64_LIMIT) as entry:
+                    while chunk := file.read(io.DEFAULT_BUFFER_SIZE * 128):
+                        entry.write(chunk)
+            else:
+                info = tarfile.TarInfo(name)
+                info.size = source_stat.st_size
+                info.mtime = source_stat.st_mtime
+                info.mode = stat.S_IMODE(source_stat.st_mode)
+                self._archive.addfile(info, file)
+
+    def add_bytes(self, data: bytes, name: PurePath | str, mtime: float | None = None, mode: int = 0o644) -> None:
+        """Writes bytes into the archive as a file.
+
+        Args:
+            data: The contents of the file.
+            name: The path of the entry in the archive.
+            mtime: The modification time of the file, the current time if None.
+            mode: The permissions of the file.
+        """
+        name = PurePath(name).as_posix()
+        mtime = time.time() if mtime is None else mtime
+        with self._lock:
+            self._prepare(name, len(data))
+            if self.format == ZIP:
+                info = zipfile.ZipInfo(name, zip_date_time(mtime))
+                info.compress_type = self.zip_compression
+                info.external_attr = (stat.S_IFREG | mode) << 16
+                self._archive.writestr(info, data)
+            else:
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                info.mtime = mtime
+                info.mode = mode
+                self._archive.addfile(info, io.BytesIO(data))
+
+    def close(self) -> None:
+        """Finishes the current volume."""
+        with self._lock:
+            self._close_volume()
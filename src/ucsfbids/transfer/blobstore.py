@@ -0,0 +1,215 @@
+"""blobstore.py
+A content-addressed store which keeps one copy of every distinct file which is linked into datasets.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import hashlib
+import os
+import shutil
+import stat
+import uuid
+from pathlib import Path
+from typing import Any
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+from .copyengine import BUFFERED, HARDLINK, KERNEL, REFLINK, CopyEngine, CopyResult
+from .hashing import DEFAULT_ALGORITHM
+
+
+# Definitions #
+# Classes #
+class BlobStore(BaseObject):
+    """A content-addressed store which keeps one copy of every distinct file which is linked into datasets.
+
+    Each file is stored once as a blob named by the digest of its contents, and the paths in the datasets are reflinks
+    or hardlinks to the blobs. Hardlinked paths share the blob, so the blobs are read-only to keep a write to one path
+    from changing every other path with the same contents.
+
+    The digest of every stored source is also recorded by the path, size, and modification time of the source, so a
+    source which was already stored is linked again without being read. Every blob and record is its own file which
+    is renamed into place, so the store can be shared by processes without locks.
+
+    Attributes:
+        path: The path to the store directory.
+        algorithm: The name of the hashlib algorithm which addresses the blobs.
+        engine: The engine which copies files into the store and links the blobs out of it.
+
+    Args:
+        path: The path to the store directory.
+        algorithm: The name of the hashlib algorithm which addresses the blobs.
+        init: Determines if this object will construct.
+        kwargs: The keyword arguments for inheritance if any.
+    """
+
+    default_directory: str = ".ucsfbids/blobs"
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        algorithm: str | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self.path: Path | None = None
+        self.algorithm: str = DEFAULT_ALGORITHM
+        self.engine: CopyEngine = CopyEngine(strategies=(REFLINK, HARDLINK, KERNEL, BUFFERED), allow_hardlink=True)
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(path=path, algorithm=algorithm, **kwargs)
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(self, path: Path | str | None = None, algorithm: str | None = None, **kwargs: Any) -> None:
+        """Constructs this object.
+
+        Args:
+            path: The path to the store directory.
+            algorithm: The name of the hashlib algorithm which addresses the blobs.
+            kwargs: The keyword arguments for inheritance if any.
+        """
+        if path is not None:
+            self.path = Path(path)
+
+        if algorithm is not None:
+            self.algorithm = algorithm
+
+        super().construct(**kwargs)
+
+        if self.path is not None:
+            (self.path / "objects").mkdir(parents=True, exist_ok=True)
+            (self.path / "sources").mkdir(parents=True, exist_ok=True)
+
+    def blob_path(self, hash_: str) -> Path:
+        """Gets the path to the blob of a digest.
+
+        Args:
+            hash_: The hexadecimal digest of the contents of the blob.
+
+        Returns:
+            The path to the blob.
+        """
+        return self.path / "objects" / hash_[:2] / hash_[2:]
+
+    def contains(self, hash_: str) -> bool:
+        """Checks if the store has a blob with a digest.
+
+        Args:
+            hash_: The hexadecimal digest of the contents of the blob.
+
+        Returns:
+            True if the blob is in the store.
+        """
+        return self.blob_path(hash_).is_file()
+
+    def _source_record_path(self, source: Path, source_stat: os.stat_result) -> Path:
+        key = f"{self.algorithm}\0{os.fspath(source.resolve())}\0{source_stat.st_size}\0{source_stat.st_mtime_ns}"
+        name = hashlib.sha256(key.encode()).hexdigest()
+        return self.path / "sources" / name[:2] / name[2:]
+
+    def lookup(self, source: Path | str) -> str | None:
+        """Looks up the digest of a source which was stored while it had its current size and modification time.
+
+        Args:
+            source: The path to the source file.
+
+        Returns:
+            The digest of the source if its blob is in the store, otherwise None.
+        """
+        source = Path(source)
+        record_path = self._source_record_path(source, os.stat(source))
+        try:
+            hash_ = record_path.read_text()
+        except FileNotFoundError:
+            return None
+        return hash_ if self.contains(hash_) else None
+
+    def _write_atomic(self, path: Path, write: Any) -> None:
+        path.parent.mkdir(exist_ok=True)
+        temporary_path = path.with_name(f".tmp-{uuid.uuid4().hex}")
+        try:
+            write(temporary_path)
+            os.replace(temporary_path, path)
+        finally:
+            temporary_path.unlink(missing_ok=True)
+
+    def add(self, source: Path | str) -> str:
+        """Adds a file to the store, reading it only if it was not stored before with its current size and time.
+
+        Args:
+            source: The path to the file to add.
+
+        Returns:
+            The digest of the file, which addresses its blob.
+        """
+        source = Path(source)
+        hash_ = self.lookup(source)
+        if hash_ is None:
+            record_path = self._source_record_path(source, source_stat := os.stat(source))
+            # The file is copied into the store while it is hashed, then renamed to its digest. An existing blob is
+            # kept, since replacing it would detach the paths hardlinked to it. A blob which another process stored in
+            # the meantime has the same contents, so either copy can be kept.
+            temporary_path = self.path / "objects" / f".tmp-{uuid.uuid4().hex}"
+            try:
+                hash_ = self.engine.copy(source, temporary_path, link=False, algorithm=self.algorithm).hash
+                blob_path = self.blob_path(hash_)
+                if not blob_path.is_file():
+                    os.chmod(temporary_path, stat.S_IMODE(source_stat.st_mode) & ~0o222)
+                    blob_path.parent.mkdir(exist_ok=True)
+                    os.replace(temporary_path, blob_path)
+            finally:
+                temporary_path.unlink(missing_ok=True)
+            self._write_atomic(record_path, lambda p: p.write_text(hash_))
+        return hash_
+
+    def link(self, hash_: str, destination: Path | str, mode_source: Path | str | None = None) -> CopyResult:
+        """Links a blob to a path, replacing the path if it exists.
+
+        A reflink is preferred, which is a writable copy sharing the blocks of the blob. Otherwise a read-only
+        hardlink is made, and a full copy is only made if the destination is on another file system.
+
+        Args:
+            hash_: The digest of the blob.
+            destination: The path to link the blob to.
+            mode_source: The file whose permissions a copy will have instead of the read-only permissions of the blob.
+
+        Returns:
+            The strategy which linked the blob and the digest of the blob.
+        """
+        destination = Path(destination)
+        result = self.engine.copy(self.blob_path(hash_), destination)
+        if result.strategy != HARDLINK and mode_source is not None:
+            shutil.copymode(mode_source, destination)
+        return result._replace(hash=hash_)
+
+    def store(self, source: Path | str, destination: Path | str) -> CopyResult:
+        """Adds a file to the store and links its blob to a path.
+
+        Args:
+            source: The path to the file to store.
+            destination: The path to link the blob to.
+
+        Returns:
+            The strategy which linked the blob and the digest of the file.
+        """
+        return self.link(self.add(source), destination, mode_source=source)
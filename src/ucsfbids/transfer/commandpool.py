@@ -0,0 +1,258 @@
+"""commandpool.py
+A bounded pool which runs external commands in the background with timeouts and captured output.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import os
+import subprocess
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock
+from typing import Any, NamedTuple
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+
+
+# Definitions #
+# Classes #
+class CommandResult(NamedTuple):
+    """The result of an external command.
+
+    Attributes:
+        args: The arguments of the command.
+        returncode: The return code of the command, None if it timed out or could not be started.
+        stdout: The captured standard output of the command.
+        stderr: The captured standard error of the command, or the reason it did not finish.
+    """
+
+    args: list[str]
+    returncode: int | None
+    stdout: str = ""
+    stderr: str = ""
+
+
+class CommandError(RuntimeError):
+    """An error raised when an external command fails, which keeps the results of the commands.
+
+    Attributes:
+        results: The results of the commands which were run, the last of which failed.
+
+    Args:
+        message: The description of the failure.
+        results: The results of the commands which were run.
+    """
+
+    def __init__(self, message: str, results: list[CommandResult] | None = None) -> None:
+        super().__init__(message)
+        self.results: list[CommandResult] = [] if results is None else results
+
+
+class CommandPool(BaseObject):
+    """A bounded pool which runs external commands in the background with timeouts and captured output.
+
+    Conversions by external tools are CPU bound while copies are I/O bound, so importers submit their commands to the
+    pool and continue copying while a limited number of commands run. A pool can be pickled and sent to a worker
+    process, which then starts its own threads.
+
+    Attributes:
+        max_workers: The maximum number of commands which run at the same time.
+        timeout: The default number of seconds after which a command is killed, None for no limit.
+
+    Args:
+        max_workers: The maximum number of commands which run at the same time, uses the number of CPUs if None.
+        timeout: The default number of seconds after which a command is killed, None for no limit.
+        init: Determines if this object will construct.
+        kwargs: The keyword arguments for inheritance if any.
+    """
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        timeout: float | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self._lock: Lock = Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._futures: list[Future] = []
+
+        self.max_workers: int = os.cpu_count() or 1
+        self.timeout: float | None = None
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(max_workers=max_workers, timeout=timeout, **kwargs)
+
+    # Pickling
+    def __getstate__(self) -> dict[str, Any]:
+        """Creates a picklable state with only the configuration of the pool."""
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        state["_executor"] = None
+        state["_futures"] = []
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restores this object from a pickled state."""
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(self, max_workers: int | None = None, timeout: float | None = None, **kwargs: Any) -> None:
+        """Constructs this object.
+
+        Args:
+            max_workers: The maximum number of commands which run at the same time.
+            timeout: The default number of seconds after which a command is killed, None for no limit.
+            kwargs: The keyword arguments for inheritance if any.
+        """
+        if max_workers is not None:
+            self.max_workers = max_workers
+
+        if timeout is not None:
+            self.timeout = timeout
+
+        super().construct(**kwargs)
+
+    def submit(
+        self,
+        commands: Sequence[Sequence[str | Path]],
+        timeout: float | None = None,
+        callback: Callable[[list[CommandResult]], Any] | None = None,
+    ) -> Future:
+        """Submits commands which are run one after another in the background.
+
+        Args:
+            commands: The arguments of each command.
+            timeout: The number of seconds after which each command is killed, uses the pool timeout if None.
+            callback: A function which is called with the results in the background after the commands finish.
+
+        Returns:
+            The future of the results of the commands, or of the callback if one was given.
+        """
+        timeout = self.timeout if timeout is None else timeout
+
+        def run() -> Any:
+            results = run_commands(commands, timeout=timeout)
+            return results if callback is None else callback(results)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            future = self._executor.submit(run)
+            self._futures.append(future)
+        return future
+
+    def wait(self) -> None:
+        """Waits for all submitted commands and their callbacks to finish, even when some of them fail.
+
+        Raises:
+            Exception: The exception raised by a callback if one failed.
+            RuntimeError: If more than one callback failed, with the description of every failure.
+        """
+        with self._lock:
+            futures, self._futures = self._futures, []
+        errors = [e for f in futures if (e := f.exception()) is not None]
+        if len(errors) == 1:
+            raise errors[0]
+        elif errors:
+            descriptions = "\n".join(str(e) for e in errors)
+            raise RuntimeError(f"{len(errors)} background commands failed.\n{descriptions}") from errors[0]
+
+    def shutdown(self) -> None:
+        """Stops the threads of the pool after all submitted commands finish, without raising their exceptions."""
+        with self._lock:
+            executor, self._executor, self._futures = self._executor, None, []
+        if executor is not None:
+            executor.shutdown()
+
+
+# Functions #
+def _decode(output: str | bytes | None) -> str:
+    if isinstance(output, bytes):
+        return output.decode(errors="replace")
+    return output or ""
+
+
+def run_command(args: Sequence[str | Path], timeout: float | None = None, capture: bool = True) -> CommandResult:
+    """Runs an external command and waits for it to finish.
+
+    Args:
+        args: The arguments of the command.
+        timeout: The number of seconds after which the command is killed, None for no limit.
+        capture: Determines if the standard output and error will be captured instead of shown.
+
+    Returns:
+        The result of the command.
+    """
+    args = [os.fspath(a) for a in args]
+    try:
+        completed = subprocess.run(args, capture_output=capture, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired as error:
+        return CommandResult(args, None, _decode(error.stdout), f"Timed out after {timeout} seconds.")
+    except OSError as error:
+        return CommandResult(args, None, "", str(error))
+    return CommandResult(args, completed.returncode, _decode(completed.stdout), _decode(completed.stderr))
+
+
+def describe_results(results: Sequence[CommandResult]) -> str:
+    """Describes the failed commands of some results with their captured output.
+
+    Args:
+        results: The results of the commands.
+
+    Returns:
+        The description of each failed command.
+    """
+    descriptions = []
+    for result in results:
+        if result.returncode != 0:
+            description = f"{' '.join(result.args)} failed with return code {result.returncode}."
+            output = "\n".join(o.strip() for o in (result.stdout, result.stderr) if o.strip())
+            descriptions.append(f"{description}\n{output}" if output else description)
+    return "\n".join(descriptions)
+
+
+def run_commands(
+    commands: Sequence[Sequence[str | Path]],
+    timeout: float | None = None,
+    capture: bool = True,
+) -> list[CommandResult]:
+    """Runs external commands one after another, stopping at the first one which fails.
+
+    Args:
+        commands: The arguments of each command.
+        timeout: The number of seconds after which each command is killed, None for no limit.
+        capture: Determines if the standard output and error will be captured instead of shown.
+
+    Returns:
+        The results of the commands which were run.
+    """
+    results = []
+    for args in commands:
+        results.append(result := run_command(args, timeout=timeout, capture=capture))
+        if result.returncode != 0:
+            break
+    return results
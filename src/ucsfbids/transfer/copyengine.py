@@ -0,0 +1,317 @@
+"""copyengine.py
+A file copier which uses the fastest copy strategy the source and destination support.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import errno
+import hashlib
+import os
+import shutil
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, NamedTuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+from .hashing import hash_file
+
+
+# Definitions #
+# Constants #
+REFLINK = "reflink"
+HARDLINK = "hardlink"
+SYMLINK = "symlink"
+KERNEL = "kernel"
+BUFFERED = "buffered"
+DEFAULT_STRATEGIES = (REFLINK, HARDLINK, KERNEL, BUFFERED)
+# The strategies of a view, which links to the source files instead of copying them.
+VIEW_STRATEGIES = (HARDLINK, SYMLINK)
+LINK_STRATEGIES = {HARDLINK, SYMLINK}
+
+BUFFER_SIZE = 8 * 1024 * 1024
+KERNEL_CHUNK_SIZE = 1024 * 1024 * 1024
+
+# The ioctl which clones a file on Linux file systems which support reflinks, such as Btrfs and XFS.
+FICLONE = 0x40049409
+
+# The errors which mean a strategy is not supported for a pair of files, so the next strategy is tried.
+UNSUPPORTED_ERRORS = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.ENOTTY,
+    errno.EPERM,
+    errno.EMLINK,
+    errno.EBADF,
+}
+
+
+# Classes #
+class CopyResult(NamedTuple):
+    """The result of a copy.
+
+    Attributes:
+        strategy: The name of the strategy which copied the file.
+        hash: The hexadecimal digest of the copied bytes, None if they were not hashed.
+    """
+
+    strategy: str
+    hash: str | None = None
+
+
+class CopyEngine(BaseObject):
+    """A file copier which uses the fastest copy strategy the source and destination support.
+
+    The strategies are tried in order until one succeeds:
+        reflink: Clones the file, sharing its blocks until either copy is modified, on file systems which support it.
+        hardlink: Links the destination to the source when both are on the same file system. Both names then refer
+            to the same file, so this is only used when the engine allows it and the caller does not modify the copy.
+        symlink: Makes the destination a symbolic link to the absolute path of the source, on any file system. It is
+            only used when it is in the strategies and the caller does not modify the copy, and it breaks if the
+            source is moved.
+        kernel: Copies the data within the kernel with copy_file_range or sendfile.
+        buffered: Copies the data through a large buffer.
+
+    When a hash is requested the bytes are hashed as they are copied, so the copy does not need to be read again. The
+    kernel strategy never passes the bytes through this process, so it is skipped in favor of the buffered copy, and
+    reflinks and hardlinks hash the source, which has the same contents as the copy.
+
+    An engine can also be used as the copy command of a FileSpec.
+
+    Attributes:
+        strategies: The names of the strategies to try in order.
+        allow_hardlink: Determines if the hardlink strategy may be used.
+        buffer_size: The size of the buffer of the buffered strategy.
+
+    Args:
+        strategies: The names of the strategies to try in order.
+        allow_hardlink: Determines if the hardlink strategy may be used.
+        buffer_size: The size of the buffer of the buffered strategy.
+        init: Determines if this object will construct.
+        kwargs: The keyword arguments for inheritance if any.
+    """
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        strategies: Iterable[str] | None = None,
+        allow_hardlink: bool | None = None,
+        buffer_size: int | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self.strategies: tuple[str, ...] = DEFAULT_STRATEGIES
+        self.allow_hardlink: bool = False
+        self.buffer_size: int = BUFFER_SIZE
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(strategies=strategies, allow_hardlink=allow_hardlink, buffer_size=buffer_size, **kwargs)
+
+    def __repr__(self) -> str:
+        """The representation of this engine."""
+        return f"{self.__class__.__name__}(strategies={self.strategies!r}, allow_hardlink={self.allow_hardlink!r})"
+
+    def __call__(self, source: Path, destination: Path) -> None:
+        """Copies a file, so the engine can be used as a copy command.
+
+        Args:
+            source: The path to the file to copy.
+            destination: The path to copy the file to.
+        """
+        self.copy(source, destination)
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(
+        self,
+        strategies: Iterable[str] | None = None,
+        allow_hardlink: bool | None = None,
+        buffer_size: int | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Constructs this object.
+
+        Args:
+            strategies: The names of the strategies to try in order.
+            allow_hardlink: Determines if the hardlink strategy may be used.
+            buffer_size: The size of the buffer of the buffered strategy.
+            kwargs: The keyword arguments for inheritance if any.
+        """
+        if strategies is not None:
+            self.strategies = tuple(strategies)
+
+        if allow_hardlink is not None:
+            self.allow_hardlink = allow_hardlink
+
+        if buffer_size is not None:
+            self.buffer_size = buffer_size
+
+        super().construct(**kwargs)
+
+    def copy(
+        self,
+        source: Path | str,
+        destination: Path | str,
+        metadata: bool = False,
+        link: bool = True,
+        algorithm: str | None = None,
+    ) -> CopyResult:
+        """Copies a file with the first strategy which succeeds, replacing the destination if it exists.
+
+        An existing destination is removed before the copy, so a destination which is a link to another file is
+        replaced by the copy instead of overwriting the file it links to.
+
+        Args:
+            source: The path to the file to copy.
+            destination: The path to copy the file to.
+            metadata: Determines if the access and modification times will be copied along with the permissions.
+            link: Determines if the copy may be a hardlink, which must be False if the copy will be modified.
+            algorithm: The name of the hashlib algorithm to hash the bytes with while copying, None to not hash.
+
+        Returns:
+            The strategy which copied the file and the digest of the file if it was hashed.
+        """
+        source, destination = Path(source), Path(destination)
+        if os.path.abspath(source) == os.path.abspath(destination):
+            raise shutil.SameFileError(f"{source} and {destination} are the same file.")
+
+        # The destination is removed rather than opened, so a link left in its place never writes through to the
+        # file it links to, which may be the source.
+        destination.unlink(missing_ok=True)
+        hasher = None if algorithm is None else hashlib.new(algorithm)
+        for strategy in self.strategies:
+            if (strategy == HARDLINK and not (link and self.allow_hardlink)) or (strategy == SYMLINK and not link):
+                continue
+            if strategy == BUFFERED:
+                if self._copy_buffered(source, destination, hasher):
+                    break
+            elif (strategy != KERNEL or hasher is None) and getattr(self, f"_copy_{strategy}")(source, destination):
+                break
+        else:
+            raise OSError(f"No copy strategy could copy {source} to {destination}.")
+
+        # The permissions of a link are the permissions of its source, so they are never copied onto it.
+        if strategy not in LINK_STRATEGIES:
+            if metadata:
+                shutil.copystat(source, destination)
+            else:
+                shutil.copymode(source, destination)
+
+        if hasher is None:
+            return CopyResult(strategy)
+        elif strategy == BUFFERED:
+            return CopyResult(strategy, hasher.hexdigest())
+        else:
+            return CopyResult(strategy, hash_file(source, algorithm))
+
+    def _fail(self, error: OSError, destination: Path) -> bool:
+        """Removes a partial destination after a strategy failed, raising the error if it is not an unsupported one.
+
+        Args:
+            error: The error which the strategy raised.
+            destination: The path to the destination.
+
+        Returns:
+            False, so the next strategy is tried.
+        """
+        destination.unlink(missing_ok=True)
+        if error.errno not in UNSUPPORTED_ERRORS:
+            raise error
+        return False
+
+    def _copy_reflink(self, source: Path, destination: Path) -> bool:
+        if fcntl is None or not sys.platform.startswith("linux"):
+            return False
+
+        try:
+            with open(source, "rb") as source_file, open(destination, "wb") as destination_file:
+                fcntl.ioctl(destination_file.fileno(), FICLONE, source_file.fileno())
+        except OSError as error:
+            return self._fail(error, destination)
+        return True
+
+    def _copy_hardlink(self, source: Path, destination: Path) -> bool:
+        if os.stat(source).st_dev != os.stat(destination.parent).st_dev:
+            return False
+
+        try:
+            os.link(source, destination)
+        except OSError as error:
+            return self._fail(error, destination)
+        return True
+
+    def _copy_symlink(self, source: Path, destination: Path) -> bool:
+        try:
+            os.symlink(source.resolve(), destination)
+        except OSError as error:
+            return self._fail(error, destination)
+        return True
+
+    def _copy_kernel(self, source: Path, destination: Path) -> bool:
+        copy_range = getattr(os, "copy_file_range", None)
+        if copy_range is None and not sys.platform.startswith("linux"):
+            return False
+
+        try:
+            with open(source, "rb") as source_file, open(destination, "wb") as destination_file:
+                source_fd, destination_fd = source_file.fileno(), destination_file.fileno()
+                copied = 0
+                while True:
+                    if copy_range is not None:
+                        try:
+                            size = copy_range(source_fd, destination_fd, KERNEL_CHUNK_SIZE)
+                        except OSError as error:
+                            # Older kernels cannot copy a range across file systems, but sendfile can.
+                            if copied > 0 or error.errno not in UNSUPPORTED_ERRORS:
+                                raise
+                            copy_range = None
+                            continue
+                    else:
+                        size = os.sendfile(destination_fd, source_fd, copied, KERNEL_CHUNK_SIZE)
+                    if size == 0:
+                        break
+                    copied += size
+        except OSError as error:
+            return self._fail(error, destination)
+        return True
+
+    def _copy_buffered(self, source: Path, destination: Path, hasher: Any = None) -> bool:
+        buffer = bytearray(self.buffer_size)
+        view = memoryview(buffer)
+        with open(source, "rb", buffering=0) as source_file, open(destination, "wb", buffering=0) as destination_file:
+            while size := source_file.readinto(buffer):
+                # A raw write may write fewer bytes than it is given, so the rest of the chunk is written again.
+                written = 0
+                while written < size:
+                    written += destination_file.write(view[written:size])
+                if hasher is not None:
+                    hasher.update(view[:size])
+        return True
+
@@ -0,0 +1,163 @@
+"""destinationlimiter.py
+A limit on the number of concurrent transfers to each destination file system.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from threading import BoundedSemaphore, Lock
+from typing import Any
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+
+
+# Definitions #
+# Functions #
+def find_mount_point(path: Path | str) -> Path:
+    """Finds the mount point of the file system a path is on, the path does not need to exist.
+
+    Args:
+        path: The path to find the mount point of.
+
+    Returns:
+        The path to the mount point.
+    """
+    path = Path(os.path.abspath(path))
+    while not os.path.ismount(path) and path.parent != path:
+        path = path.parent
+    return path
+
+
+# Classes #
+class DestinationLimiter(BaseObject):
+    """A limit on the number of concurrent transfers to each destination file system.
+
+    A network share is often limited by the latency of each stream rather than by its bandwidth, so transfers to it
+    are run concurrently, but a share can also throttle or fail when too many streams are open. Each destination is
+    keyed by the mount point of its file system, so every transfer to the same share takes a slot from the same limit,
+    even when the transfers come from different exporters.
+
+    Attributes:
+        default_limit: The limit of the destinations without their own limit, None for no limit.
+        limits: The limits of the destinations keyed by their mount points.
+
+    Args:
+        limits: The limits of the destinations keyed by any path on their file systems.
+        default_limit: The limit of the destinations without their own limit, None for no limit.
+        init: Determines if this object will construct.
+        kwargs: The keyword arguments for inheritance if any.
+    """
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        limits: dict[Path | str, int] | None = None,
+        default_limit: int | None = None,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self._lock: Lock = Lock()
+        self._semaphores: dict[Path, BoundedSemaphore] = {}
+
+        self.default_limit: int | None = None
+        self.limits: dict[Path, int] = {}
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(limits=limits, default_limit=default_limit, **kwargs)
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(
+        self,
+        limits: dict[Path | str, int] | None = None,
+        default_limit: int | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Constructs this object.
+
+        Args:
+            limits: The limits of the destinations keyed by any path on their file systems.
+            default_limit: The limit of the destinations without their own limit, None for no limit.
+            kwargs: The keyword arguments for inheritance if any.
+        """
+        if default_limit is not None:
+            self.default_limit = default_limit
+
+        if limits is not None:
+            for destination, limit in limits.items():
+                self.set_limit(destination, limit)
+
+        super().construct(**kwargs)
+
+    def set_limit(self, destination: Path | str, limit: int | None) -> None:
+        """Sets the limit of a destination, which applies to the transfers which start afterward.
+
+        Args:
+            destination: Any path on the file system of the destination.
+            limit: The maximum number of concurrent transfers to the destination, None to use the default limit.
+        """
+        key = find_mount_point(destination)
+        with self._lock:
+            if limit is None:
+                self.limits.pop(key, None)
+            else:
+                self.limits[key] = limit
+            self._semaphores.pop(key, None)
+
+    def get_limit(self, destination: Path | str) -> int | None:
+        """Gets the limit of a destination.
+
+        Args:
+            destination: Any path on the file system of the destination.
+
+        Returns:
+            The maximum number of concurrent transfers to the destination, None for no limit.
+        """
+        return self.limits.get(find_mount_point(destination), self.default_limit)
+
+    @contextmanager
+    def slot(self, destination: Path | str) -> Iterator[None]:
+        """Holds a transfer slot of a destination, waiting for one if the destination is at its limit.
+
+        Args:
+            destination: Any path on the file system of the destination.
+        """
+        key = find_mount_point(destination)
+        with self._lock:
+            semaphore = self._semaphores.get(key, None)
+            if semaphore is None:
+                limit = self.limits.get(key, self.default_limit)
+                if limit is not None:
+                    semaphore = self._semaphores[key] = BoundedSemaphore(limit)
+
+        if semaphore is None:
+            yield
+        else:
+            with semaphore:
+                yield
+
+
+# Instances #
+destination_limiter = DestinationLimiter()
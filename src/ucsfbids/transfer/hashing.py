@@ -0,0 +1,47 @@
+"""hashing.py
+Functions for hashing the contents of files.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import hashlib
+from pathlib import Path
+
+# Third-Party Packages #
+
+# Local Packages #
+
+
+# Definitions #
+# Constants #
+DEFAULT_ALGORITHM = "sha256"
+BUFFER_SIZE = 8 * 1024 * 1024
+
+
+# Functions #
+def hash_file(path: Path | str, algorithm: str = DEFAULT_ALGORITHM) -> str:
+    """Hashes the contents of a file.
+
+    Args:
+        path: The path to the file to hash.
+        algorithm: The name of the hashlib algorithm to use.
+
+    Returns:
+        The hexadecimal digest of the file.
+    """
+    hasher = hashlib.new(algorithm)
+    buffer = bytearray(BUFFER_SIZE)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as file:
+        while size := file.readinto(buffer):
+            hasher.update(view[:size])
+    return hasher.hexdigest()
@@ -0,0 +1,206 @@
+"""importjournal.py
+A write-ahead journal of file imports which allows an interrupted import to be resumed.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import json
+import os
+import uuid
+from pathlib import Path
+from threading import Lock
+from typing import Any, TextIO
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+
+
+# Definitions #
+# Classes #
+class ImportJournal(BaseObject):
+    """A write-ahead journal of file imports which allows an interrupted import to be resumed.
+
+    Before a file is imported, the journal records that it began and the temporary name it is written to. After the
+    temporary file is renamed into place, the journal commits the file. On resume, committed files are skipped and the
+    temporary files of begun but uncommitted imports are removed.
+
+    The journal is a directory in which every process appends to its own log, so subjects can be imported by separate
+    processes without sharing a file. A journal can be pickled and sent to worker processes.
+
+    Attributes:
+        path: The path to the journal directory.
+        committed: The paths of the committed targets.
+        pending: The temporary paths of begun but uncommitted imports keyed by their target paths.
+
+    Args:
+        path: The path to the journal directory.
+        resume: Determines if the existing logs will be loaded, otherwise they are deleted.
+        init: Determines if this object will construct.
+        kwargs: The keyword arguments for inheritance if any.
+    """
+
+    default_directory: str = ".ucsfbids/journal"
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        resume: bool = True,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self._lock: Lock = Lock()
+        self._log: TextIO | None = None
+
+        self.path: Path | None = None
+        self.committed: set[str] = set()
+        self.pending: dict[str, str] = {}
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(path=path, resume=resume, **kwargs)
+
+    # Pickling
+    def __getstate__(self) -> dict[str, Any]:
+        """Creates a picklable state without the open log, so each process opens its own log."""
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        state["_log"] = None
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restores this object from a pickled state."""
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(self, path: Path | str | None = None, resume: bool = True, **kwargs: Any) -> None:
+        """Constructs this object.
+
+        Args:
+            path: The path to the journal directory.
+            resume: Determines if the existing logs will be loaded, otherwise they are deleted.
+            kwargs: The keyword arguments for inheritance if any.
+        """
+        if path is not None:
+            self.path = Path(path)
+
+        super().construct(**kwargs)
+
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            if resume:
+                self.load()
+            else:
+                self.clear()
+
+    def load(self) -> None:
+        """Loads the committed and pending imports from all logs in the journal."""
+        begun = {}
+        committed = set()
+        for log_path in self.path.glob("*.jsonl"):
+            with log_path.open("r") as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A line cut off by a crash is ignored, its import is redone.
+                        continue
+                    if entry["event"] == "begin":
+                        begun[entry["target"]] = entry["temporary"]
+                    elif entry["event"] == "commit":
+                        committed.add(entry["target"])
+
+        self.committed = committed
+        self.pending = {t: p for t, p in begun.items() if t not in committed}
+
+    def recover(self) -> list[Path]:
+        """Removes the temporary files of begun but uncommitted imports.
+
+        Returns:
+            The temporary files which were removed.
+        """
+        removed = []
+        for temporary in self.pending.values():
+            temporary_path = Path(temporary)
+            if temporary_path.exists():
+                temporary_path.unlink()
+                removed.append(temporary_path)
+        self.pending.clear()
+        return removed
+
+    def clear(self) -> None:
+        """Deletes all logs in the journal."""
+        self.close()
+        for log_path in self.path.glob("*.jsonl"):
+            log_path.unlink()
+        self.committed.clear()
+        self.pending.clear()
+
+    def close(self) -> None:
+        """Closes the log of this process."""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def _write(self, entry: dict[str, Any], sync: bool = False) -> None:
+        """Appends an entry to the log of this process.
+
+        Args:
+            entry: The entry to append.
+            sync: Determines if the log will be synchronized to disk after the entry is written.
+        """
+        with self._lock:
+            if self._log is None:
+                self._log = (self.path / f"{os.getpid()}-{uuid.uuid4().hex}.jsonl").open("a")
+            self._log.write(json.dumps(entry) + "\n")
+            self._log.flush()
+            if sync:
+                os.fsync(self._log.fileno())
+
+    def begin(self, target: Path, temporary: Path) -> None:
+        """Records that the import of a target began.
+
+        Args:
+            target: The path to the target file.
+            temporary: The temporary path the target is written to before it is renamed into place.
+        """
+        self._write({"event": "begin", "target": os.path.abspath(target), "temporary": os.path.abspath(temporary)})
+
+    def commit(self, target: Path) -> None:
+        """Records that a target was imported and renamed into place.
+
+        Args:
+            target: The path to the target file.
+        """
+        self._write({"event": "commit", "target": os.path.abspath(target)}, sync=True)
+        self.committed.add(os.path.abspath(target))
+
+    def is_committed(self, target: Path) -> bool:
+        """Checks if a target was committed.
+
+        Args:
+            target: The path to the target file.
+
+        Returns:
+            True if the target was committed.
+        """
+        return os.path.abspath(target) in self.committed
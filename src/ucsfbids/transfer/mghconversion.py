@@ -0,0 +1,282 @@
+"""mghconversion.py
+An in-process conversion of FreeSurfer MGH/MGZ volumes to NIfTI-1 which streams the volume.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import gzip
+import math
+import struct
+from pathlib import Path
+from typing import Any, BinaryIO, NamedTuple
+
+# Third-Party Packages #
+import numpy as np
+
+# Local Packages #
+from .commandpool import CommandError, describe_results, run_command
+from .parallelgzip import DEFAULT_LEVEL, ParallelGzipWriter
+
+
+# Definitions #
+# Constants #
+MGH_HEADER_SIZE = 284
+MGH_HEADER_FORMAT = ">i4iiih3f9f3f"
+NIFTI_HEADER_SIZE = 348
+NIFTI_VOX_OFFSET = 352
+CHUNK_SIZE = 8 * 1024 * 1024
+# The number of seconds after which the fallback command is killed.
+DEFAULT_FALLBACK_TIMEOUT = 3600.0
+
+# The MGH data types and their NIfTI data type codes.
+MGH_DATA_TYPES = {
+    0: (np.dtype(">u1"), 2),
+    1: (np.dtype(">i4"), 8),
+    3: (np.dtype(">f4"), 16),
+    4: (np.dtype(">i2"), 4),
+}
+
+# The direction cosines FreeSurfer assumes when a volume has no valid orientation, a coronal conformed volume.
+DEFAULT_MDC = np.array([[-1.0, 0.0, 0.0], [0.0, 0.0, -1.0], [0.0, 1.0, 0.0]])
+
+
+# Classes #
+class MGHHeader(NamedTuple):
+    """The geometry and data type of an MGH volume.
+
+    Attributes:
+        dims: The width, height, depth, and number of frames of the volume.
+        data_type: The MGH data type code.
+        affine: The voxel to RAS affine of the volume.
+        zooms: The voxel sizes.
+    """
+
+    dims: tuple[int, int, int, int]
+    data_type: int
+    affine: np.ndarray
+    zooms: np.ndarray
+
+
+class MGHConverter:
+    """A copy command which converts an MGH/MGZ volume to NIfTI-1 in-process, falling back to a command.
+
+    This can be used as the copy command of a FileSpec in place of "mri_convert", so FreeSurfer does not need to be
+    installed or started for every volume. Volumes which cannot be converted in-process are passed to the fallback.
+
+    Attributes:
+        fallback: The command to run with the old and new paths if the in-process conversion fails, None to raise.
+        level: The gzip compression level for .nii.gz files.
+        threads: The number of threads which compress .nii.gz files, uses the number of CPUs if None.
+        timeout: The number of seconds after which the fallback command is killed, None for no limit.
+
+    Args:
+        fallback: The command to run with the old and new paths if the in-process conversion fails, None to raise.
+        level: The gzip compression level for .nii.gz files.
+        threads: The number of threads which compress .nii.gz files, uses the number of CPUs if None.
+        timeout: The number of seconds after which the fallback command is killed, None for no limit.
+    """
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        fallback: str | None = "mri_convert",
+        level: int = DEFAULT_LEVEL,
+        threads: int | None = None,
+        timeout: float | None = DEFAULT_FALLBACK_TIMEOUT,
+    ) -> None:
+        # New Attributes #
+        self.fallback: str | None = fallback
+        self.level: int = level
+        self.threads: int | None = threads
+        self.timeout: float | None = timeout
+
+    def __repr__(self) -> str:
+        """The representation of this converter."""
+        return f"{self.__class__.__name__}(fallback={self.fallback!r})"
+
+    def __call__(self, old_path: Path, new_path: Path) -> None:
+        """Converts a volume, running the fallback command if the in-process conversion fails.
+
+        Args:
+            old_path: The path to the MGH/MGZ volume.
+            new_path: The path to the NIfTI file to create.
+
+        Raises:
+            FileNotFoundError: If the volume does not exist, which the fallback command could not convert either.
+            CommandError: If the fallback command fails or times out.
+        """
+        try:
+            convert_mgh_to_nifti(old_path, new_path, level=self.level, threads=self.threads)
+        except FileNotFoundError:
+            raise
+        except (ValueError, EOFError, OSError):
+            if self.fallback is None:
+                raise
+            Path(new_path).unlink(missing_ok=True)
+            result = run_command([self.fallback, old_path, new_path], timeout=self.timeout)
+            if result.returncode != 0:
+                Path(new_path).unlink(missing_ok=True)
+                raise CommandError(f"Failed to convert {old_path}.\n{describe_results([result])}", [result])
+
+
+# Functions #
+def read_mgh_header(file: BinaryIO) -> MGHHeader:
+    """Reads the header of an MGH volume.
+
+    Args:
+        file: The decompressed MGH file positioned at its start.
+
+    Returns:
+        The geometry and data type of the volume.
+
+    Raises:
+        ValueError: If the file is not a supported MGH volume.
+    """
+    raw = file.read(MGH_HEADER_SIZE)
+    if len(raw) != MGH_HEADER_SIZE:
+        raise ValueError("The file is too short to be an MGH volume.")
+
+    fields = struct.unpack_from(MGH_HEADER_FORMAT, raw)
+    version, dims, data_type, good_ras = fields[0], fields[1:5], fields[5], fields[7]
+    if version != 1:
+        raise ValueError(f"Unsupported MGH version {version}.")
+    if data_type not in MGH_DATA_TYPES:
+        raise ValueError(f"Unsupported MGH data type {data_type}.")
+
+    if good_ras > 0:
+        zooms = np.array(fields[8:11], dtype=np.float64)
+        mdc = np.array(fields[11:20], dtype=np.float64).reshape(3, 3).T
+        c_ras = np.array(fields[20:23], dtype=np.float64)
+    else:
+        zooms = np.ones(3)
+        mdc = DEFAULT_MDC
+        c_ras = np.zeros(3)
+
+    rotation_zooms = mdc * zooms
+    affine = np.eye(4)
+    affine[:3, :3] = rotation_zooms
+    affine[:3, 3] = c_ras - rotation_zooms @ (np.array(dims[:3], dtype=np.float64) / 2)
+    return MGHHeader(tuple(dims), data_type, affine, zooms)
+
+
+def _affine_to_quaternion(affine: np.ndarray, zooms: np.ndarray) -> tuple[float, tuple[float, float, float]]:
+    """Converts the rotation of an affine to the quaternion and qfac of a NIfTI qform.
+
+    Args:
+        affine: The voxel to RAS affine.
+        zooms: The voxel sizes.
+
+    Returns:
+        The qfac and the b, c, and d parameters of the quaternion.
+    """
+    rotation = affine[:3, :3] / zooms
+    qfac = 1.0
+    if np.linalg.det(rotation) < 0:
+        qfac = -1.0
+        rotation[:, 2] = -rotation[:, 2]
+
+    # The nearest orthonormal matrix removes the rounding error of the single precision direction cosines.
+    u, _, vt = np.linalg.svd(rotation)
+    (r11, r12, r13), (r21, r22, r23), (r31, r32, r33) = u @ vt
+
+    trace = r11 + r22 + r33 + 1.0
+    if trace > 0.5:
+        a = 0.5 * math.sqrt(trace)
+        b, c, d = 0.25 * (r32 - r23) / a, 0.25 * (r13 - r31) / a, 0.25 * (r21 - r12) / a
+    elif r11 > r22 and r11 > r33:
+        b = 0.5 * math.sqrt(1.0 + r11 - r22 - r33)
+        a, c, d = 0.25 * (r32 - r23) / b, 0.25 * (r12 + r21) / b, 0.25 * (r13 + r31) / b
+    elif r22 > r33:
+        c = 0.5 * math.sqrt(1.0 - r11 + r22 - r33)
+        a, b, d = 0.25 * (r13 - r31) / c, 0.25 * (r12 + r21) / c, 0.25 * (r23 + r32) / c
+    else:
+        d = 0.5 * math.sqrt(1.0 - r11 - r22 + r33)
+        a, b, c = 0.25 * (r21 - r12) / d, 0.25 * (r13 + r31) / d, 0.25 * (r23 + r32) / d
+
+    if a < 0.0:
+        b, c, d = -b, -c, -d
+    return qfac, (b, c, d)
+
+
+def create_nifti_header(header: MGHHeader) -> bytes:
+    """Creates a little endian NIfTI-1 header, with its empty extension flag, for the geometry of an MGH volume.
+
+    Args:
+        header: The geometry and data type of the MGH volume.
+
+    Returns:
+        The NIfTI-1 header followed by the extension flag, which is the data offset in length.
+    """
+    dtype, nifti_type = MGH_DATA_TYPES[header.data_type]
+    width, height, depth, frames = header.dims
+    dim = (3 if frames == 1 else 4, width, height, depth, frames, 1, 1, 1)
+    qfac, quaternion = _affine_to_quaternion(header.affine, header.zooms)
+    pixdim = (qfac, *header.zooms, 1.0, 1.0, 1.0, 1.0)
+
+    nifti = bytearray(NIFTI_VOX_OFFSET)
+    struct.pack_into("<i", nifti, 0, NIFTI_HEADER_SIZE)
+    struct.pack_into("<c", nifti, 38, b"r")
+    struct.pack_into("<8h", nifti, 40, *dim)
+    struct.pack_into("<hh", nifti, 70, nifti_type, dtype.itemsize * 8)
+    struct.pack_into("<8f", nifti, 76, *pixdim)
+    struct.pack_into("<fff", nifti, 108, NIFTI_VOX_OFFSET, 1.0, 0.0)
+    # Millimeters and seconds.
+    struct.pack_into("<B", nifti, 123, 2 | 8)
+    struct.pack_into("<hh", nifti, 252, 1, 1)
+    struct.pack_into("<6f", nifti, 256, *quaternion, *header.affine[:3, 3])
+    struct.pack_into("<12f", nifti, 280, *header.affine[:3, :].ravel())
+    struct.pack_into("<4s", nifti, 344, b"n+1\0")
+    return bytes(nifti)
+
+
+def convert_mgh_to_nifti(
+    old_path: Path | str,
+    new_path: Path | str,
+    level: int = DEFAULT_LEVEL,
+    threads: int | None = None,
+) -> None:
+    """Converts an MGH/MGZ volume to a NIfTI-1 file, streaming the volume in chunks.
+
+    The voxels of both formats are stored in the same order, so the volume is streamed through in chunks and only has
+    its byte order swapped. A new path ending in .gz is compressed across a pool of threads.
+
+    Args:
+        old_path: The path to the MGH/MGZ volume.
+        new_path: The path to the NIfTI file to create.
+        level: The gzip compression level for .nii.gz files.
+        threads: The number of threads which compress .nii.gz files, uses the number of CPUs if None.
+
+    Raises:
+        ValueError: If the file is not a supported MGH volume.
+        EOFError: If the volume ends before all of its voxels.
+    """
+    old_path, new_path = Path(old_path), Path(new_path)
+    compressed = old_path.suffix == ".mgz" or old_path.name.endswith(".mgh.gz")
+    with gzip.open(old_path, "rb") if compressed else open(old_path, "rb") as old_file:
+        header = read_mgh_header(old_file)
+        dtype = MGH_DATA_TYPES[header.data_type][0]
+        remaining = math.prod(header.dims) * dtype.itemsize
+        chunk_size = CHUNK_SIZE - CHUNK_SIZE % dtype.itemsize
+
+        if new_path.suffix == ".gz":
+            new_file = ParallelGzipWriter(new_path, level=level, threads=threads)
+        else:
+            new_file = open(new_path, "wb")
+        with new_file:
+            new_file.write(create_nifti_header(header))
+            while remaining > 0:
+                chunk = old_file.read(min(chunk_size, remaining))
+                if not chunk:
+                    raise EOFError(f"{old_path} ended before all of its voxels were read.")
+                new_file.write(np.frombuffer(chunk, dtype=dtype).astype(dtype.newbyteorder("<")).tobytes())
+                remaining -= len(chunk)
@@ -0,0 +1,135 @@
+"""namematcher.py
+A compiled matcher of file names against include and exclude rules.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import fnmatch
+import re
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+
+# Third-Party Packages #
+
+# Local Packages #
+
+
+# Definitions #
+# Constants #
+GLOB_PREFIX = "glob:"
+ENTITY_PREFIX = "entity:"
+
+
+# Functions #
+def compile_rule(rule: str) -> str:
+    """Compiles a rule into a regular expression which is searched for in a file name.
+
+    A rule is a substring of the name, a glob of the whole name prefixed by "glob:", such as "glob:*_ieeg.json", or a
+    BIDS entity of the name prefixed by "entity:", such as "entity:acq-photo".
+
+    Args:
+        rule: The rule to compile.
+
+    Returns:
+        The regular expression of the rule.
+    """
+    if rule.startswith(GLOB_PREFIX):
+        return f"^(?:{fnmatch.translate(rule.removeprefix(GLOB_PREFIX))})"
+    elif rule.startswith(ENTITY_PREFIX):
+        return f"(?:^|_){re.escape(rule.removeprefix(ENTITY_PREFIX))}(?=[_.]|$)"
+    else:
+        return re.escape(rule)
+
+
+def compile_rules(rules: Iterable[str]) -> re.Pattern | None:
+    """Compiles rules into one regular expression which matches a name when any rule matches it.
+
+    Args:
+        rules: The rules to compile.
+
+    Returns:
+        The regular expression of the rules, or None if there are no rules.
+    """
+    # The longest substrings are tried first, so a shared prefix does not end the search early.
+    expressions = [compile_rule(r) for r in sorted(set(rules), key=lambda r: (-len(r), r))]
+    return re.compile("|".join(expressions)) if expressions else None
+
+
+@lru_cache(maxsize=None)
+def _compile_name_matcher(include: frozenset[str] | None, exclude: frozenset[str]) -> "NameMatcher":
+    return NameMatcher(include, exclude)
+
+
+def compile_name_matcher(include: Iterable[str] | None = None, exclude: Iterable[str] = ()) -> "NameMatcher":
+    """Gets the matcher of the rules, which is compiled once for each distinct set of rules.
+
+    Args:
+        include: The rules of the names to include, includes every name if None.
+        exclude: The rules of the names to exclude.
+
+    Returns:
+        The matcher of the rules.
+    """
+    return _compile_name_matcher(None if include is None else frozenset(include), frozenset(exclude))
+
+
+# Classes #
+class NameMatcher:
+    """A compiled matcher of file names against include and exclude rules.
+
+    The include rules and the exclude rules are each compiled into one regular expression, so a name is matched with
+    two searches regardless of the number of rules. A name matches when it matches any include rule and no exclude
+    rule. The rules are substrings, globs, or BIDS entities as described by compile_rule.
+
+    Attributes:
+        include: The rules of the names to include, includes every name if None.
+        exclude: The rules of the names to exclude.
+
+    Args:
+        include: The rules of the names to include, includes every name if None.
+        exclude: The rules of the names to exclude.
+    """
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(self, include: Iterable[str] | None = None, exclude: Iterable[str] = ()) -> None:
+        # New Attributes #
+        self.include: frozenset[str] | None = None if include is None else frozenset(include)
+        self.exclude: frozenset[str] = frozenset(exclude)
+
+        self._include: re.Pattern | None = None if include is None else compile_rules(self.include)
+        self._exclude: re.Pattern | None = compile_rules(self.exclude)
+
+    # Instance Methods #
+    def match(self, name: str) -> bool:
+        """Determines if a name matches the rules.
+
+        Args:
+            name: The file name to match.
+
+        Returns:
+            True if the name matches an include rule and no exclude rule.
+        """
+        if self.include is not None and (self._include is None or self._include.search(name) is None):
+            return False
+        return self._exclude is None or self._exclude.search(name) is None
+
+    def filter(self, names: Iterable[str]) -> Iterator[str]:
+        """Filters names by the rules.
+
+        Args:
+            names: The file names to match.
+
+        Returns:
+            An iterator of the names which match.
+        """
+        return (n for n in names if self.match(n))
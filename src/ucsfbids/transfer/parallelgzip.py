@@ -0,0 +1,146 @@
+"""parallelgzip.py
+A gzip file writer which compresses blocks of data across a pool of threads.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import os
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO
+
+# Third-Party Packages #
+
+# Local Packages #
+
+
+# Definitions #
+# Constants #
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+DEFAULT_LEVEL = 6
+
+
+# Functions #
+def compress_member(data: bytes | memoryview, level: int = DEFAULT_LEVEL) -> bytes:
+    """Compresses data into a complete gzip member.
+
+    Args:
+        data: The data to compress.
+        level: The compression level from 1 to 9.
+
+    Returns:
+        The gzip member.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+# Classes #
+class ParallelGzipWriter:
+    """A gzip file writer which compresses blocks of data across a pool of threads.
+
+    Each block is compressed into its own gzip member and the members are written in order. A file of concatenated
+    members is a valid gzip file which every gzip reader decompresses as one stream. zlib releases the GIL while it
+    compresses, so the blocks are compressed in parallel.
+
+    Attributes:
+        file: The binary file the gzip members are written to.
+        level: The compression level from 1 to 9.
+        block_size: The size of the uncompressed blocks.
+        threads: The number of threads which compress the blocks.
+
+    Args:
+        file: The path or binary file to write the gzip members to.
+        level: The compression level from 1 to 9.
+        block_size: The size of the uncompressed blocks.
+        threads: The number of threads which compress the blocks, uses the number of CPUs if None.
+    """
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        file: Path | str | BinaryIO,
+        level: int = DEFAULT_LEVEL,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        threads: int | None = None,
+    ) -> None:
+        # New Attributes #
+        self._owns_file: bool = not hasattr(file, "write")
+        self._buffer: bytearray = bytearray()
+        self._pending: deque[Future] = deque()
+        self._members: int = 0
+
+        self.file: BinaryIO = open(file, "wb") if self._owns_file else file
+        self.level: int = level
+        self.block_size: int = block_size
+        self.threads: int = threads or os.cpu_count() or 1
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=self.threads)
+
+    def __enter__(self) -> "ParallelGzipWriter":
+        """Enters a context which closes this writer when it exits."""
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Closes this writer when the context exits."""
+        self.close()
+
+    # Instance Methods #
+    def _submit(self, block: bytes) -> None:
+        """Submits a block to be compressed, writing finished members so that memory stays bounded.
+
+        Args:
+            block: The block to compress.
+        """
+        self._pending.append(self.executor.submit(compress_member, block, self.level))
+        self._members += 1
+        while len(self._pending) > 2 * self.threads:
+            self.file.write(self._pending.popleft().result())
+
+    def write(self, data: bytes | bytearray | memoryview) -> int:
+        """Writes data to the gzip file.
+
+        Args:
+            data: The data to write.
+
+        Returns:
+            The number of bytes written.
+        """
+        self._buffer += data
+        while len(self._buffer) >= self.block_size:
+            self._submit(bytes(self._buffer[: self.block_size]))
+            del self._buffer[: self.block_size]
+        return len(data)
+
+    def flush(self) -> None:
+        """Compresses and writes all buffered data."""
+        # An empty file still needs one member to be a valid gzip file.
+        if self._buffer or self._members == 0:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+        while self._pending:
+            self.file.write(self._pending.popleft().result())
+        self.file.flush()
+
+    def close(self) -> None:
+        """Writes all buffered data and closes the file if this writer opened it."""
+        if self.executor is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self.executor.shutdown()
+            self.executor = None
+            if self._owns_file:
+                self.file.close()
@@ -0,0 +1,262 @@
+"""sourceinventory.py
+An in-memory inventory of the files in a source directory which is listed once instead of stated file by file.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import os
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from stat import S_ISREG
+from typing import Any, NamedTuple
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+
+
+# Definitions #
+# Classes #
+class InventoryEntry(NamedTuple):
+    """The state of a file in an inventory.
+
+    Attributes:
+        size: The size of the file.
+        mtime_ns: The modification time of the file.
+    """
+
+    size: int
+    mtime_ns: int
+
+
+class SourceInventory(BaseObject):
+    """An in-memory inventory of the files in a source directory which is listed once instead of stated file by file.
+
+    The source directory contains a directory per patient. Crawling lists the patients once and then lists the
+    directories of the patients across a pool of threads, recording the size and modification time of every file.
+    Files are then looked up in the inventory rather than on the file system, so resolving the sources of an import
+    costs a few directory listings rather than a stat per candidate file. A directory which was not crawled is listed
+    the first time a file in it is looked up.
+
+    Attributes:
+        root: The path to the source directory which contains the patient directories.
+        patients: The names of the patients in the source directory, None if it has not been listed.
+        listings: The files of each listed directory keyed by the directory path, None if the directory does not exist.
+
+    Args:
+        root: The path to the source directory which contains the patient directories.
+        init: Determines if this object will construct.
+        kwargs: The keyword arguments for inheritance if any.
+    """
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(self, root: Path | str | None = None, *, init: bool = True, **kwargs: Any) -> None:
+        # New Attributes #
+        self.root: Path | None = None
+        self.patients: list[str] | None = None
+        self.listings: dict[Path, dict[str, InventoryEntry] | None] = {}
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(root=root, **kwargs)
+
+    def __len__(self) -> int:
+        """The number of files in the inventory."""
+        return sum(len(files) for files in self.listings.values() if files is not None)
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(self, root: Path | str | None = None, **kwargs: Any) -> None:
+        """Constructs this object.
+
+        Args:
+            root: The path to the source directory which contains the patient directories.
+            kwargs: The keyword arguments for inheritance if any.
+        """
+        if root is not None:
+            self.root = Path(root)
+
+        super().construct(**kwargs)
+
+    def list_patients(self) -> list[str]:
+        """Lists the patient directories in the source directory.
+
+        Returns:
+            The names of the patients.
+        """
+        with os.scandir(self.root) as it:
+            self.patients = [e.name for e in it if not e.name.startswith(".") and e.is_dir()]
+        return self.patients
+
+    def list_directory(self, path: Path) -> tuple[dict[str, InventoryEntry] | None, list[Path]]:
+        """Lists the files in a directory and adds them to the inventory.
+
+        Args:
+            path: The path to the directory to list.
+
+        Returns:
+            The files in the directory, None if it does not exist, and the paths to its subdirectories.
+        """
+        files = {}
+        subdirectories = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        files[entry.name] = InventoryEntry(stat.st_size, stat.st_mtime_ns)
+                    elif entry.is_dir():
+                        subdirectories.append(path / entry.name)
+        except (FileNotFoundError, NotADirectoryError):
+            files = None
+
+        self.listings[path] = files
+        return files, subdirectories
+
+    def crawl(
+        self,
+        patients: Iterable[str] | None = None,
+        directories: Iterable[Path | str] = (Path(""),),
+        recursive: bool = False,
+        jobs: int | None = None,
+    ) -> int:
+        """Lists the directories of the patients across a pool of threads.
+
+        Args:
+            patients: The names of the patients to crawl, crawls every patient in the source directory if None.
+            directories: The directories to list within each patient directory, relative to the patient directory.
+            recursive: Determines if the subdirectories of the listed directories will be listed too.
+            jobs: The number of threads to list the directories with, lists them serially if None or 1.
+
+        Returns:
+            The number of directories listed.
+        """
+        if patients is None:
+            patients = self.list_patients() if self.patients is None else self.patients
+        directories = [Path(d) for d in directories]
+        pending = list(dict.fromkeys(self.root / p / d for p in patients for d in directories))
+
+        count = 0
+        if jobs is None or jobs <= 1:
+            while pending:
+                _, subdirectories = self.list_directory(pending.pop())
+                count += 1
+                if recursive:
+                    pending.extend(subdirectories)
+            return count
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            while pending:
+                results = list(executor.map(self.list_directory, pending))
+                count += len(pending)
+                pending = [s for _, subdirectories in results for s in subdirectories] if recursive else []
+        return count
+
+    def prefetch(self, paths: Iterable[Path | str], jobs: int | None = None) -> int:
+        """Lists the directories of files which are about to be looked up across a pool of threads.
+
+        Args:
+            paths: The paths to the files which will be looked up.
+            jobs: The number of threads to list the directories with, lists them serially if None or 1.
+
+        Returns:
+            The number of directories listed.
+        """
+        directories = dict.fromkeys(Path(p).parent for p in paths if self.covers(p))
+        directories = [d for d in directories if d not in self.listings]
+        if jobs is None or jobs <= 1 or len(directories) <= 1:
+            for directory in directories:
+                self.list_directory(directory)
+        else:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                list(executor.map(self.list_directory, directories))
+        return len(directories)
+
+    def _patient_name(self, path: Path) -> str | None:
+        try:
+            parts = path.relative_to(self.root).parts
+        except ValueError:
+            return None
+        return parts[0] if parts else None
+
+    def covers(self, path: Path | str) -> bool:
+        """Checks if a path is within a patient directory of the source directory.
+
+        Args:
+            path: The path to check.
+
+        Returns:
+            True if the path can be looked up in the inventory.
+        """
+        try:
+            return len(Path(path).relative_to(self.root).parts) > 1
+        except ValueError:
+            return False
+
+    def stat(self, path: Path | str) -> InventoryEntry | None:
+        """Looks up a file in the inventory, listing its directory if it has not been listed.
+
+        A path outside the patient directories is stated directly.
+
+        Args:
+            path: The path to the file.
+
+        Returns:
+            The state of the file, None if it does not exist or is not a file.
+        """
+        path = Path(path)
+        if not self.covers(path):
+            try:
+                stat = os.stat(path)
+            except (FileNotFoundError, NotADirectoryError):
+                return None
+            return InventoryEntry(stat.st_size, stat.st_mtime_ns) if S_ISREG(stat.st_mode) else None
+
+        directory = path.parent
+        if directory in self.listings:
+            files = self.listings[directory]
+        else:
+            files, _ = self.list_directory(directory)
+        return None if files is None else files.get(path.name, None)
+
+    def get(self, patient: str, path: Path | str) -> InventoryEntry | None:
+        """Looks up a file by its patient and its path relative to the patient directory.
+
+        Args:
+            patient: The name of the patient.
+            path: The path to the file relative to the patient directory.
+
+        Returns:
+            The state of the file, None if it does not exist or is not a file.
+        """
+        return self.stat(self.root / patient / path)
+
+    def select(self, patients: Iterable[str]) -> "SourceInventory":
+        """Creates an inventory which only contains the listings of some patients.
+
+        Args:
+            patients: The names of the patients to keep.
+
+        Returns:
+            The inventory of the patients.
+        """
+        patients = set(patients)
+        inventory = SourceInventory(self.root)
+        inventory.patients = [p for p in self.patients or () if p in patients]
+        inventory.listings = {d: f for d, f in self.listings.items() if self._patient_name(d) in patients}
+        return inventory
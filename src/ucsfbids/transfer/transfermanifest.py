@@ -0,0 +1,327 @@
+"""transfermanifest.py
+A manifest which records the source and state of every file transferred into a directory.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import json
+import os
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, NamedTuple
+
+# Third-Party Packages #
+from baseobjects import BaseObject
+
+# Local Packages #
+from .hashing import DEFAULT_ALGORITHM, hash_file
+
+
+# Definitions #
+# Classes #
+class TransferRecord(NamedTuple):
+    """The record of a transferred file.
+
+    Attributes:
+        source: The resolved path to the source file.
+        source_size: The size of the source file when it was transferred.
+        source_mtime_ns: The modification time of the source file when it was transferred.
+        target_size: The size of the target file after it was transferred.
+        hash: The hexadecimal digest of the target file, None if it was not hashed.
+    """
+
+    source: str
+    source_size: int
+    source_mtime_ns: int
+    target_size: int
+    hash: str | None = None
+
+
+class TransferManifest(BaseObject):
+    """A manifest which records the source and state of every file transferred into a directory.
+
+    A target only needs to be transferred again when its source changed, or when the target is missing or does not
+    have the size it had when it was transferred, such as after a crash while writing it.
+
+    Attributes:
+        path: The path to the manifest file.
+        algorithm: The name of the hashlib algorithm used to hash the targets.
+        records: The records of the transferred files keyed by their target paths relative to the manifest.
+
+    Args:
+        path: The path to the manifest file.
+        algorithm: The name of the hashlib algorithm used to hash the targets.
+        load: Determines if the manifest will be loaded from its file if it exists.
+        init: Determines if this object will construct.
+        kwargs: The keyword arguments for inheritance if any.
+    """
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        algorithm: str = DEFAULT_ALGORITHM,
+        load: bool = True,
+        *,
+        init: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        # New Attributes #
+        self.path: Path | None = None
+        self.algorithm: str = DEFAULT_ALGORITHM
+        self.records: dict[str, TransferRecord] = {}
+
+        # Parent Attributes #
+        super().__init__(init=False)
+
+        # Object Construction #
+        if init:
+            self.construct(path=path, algorithm=algorithm, load=load, **kwargs)
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(
+        self,
+        path: Path | str | None = None,
+        algorithm: str | None = None,
+        load: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        """Constructs this object.
+
+        Args:
+            path: The path to the manifest file.
+            algorithm: The name of the hashlib algorithm used to hash the targets.
+            load: Determines if the manifest will be loaded from its file if it exists.
+            kwargs: The keyword arguments for inheritance if any.
+        """
+        if path is not None:
+            self.path = Path(path)
+
+        if algorithm is not None:
+            self.algorithm = algorithm
+
+        super().construct(**kwargs)
+
+        if load and self.path is not None and self.path.is_file():
+            self.load()
+
+    def load(self) -> None:
+        """Loads the records from the manifest file."""
+        with self.path.open("r") as file:
+            data = json.load(file)
+        self.algorithm = data.get("Algorithm", self.algorithm)
+        self.records.clear()
+        self.records.update({k: TransferRecord(**v) for k, v in data.get("Files", {}).items()})
+
+    def save(self) -> None:
+        """Saves the records to the manifest file, replacing it atomically."""
+        data = {"Algorithm": self.algorithm, "Files": {k: r._asdict() for k, r in self.records.items()}}
+        temporary_path = self.path.with_name(f".{self.path.name}.tmp")
+        with temporary_path.open("w") as file:
+            json.dump(data, file)
+        os.replace(temporary_path, self.path)
+
+    def key(self, target: Path | str) -> str:
+        """Creates the key of a target, which is its path relative to the directory of the manifest.
+
+        Args:
+            target: The path to the target file.
+
+        Returns:
+            The key of the target.
+        """
+        target = Path(target)
+        try:
+            return target.relative_to(self.path.parent).as_posix()
+        except ValueError:
+            return target.as_posix()
+
+    def get(self, target: Path | str) -> TransferRecord | None:
+        """Gets the record of a target.
+
+        Args:
+            target: The path to the target file.
+
+        Returns:
+            The record of the target, None if it has not been transferred.
+        """
+        return self.records.get(self.key(target), None)
+
+    def is_current(
+        self,
+        source: Path | str,
+        target: Path | str,
+        source_size: int | None = None,
+        source_mtime_ns: int | None = None,
+    ) -> bool:
+        """Checks if a target was transferred from the current state of a source and is still intact.
+
+        Args:
+            source: The path to the source file.
+            target: The path to the target file.
+            source_size: The size of the source file if it is already known, which avoids a stat of the source.
+            source_mtime_ns: The modification time of the source file if it is already known.
+
+        Returns:
+            True if the target does not need to be transferred again.
+        """
+        record = self.get(target)
+        if record is None:
+            return False
+
+        try:
+            if source_size is None or source_mtime_ns is None:
+                source_stat = os.stat(source)
+                source_size, source_mtime_ns = source_stat.st_size, source_stat.st_mtime_ns
+            target_stat = os.stat(target)
+        except FileNotFoundError:
+            return False
+
+        return (
+            record.source == os.fspath(Path(source).resolve())
+            and record.source_size == source_size
+            and record.source_mtime_ns == source_mtime_ns
+            and record.target_size == target_stat.st_size
+        )
+
+    def record(
+        self,
+        source: Path | str,
+        target: Path | str,
+        hash_: str | None = None,
+        hash_target: bool = True,
+    ) -> TransferRecord:
+        """Records that a target was transferred from a source.
+
+        Args:
+            source: The path to the source file.
+            target: The path to the target file.
+            hash_: The digest of the target, hashes the target if None and hash_target is True.
+            hash_target: Determines if the target will be hashed when no digest is given.
+
+        Returns:
+            The new record of the target.
+        """
+        source_stat = os.stat(source)
+        self.records[self.key(target)] = record = TransferRecord(
+            source=os.fspath(Path(source).resolve()),
+            source_size=source_stat.st_size,
+            source_mtime_ns=source_stat.st_mtime_ns,
+            target_size=os.stat(target).st_size,
+            hash=hash_file(target, self.algorithm) if hash_ is None and hash_target else hash_,
+        )
+        return record
+
+    def remove(self, target: Path | str) -> TransferRecord | None:
+        """Removes the record of a target.
+
+        Args:
+            target: The path to the target file.
+
+        Returns:
+            The removed record, None if the target was not recorded.
+        """
+        return self.records.pop(self.key(target), None)
+
+    def target_path(self, key: str) -> Path:
+        """Gets the path to a target from its key.
+
+        Args:
+            key: The key of the target.
+
+        Returns:
+            The path to the target file.
+        """
+        return self.path.parent / key
+
+    def verify(self, jobs: int | None = None) -> list[str]:
+        """Hashes every recorded target again and compares it to the digest recorded when it was transferred.
+
+        Args:
+            jobs: The number of threads to hash the targets with, uses the number of CPUs if None.
+
+        Returns:
+            The keys of the targets which are missing or whose contents changed.
+        """
+        return verify_manifests([self], jobs=jobs)[self.path]
+
+
+# Functions #
+def prune_manifests(path: Path | str, name: str) -> list[Path]:
+    """Removes every target recorded in the manifests within a directory, then the manifests and empty directories.
+
+    Only recorded targets are removed, so files which were not transferred into the directory are kept, along with
+    the directories which contain them.
+
+    Args:
+        path: The path to the directory to prune.
+        name: The file name of the manifests.
+
+    Returns:
+        The paths to the removed targets.
+    """
+    path = Path(path)
+    removed = []
+    for manifest_path in sorted(path.rglob(name)):
+        manifest = TransferManifest(manifest_path)
+        for key in manifest.records:
+            target = manifest.target_path(key)
+            if target.is_file() or target.is_symlink():
+                target.unlink()
+                removed.append(target)
+        manifest_path.unlink()
+
+    for directory in sorted((p for p in path.rglob("*") if p.is_dir()), key=lambda p: len(p.parts), reverse=True):
+        if not any(directory.iterdir()):
+            directory.rmdir()
+    if path.is_dir() and not any(path.iterdir()):
+        path.rmdir()
+    return removed
+
+
+def _verify_target(path: Path, algorithm: str, hash_: str) -> bool:
+    try:
+        return hash_file(path, algorithm) == hash_
+    except FileNotFoundError:
+        return False
+
+
+def verify_manifests(manifests: Iterable[TransferManifest], jobs: int | None = None) -> dict[Path, list[str]]:
+    """Hashes the recorded targets of manifests again in one pool of threads and compares them to their records.
+
+    Targets which were recorded without a digest are not verified. hashlib releases the GIL while it hashes large
+    buffers, so the targets are hashed in parallel.
+
+    Args:
+        manifests: The manifests to verify.
+        jobs: The number of threads to hash the targets with, uses the number of CPUs if None.
+
+    Returns:
+        The keys of the targets which are missing or whose contents changed, keyed by the path of their manifest.
+    """
+    manifests = list(manifests)
+    targets = [(m, k, r.hash) for m in manifests for k, r in m.records.items() if r.hash is not None]
+    failed = {m.path: [] for m in manifests}
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        intact = executor.map(
+            _verify_target,
+            [m.target_path(k) for m, k, _ in targets],
+            [m.algorithm for m, _, _ in targets],
+            [h for _, _, h in targets],
+        )
+        for (manifest, key, _), is_intact in zip(targets, intact):
+            if not is_intact:
+                failed[manifest.path].append(key)
+    return failed
@@ -0,0 +1,153 @@
+""" benchmarking.py
+Times benchmarks, records their results as JSON, and compares them against a stored baseline.
+"""
+# Imports #
+# Standard Libraries #
+import datetime
+import json
+import os
+import platform
+import statistics
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+# Third-Party Packages #
+
+# Local Packages #
+
+
+# Definitions #
+# Constants #
+RESULTS_VERSION = 1
+
+# The numbers of subjects of the benchmark datasets, the largest only runs with --benchmark-large.
+SUBJECT_COUNTS = [1, 100, pytest.param(5000, marks=pytest.mark.benchmark_large)]
+
+
+# Classes #
+class BenchmarkRecorder:
+    """Times benchmarks and compares their results against a baseline.
+
+    The time of a benchmark is the fastest of its rounds, which is the least affected by other load on the machine. A
+    benchmark regresses when its time exceeds its baseline time by more than the threshold, and by more than the
+    minimum difference, so the timer resolution does not flag the fastest benchmarks.
+
+    Attributes:
+        baseline: The results of the baseline run keyed by benchmark name.
+        threshold: The fraction of the baseline time a benchmark may be slower by.
+        min_difference: The number of seconds a benchmark may always be slower by.
+        results: The results of this run keyed by benchmark name.
+
+    Args:
+        baseline: The results of the baseline run keyed by benchmark name.
+        threshold: The fraction of the baseline time a benchmark may be slower by.
+        min_difference: The number of seconds a benchmark may always be slower by.
+    """
+
+    def __init__(
+        self,
+        baseline: dict[str, dict[str, Any]] | None = None,
+        threshold: float = 0.25,
+        min_difference: float = 0.01,
+    ) -> None:
+        self.baseline: dict[str, dict[str, Any]] = {} if baseline is None else baseline
+        self.threshold: float = threshold
+        self.min_difference: float = min_difference
+        self.results: dict[str, dict[str, Any]] = {}
+
+    def run(
+        self,
+        name: str,
+        function: Callable[..., Any],
+        setup: Callable[[], tuple] | None = None,
+        rounds: int = 3,
+        **info: Any,
+    ) -> dict[str, Any]:
+        """Times a function for a number of rounds and records the result.
+
+        Args:
+            name: The name of the benchmark.
+            function: The function to time.
+            setup: A function which is run untimed before each round and returns the arguments of the function.
+            rounds: The number of times to run the function.
+            **info: Information to record with the result, such as the size of the input.
+
+        Returns:
+            The result of the benchmark.
+        """
+        times = []
+        for _ in range(rounds):
+            args = () if setup is None else setup()
+            start = time.perf_counter()
+            function(*args)
+            times.append(time.perf_counter() - start)
+
+        result = {
+            "seconds": min(times),
+            "mean": statistics.fmean(times),
+            "rounds": rounds,
+            "times": times,
+            **info,
+        }
+        self.results[name] = result
+        return result
+
+    def compare(self, name: str) -> str | None:
+        """Compares the result of a benchmark against its baseline.
+
+        Args:
+            name: The name of the benchmark.
+
+        Returns:
+            A description of the regression, or None if the benchmark did not regress or has no baseline.
+        """
+        baseline = self.baseline.get(name, None)
+        if baseline is None:
+            return None
+        seconds, baseline_seconds = self.results[name]["seconds"], baseline["seconds"]
+        limit = baseline_seconds * (1 + self.threshold)
+        if seconds > limit and seconds - baseline_seconds > self.min_difference:
+            return (
+                f"{name} took {seconds:.4f} s, {seconds / baseline_seconds - 1:.0%} slower than its baseline of "
+                f"{baseline_seconds:.4f} s, which exceeds the {self.threshold:.0%} threshold."
+            )
+        return None
+
+    def save(self, path: Path) -> None:
+        """Writes the results with a description of the machine as JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": RESULTS_VERSION,
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "machine": {
+                "platform": platform.platform(),
+                "python": platform.python_version(),
+                "cpus": os.cpu_count(),
+            },
+            "benchmarks": self.results,
+        }
+        with path.open("w") as file:
+            json.dump(data, file, indent=2, sort_keys=True)
+
+
+# Functions #
+def load_results(path: Path) -> dict[str, dict[str, Any]] | None:
+    """Loads the benchmark results from a JSON file written by a recorder.
+
+    Args:
+        path: The path to the results.
+
+    Returns:
+        The results keyed by benchmark name, or None if the file does not exist.
+    """
+    if not path.is_file():
+        return None
+    with path.open("r") as file:
+        data = json.load(file)
+    if data.get("version", None) != RESULTS_VERSION:
+        return None
+    return data["benchmarks"]
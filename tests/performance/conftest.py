@@ -0,0 +1,101 @@
+""" conftest.py
+Fixtures which time the performance benchmarks and generate the synthetic datasets they run on.
+"""
+# Imports #
+# Standard Libraries #
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+# Third-Party Packages #
+
+# Local Packages #
+from ..synthetictrees import create_dataset_tree, create_pia_tree
+from .benchmarking import BenchmarkRecorder, load_results
+
+
+# Definitions #
+# Functions #
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """Marks the benchmarks, deselecting them unless they were requested, and skips the largest unless requested.
+
+    The benchmarks are slow and their times depend on the machine, so they only run with --performance or when the
+    performance marker is selected with -m.
+    """
+    directory = Path(__file__).parent
+    benchmarks = [i for i in items if directory in i.path.parents]
+    for item in benchmarks:
+        item.add_marker(pytest.mark.performance)
+
+    if not (config.getoption("--performance") or "performance" in config.getoption("markexpr", "")):
+        config.hook.pytest_deselected(items=benchmarks)
+        items[:] = [i for i in items if directory not in i.path.parents]
+        return
+
+    if not config.getoption("--benchmark-large"):
+        skip = pytest.mark.skip(reason="Only runs with --benchmark-large.")
+        for item in items:
+            if "benchmark_large" in item.keywords:
+                item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def benchmark_recorder(request) -> Iterator[BenchmarkRecorder]:
+    """The recorder of every benchmark in the session, which writes the results when the session ends."""
+    config = request.config
+    baseline_path = Path(config.getoption("--benchmark-baseline"))
+    save_baseline = config.getoption("--benchmark-save-baseline")
+    recorder = BenchmarkRecorder(
+        baseline=None if save_baseline else load_results(baseline_path),
+        threshold=config.getoption("--benchmark-threshold"),
+    )
+    yield recorder
+    if recorder.results:
+        recorder.save(Path(config.getoption("--benchmark-json")))
+        if save_baseline:
+            recorder.save(baseline_path)
+
+
+@pytest.fixture
+def benchmark(request, benchmark_recorder) -> Callable[..., dict[str, Any]]:
+    """Times a function as the benchmark of the current test and fails the test if it regressed."""
+
+    def run(function: Callable[..., Any], setup: Callable[[], tuple] | None = None, rounds: int = 3, **info: Any):
+        result = benchmark_recorder.run(request.node.nodeid, function, setup=setup, rounds=rounds, **info)
+        regression = benchmark_recorder.compare(request.node.nodeid)
+        if regression is not None:
+            pytest.fail(regression)
+        return result
+
+    return run
+
+
+@pytest.fixture(scope="session")
+def dataset_trees(tmp_path_factory) -> Callable[[int], Path]:
+    """Gets synthetic datasets by their number of subjects, creating each once per session."""
+    trees = {}
+
+    def get(n_subjects: int) -> Path:
+        if n_subjects not in trees:
+            trees[n_subjects] = tmp_path_factory.mktemp("datasets") / f"synthetic{n_subjects}"
+            create_dataset_tree(trees[n_subjects], n_subjects)
+        return trees[n_subjects]
+
+    return get
+
+
+@pytest.fixture(scope="session")
+def pia_trees(tmp_path_factory) -> Callable[[int], tuple[Path, list[str]]]:
+    """Gets synthetic Pia source trees by their number of patients, creating each once per session."""
+    trees = {}
+
+    def get(n_patients: int) -> tuple[Path, list[str]]:
+        if n_patients not in trees:
+            root = tmp_path_factory.mktemp("pia")
+            trees[n_patients] = (root, create_pia_tree(root, n_patients))
+        return trees[n_patients]
+
+    return get
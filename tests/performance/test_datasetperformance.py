@@ -0,0 +1,97 @@
+""" test_datasetperformance.py
+Benchmarks of opening, loading, and exporting datasets.
+"""
+# Imports #
+# Standard Libraries #
+import shutil
+
+import pytest
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.datasets import Dataset
+from ucsfbids.loading import meta_info_cache
+
+from .benchmarking import SUBJECT_COUNTS
+
+
+# Definitions #
+# Functions #
+def cold_setup(*args):
+    """Creates a benchmark setup which clears the meta information cache, so each round reads the files again."""
+
+    def setup():
+        meta_info_cache.clear()
+        return args
+
+    return setup
+
+
+def export_rounds(n_subjects: int) -> int:
+    return 1 if n_subjects > 1000 else 3
+
+
+# Classes #
+@pytest.mark.parametrize("n_subjects", SUBJECT_COUNTS)
+class TestDatasetPerformance:
+    def test_open(self, benchmark, dataset_trees, n_subjects):
+        path = dataset_trees(n_subjects)
+        benchmark(Dataset, setup=cold_setup(path), subjects=n_subjects)
+
+    def test_open_lazy(self, benchmark, dataset_trees, n_subjects):
+        path = dataset_trees(n_subjects)
+
+        def open_lazy():
+            dataset = Dataset(path, lazy=True)
+            for subject in dataset.subjects.values():
+                subject.sessions
+
+        benchmark(open_lazy, setup=cold_setup(), subjects=n_subjects)
+
+    def test_open_index(self, benchmark, dataset_trees, n_subjects):
+        path = dataset_trees(n_subjects)
+        Dataset(path, load=False).open_index().close()
+        benchmark(lambda: Dataset(path, use_index=True).close_index(), subjects=n_subjects)
+
+    @pytest.mark.parametrize("jobs", [None, 8])
+    def test_load_subjects(self, benchmark, dataset_trees, n_subjects, jobs):
+        dataset = Dataset(dataset_trees(n_subjects), load=False)
+        benchmark(lambda: dataset.load_subjects(jobs=jobs), setup=cold_setup(), subjects=n_subjects, jobs=jobs)
+
+    @pytest.mark.parametrize("view", [False, True], ids=["copy", "view"])
+    @pytest.mark.parametrize("jobs", [None, 8])
+    def test_export(self, benchmark, dataset_trees, tmp_path, n_subjects, jobs, view):
+        dataset = Dataset(dataset_trees(n_subjects))
+        exporter = dataset.create_exporter("BIDS", view=view)
+        sub_name_map = {name: name for name in dataset.subjects}
+        export_path = tmp_path / "export"
+
+        def setup():
+            shutil.rmtree(export_path, ignore_errors=True)
+            export_path.mkdir()
+            return (export_path, "synthetic", sub_name_map, jobs)
+
+        rounds = export_rounds(n_subjects)
+        benchmark(exporter.execute_export, setup=setup, rounds=rounds, subjects=n_subjects, jobs=jobs, view=view)
+
+    def test_export_sync(self, benchmark, dataset_trees, tmp_path, n_subjects):
+        dataset = Dataset(dataset_trees(n_subjects))
+        exporter = dataset.create_exporter("BIDS", sync=True, prune=True)
+        sub_name_map = {name: name for name in dataset.subjects}
+        exporter.execute_export(tmp_path, "synthetic", sub_name_map)
+        benchmark(exporter.execute_export, setup=lambda: (tmp_path, "synthetic", sub_name_map), subjects=n_subjects)
+
+    @pytest.mark.parametrize("archive_name", ["synthetic.tar", "synthetic.tar.gz", "synthetic.zip"])
+    def test_export_archive(self, benchmark, dataset_trees, tmp_path, n_subjects, archive_name):
+        dataset = Dataset(dataset_trees(n_subjects))
+        exporter = dataset.create_exporter("BIDS")
+        sub_name_map = {name: name for name in dataset.subjects}
+        archive_path = tmp_path / archive_name
+
+        def setup():
+            archive_path.unlink(missing_ok=True)
+            return (archive_path, "synthetic", sub_name_map)
+
+        rounds = export_rounds(n_subjects)
+        benchmark(exporter.export_archive, setup=setup, rounds=rounds, subjects=n_subjects, archive=archive_name)
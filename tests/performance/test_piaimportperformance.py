@@ -0,0 +1,49 @@
+""" test_piaimportperformance.py
+Benchmarks of the Pia import pipeline against a synthetic Pia source tree.
+"""
+# Imports #
+# Standard Libraries #
+import shutil
+
+import pytest
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.datasets import Dataset
+from ucsfbids.datasets.importers.pia import DatasetPiaImporter
+
+from .benchmarking import SUBJECT_COUNTS
+
+
+# Definitions #
+# Functions #
+def import_rounds(n_subjects: int) -> int:
+    return 1 if n_subjects > 1000 else 3
+
+
+# Classes #
+@pytest.mark.parametrize("n_subjects", SUBJECT_COUNTS)
+class TestPiaImportPerformance:
+    @pytest.mark.parametrize(
+        "options",
+        [{}, {"jobs": 4}, {"modality_jobs": 3}, {"dry_run": True}],
+        ids=["serial", "jobs", "modality_jobs", "dry_run"],
+    )
+    def test_import(self, benchmark, pia_trees, tmp_path, n_subjects, options):
+        src_root, patients = pia_trees(n_subjects)
+        subjects = [f"EC{i:04d}" for i in range(1, n_subjects + 1)]
+        output_path = tmp_path / "output"
+
+        def setup():
+            shutil.rmtree(output_path, ignore_errors=True)
+            output_path.mkdir()
+            dataset = Dataset(parent_path=output_path, name="synthetic", mode="w", create=True, load=False)
+            dataset.add_importer("Pia", DatasetPiaImporter, overwrite=True)
+            return (dataset,)
+
+        def import_dataset(dataset):
+            importer = dataset.create_importer("Pia", src_root, subjects=subjects)
+            return importer.execute_import(source_patients=patients, **options)
+
+        benchmark(import_dataset, setup=setup, rounds=import_rounds(n_subjects), subjects=n_subjects, **options)
@@ -0,0 +1,177 @@
+""" synthetictrees.py
+Generates synthetic UCSF-BIDS datasets and Pia source trees for the unit tests and the performance benchmarks.
+"""
+# Imports #
+# Standard Libraries #
+import gzip
+import json
+import struct
+from pathlib import Path
+
+# Third-Party Packages #
+import numpy as np
+from scipy.io import savemat
+
+# Local Packages #
+from ucsfbids.modalities import CT, IEEG, Anatomy
+from ucsfbids.sessions import Session
+from ucsfbids.subjects import Subject
+from ucsfbids.transfer.mghconversion import MGH_HEADER_FORMAT, MGH_HEADER_SIZE
+
+
+# Definitions #
+# Constants #
+SESSION_NAME = "clinicalintracranial"
+PIA_DIRECTORY = Path("data_store2/imaging/subjects")
+N_ELECTRODES = 256
+VOLUME_SHAPE = (32, 32, 32)
+CT_SIZE = 64 * 1024
+
+# A sidecar with the fields and size of a dcm2niix sidecar of a clinical scan.
+SIDECAR = {
+    "Modality": "MR",
+    "MagneticFieldStrength": 3,
+    "ImagingFrequency": 127.764,
+    "Manufacturer": "GE",
+    "InternalPulseSequenceName": "EFGRE3D",
+    "ManufacturersModelName": "DISCOVERY MR750",
+    "InstitutionName": "UCSF",
+    "InstitutionalDepartmentName": "Radiology",
+    "InstitutionAddress": "505 Parnassus Ave, San Francisco, CA",
+    "DeviceSerialNumber": "000000000000",
+    "StationName": "MR750",
+    "BodyPartExamined": "HEAD",
+    "PatientPosition": "HFS",
+    "ProcedureStepDescription": "MRI BRAIN WITH AND WITHOUT CONTRAST",
+    "SoftwareVersions": "27\\LX\\MR Software release:DV26.0_R03_1831.b",
+    "MRAcquisitionType": "3D",
+    "SeriesDescription": "Ax T1 BRAVO Post",
+    "ProtocolName": "BRAIN ROUTINE WITH CONTRAST",
+    "ScanningSequence": "GR",
+    "SequenceVariant": "SS_SK",
+    "ScanOptions": "FAST_GEMS\\EDR_GEMS\\FILTERED_GEMS\\ACC_GEMS",
+    "PulseSequenceName": "efgre3d",
+    "ImageType": ["ORIGINAL", "PRIMARY", "OTHER"],
+    "SeriesNumber": 8,
+    "AcquisitionTime": "10:41:39.000000",
+    "AcquisitionNumber": 1,
+    "SliceThickness": 1,
+    "SpacingBetweenSlices": 1,
+    "SAR": 0.0637561,
+    "EchoTime": 0.003104,
+    "RepetitionTime": 0.008232,
+    "InversionTime": 0.45,
+    "FlipAngle": 12,
+    "PhaseEncodingPolarityGE": "Unflipped",
+    "CoilString": "8HRBRAIN",
+    "PercentPhaseFOV": 100,
+    "PercentSampling": 100,
+    "AcquisitionMatrixPE": 256,
+    "ReconMatrixPE": 256,
+    "PixelBandwidth": 244.141,
+    "PhaseEncodingAxis": "i",
+    "ImageOrientationPatientDICOM": [1, -0, 0, -0, 1, 0],
+    "InPlanePhaseEncodingDirectionDICOM": "ROW",
+    "ConversionSoftware": "dcm2niix",
+    "ConversionSoftwareVersion": "v1.0.20211006",
+    "SliceTiming": [round(0.0322 * i, 4) for i in range(64)],
+}
+
+
+# Functions #
+def write_json(path: Path, data: dict) -> None:
+    with path.open("w") as file:
+        json.dump(data, file)
+
+
+def create_electrodes_tsv(path: Path, rng: np.random.Generator, n_electrodes: int = N_ELECTRODES) -> None:
+    """Writes an electrode table with the columns and precision of the tables the Pia importer writes."""
+    xyz = rng.normal(size=(n_electrodes, 3)) * 30
+    lines = ["name\tx\ty\tz\tsize\tmaterial\tmanufacturer\tgroup\themisphere\ttype\timpedance"]
+    for i, (x, y, z) in enumerate(xyz):
+        hemisphere = "r" if x > 0 else "l"
+        lines.append(f"G{i}\t{x:.17g}\t{y:.17g}\t{z:.17g}\tn/a\tn/a\tn/a\tGrid{i // 8}\t{hemisphere}\tn/a\tn/a")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def create_subject(root: Path, name: str, rng: np.random.Generator) -> None:
+    """Writes a subject with one session of anat, ct, and ieeg modalities."""
+    subject_path = root / f"sub-{name}"
+    session_path = subject_path / f"ses-{SESSION_NAME}"
+    prefix = f"sub-{name}_ses-{SESSION_NAME}"
+    anat_path, ct_path, ieeg_path = session_path / "anat", session_path / "ct", session_path / "ieeg"
+    for path in (anat_path, ct_path, ieeg_path):
+        path.mkdir(parents=True)
+
+    write_json(subject_path / f"sub-{name}_meta.json", Subject.default_meta_info)
+    write_json(session_path / f"{prefix}_meta.json", Session.default_meta_info)
+
+    write_json(anat_path / f"{prefix}_anat-meta.json", Anatomy.default_meta_info)
+    write_json(anat_path / f"{prefix}_T1w.json", SIDECAR)
+    (anat_path / f"{prefix}_T1w.nii.gz").write_bytes(gzip.compress(bytes(CT_SIZE), compresslevel=1))
+
+    write_json(ct_path / f"{prefix}_ct-meta.json", CT.default_meta_info)
+    write_json(ct_path / f"{prefix}_CT.json", {**SIDECAR, "Modality": "CT"})
+    (ct_path / f"{prefix}_CT.nii").write_bytes(bytes(CT_SIZE))
+
+    write_json(ieeg_path / f"{prefix}_ieeg-meta.json", IEEG.default_meta_info)
+    write_json(ieeg_path / f"{prefix}_coordsystem.json", {"iEEGCoordinateSystem": "ACPC", "iEEGCoordinateUnits": "mm"})
+    create_electrodes_tsv(ieeg_path / f"{prefix}_electrodes.tsv", rng)
+
+
+def create_dataset_tree(root: Path, n_subjects: int, seed: int = 0) -> list[str]:
+    """Writes a UCSF-BIDS dataset with a number of subjects.
+
+    Args:
+        root: The path to the dataset directory to create.
+        n_subjects: The number of subjects to create.
+        seed: The seed of the electrode coordinates.
+
+    Returns:
+        The names of the subjects.
+    """
+    rng = np.random.default_rng(seed)
+    root.mkdir(parents=True)
+    names = [f"EC{i:04d}" for i in range(1, n_subjects + 1)]
+    write_json(root / "dataset_description.json", {"Name": "Synthetic", "BIDSVersion": "1.6.0", "DatasetType": "raw"})
+    (root / "participants.tsv").write_text("participant_id\n" + "".join(f"{n}\n" for n in names))
+    for name in names:
+        create_subject(root, name, rng)
+    return names
+
+
+def create_mgz(path: Path, shape: tuple[int, int, int] = VOLUME_SHAPE) -> None:
+    """Writes a conformed unsigned byte MGZ volume."""
+    header = struct.pack(MGH_HEADER_FORMAT, 1, *shape, 1, 0, 0, 1, 1.0, 1.0, 1.0, -1, 0, 0, 0, 0, -1, 0, 1, 0, 0, 0, 0)
+    volume = np.arange(np.prod(shape), dtype=np.uint8).tobytes()
+    path.write_bytes(gzip.compress(header.ljust(MGH_HEADER_SIZE, b"\0") + volume, compresslevel=1))
+
+
+def create_pia_tree(root: Path, n_patients: int, seed: int = 0) -> list[str]:
+    """Writes a Pia source tree with the imaging, CT, and electrodes of a number of patients.
+
+    Args:
+        root: The path to the Pia root directory to create.
+        n_patients: The number of patients to create.
+        seed: The seed of the electrode coordinates.
+
+    Returns:
+        The names of the patients.
+    """
+    rng = np.random.default_rng(seed)
+    patients = [f"EC{i}" for i in range(1, n_patients + 1)]
+    labels = np.empty((N_ELECTRODES, 4), dtype=object)
+    for i in range(N_ELECTRODES):
+        labels[i] = [f"G{i}", f"Grid{i}", f"Grid{i // 8}", "grid"]
+
+    for patient in patients:
+        base = root / PIA_DIRECTORY / patient
+        for directory in ("mri", "acpc", "CT", "elecs"):
+            (base / directory).mkdir(parents=True)
+        create_mgz(base / "mri/brain.mgz")
+        write_json(base / "acpc/T1.json", SIDECAR)
+        (base / "CT/CT.nii").write_bytes(bytes(CT_SIZE))
+        write_json(base / "CT/CT.json", {**SIDECAR, "Modality": "CT"})
+        xyz = rng.normal(size=(N_ELECTRODES, 3)) * 30
+        savemat(base / "elecs/clinical_elecs_all.mat", {"elecmatrix": xyz, "eleclabels": labels})
+    return patients
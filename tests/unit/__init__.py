@@ -0,0 +1 @@
+"""Unit tests of the loading, import, transfer, and export components."""
@@ -0,0 +1,41 @@
+""" conftest.py
+Fixtures which create small synthetic datasets and Pia source trees for the unit tests.
+"""
+# Imports #
+# Standard Libraries #
+from pathlib import Path
+
+import pytest
+
+# Third-Party Packages #
+
+# Local Packages #
+from ..synthetictrees import create_dataset_tree, create_pia_tree
+
+
+# Definitions #
+# Constants #
+N_SUBJECTS = 3
+
+
+# Functions #
+@pytest.fixture
+def dataset_path(tmp_path) -> Path:
+    """A synthetic dataset with a few subjects, each with one session of anat, ct, and ieeg modalities."""
+    path = tmp_path / "dataset"
+    create_dataset_tree(path, N_SUBJECTS)
+    return path
+
+
+@pytest.fixture
+def subject_names(dataset_path) -> list[str]:
+    """The names of the subjects of the synthetic dataset."""
+    return sorted(p.name[4:] for p in dataset_path.glob("sub-*"))
+
+
+@pytest.fixture
+def pia_source(tmp_path) -> tuple[Path, list[str]]:
+    """A synthetic Pia source tree with a few patients and the names of the patients."""
+    root = tmp_path / "pia"
+    root.mkdir()
+    return root, create_pia_tree(root, N_SUBJECTS)
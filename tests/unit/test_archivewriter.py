@@ -0,0 +1,193 @@
+""" test_archivewriter.py
+Tests of the streaming archive writer and of exporting a dataset directly into archives.
+"""
+# Imports #
+# Standard Libraries #
+import importlib
+import os
+import sys
+import tarfile
+import threading
+import types
+import zipfile
+from pathlib import Path
+
+import pytest
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.datasets import Dataset
+from ucsfbids.subjects.exporters import SubjectBIDSExporter
+from ucsfbids.transfer import ArchiveWriter, archive_format
+
+
+# Definitions #
+# Constants #
+FORMATS = ["tar", "tar.gz", "zip"]
+
+
+# Functions #
+def read_archive(path: Path) -> dict[str, bytes]:
+    """Reads the contents of every file in an archive keyed by their names."""
+    if path.name.endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            return {n: archive.read(n) for n in archive.namelist()}
+    with tarfile.open(path) as archive:
+        return {m.name: archive.extractfile(m).read() for m in archive.getmembers() if m.isfile()}
+
+
+def directory_files(path: Path) -> dict[str, bytes]:
+    return {p.relative_to(path.parent).as_posix(): p.read_bytes() for p in path.rglob("*") if p.is_file()}
+
+
+# Classes #
+class TestArchiveFormat:
+    @pytest.mark.parametrize(
+        "name, expected",
+        [("a.tar", "tar"), ("a.tar.gz", "tar.gz"), ("a.tgz", "tar.gz"), ("a.zip", "zip"), ("a.b.tar", "tar")],
+    )
+    def test_suffixes(self, name, expected):
+        assert archive_format(name) == expected
+
+    @pytest.mark.parametrize("name", ["a", "a.gz", "a.rar"])
+    def test_unsupported(self, name):
+        with pytest.raises(ValueError, match="supported archive format"):
+            archive_format(name)
+
+
+class TestArchiveWriter:
+    @pytest.mark.parametrize("format_", FORMATS)
+    def test_round_trip(self, tmp_path, format_):
+        source = tmp_path / "source.bin"
+        source.write_bytes(os.urandom(10_000))
+        source.chmod(0o640)
+        path = tmp_path / f"archive.{format_}"
+        with ArchiveWriter(path) as archive:
+            archive.add_file(source, Path("dataset") / "sub-1" / "file.bin")
+            archive.add_bytes(b"generated", "dataset/generated.txt", mtime=0.0)
+            archive.add_file(source, "dataset/" + "long" * 40 + ".bin")
+        assert archive.volumes == [path]
+        assert read_archive(path) == {
+            "dataset/sub-1/file.bin": source.read_bytes(),
+            "dataset/generated.txt": b"generated",
+            "dataset/" + "long" * 40 + ".bin": source.read_bytes(),
+        }
+
+    def test_tar_metadata(self, tmp_path):
+        source = tmp_path / "source.bin"
+        source.write_bytes(b"data")
+        source.chmod(0o640)
+        os.utime(source, (1_000_000_000, 1_000_000_000))
+        with ArchiveWriter(tmp_path / "archive.tar") as archive:
+            archive.add_file(source, "file.bin")
+        with tarfile.open(tmp_path / "archive.tar") as archive:
+            member = archive.getmember("file.bin")
+        assert (member.mode, int(member.mtime)) == (0o640, 1_000_000_000)
+
+    def test_zip_times_before_1980(self, tmp_path):
+        source = tmp_path / "source.bin"
+        source.write_bytes(b"data")
+        os.utime(source, (0, 0))
+        with ArchiveWriter(tmp_path / "archive.zip") as archive:
+            archive.add_file(source, "file.bin")
+        with zipfile.ZipFile(tmp_path / "archive.zip") as archive:
+            assert archive.getinfo("file.bin").date_time == (1980, 1, 1, 0, 0, 0)
+
+    def test_explicit_format(self, tmp_path):
+        with ArchiveWriter(tmp_path / "archive.bin", format="zip") as archive:
+            archive.add_bytes(b"data", "file.txt")
+        assert zipfile.is_zipfile(tmp_path / "archive.bin")
+
+    @pytest.mark.parametrize("format_", FORMATS)
+    def test_volumes(self, tmp_path, format_):
+        volume_size = 64 * 1024
+        files = {f"dataset/file{i}.bin": os.urandom(20_000) for i in range(10)}
+        with ArchiveWriter(tmp_path / f"dataset.{format_}", volume_size=volume_size) as archive:
+            for name, data in files.items():
+                archive.add_bytes(data, name)
+
+        names = [f"dataset.part{i:03d}.{format_}" for i in range(1, len(archive.volumes) + 1)]
+        assert len(names) > 1 and [p.name for p in archive.volumes] == names
+        assert not (tmp_path / f"dataset.{format_}").exists()
+        contents = {}
+        for volume in archive.volumes:
+            assert volume.stat().st_size <= volume_size
+            contents.update(read_archive(volume))
+        assert contents == files
+
+    def test_entry_larger_than_volume(self, tmp_path):
+        with ArchiveWriter(tmp_path / "dataset.tar", volume_size=1024) as archive:
+            archive.add_bytes(b"small", "small.txt")
+            archive.add_bytes(bytes(10_000), "large.bin")
+            archive.add_bytes(b"small", "after.txt")
+        assert [list(read_archive(v)) for v in archive.volumes] == [["small.txt"], ["large.bin"], ["after.txt"]]
+
+    def test_concurrent_writes(self, tmp_path):
+        with ArchiveWriter(tmp_path / "archive.tar.gz") as archive:
+            threads = [
+                threading.Thread(target=archive.add_bytes, args=(bytes([i]) * 50_000, f"file{i}.bin"))
+                for i in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert read_archive(tmp_path / "archive.tar.gz") == {f"file{i}.bin": bytes([i]) * 50_000 for i in range(8)}
+
+
+class TestArchiveExport:
+    @pytest.mark.parametrize("format_", FORMATS)
+    def test_matches_directory_export(self, dataset_path, tmp_path, format_):
+        dataset = Dataset(dataset_path)
+        sub_name_map = {name: f"X{name}" for name in dataset.subjects}
+        dataset.create_exporter("BIDS").execute_export(tmp_path, "exported", sub_name_map)
+
+        exporter = dataset.create_exporter("BIDS")
+        volumes, results = exporter.export_archive(tmp_path / f"exported.{format_}", "exported", sub_name_map, jobs=2)
+        assert volumes == [tmp_path / f"exported.{format_}"]
+        assert all(r.succeeded for r in results)
+        assert read_archive(volumes[0]) == directory_files(tmp_path / "exported")
+        assert exporter.archive is None
+
+    def test_volumes(self, dataset_path, tmp_path):
+        dataset = Dataset(dataset_path)
+        sub_name_map = {name: name for name in dataset.subjects}
+        exporter = dataset.create_exporter("BIDS")
+        volumes, _ = exporter.export_archive(tmp_path / "exported.zip", "exported", sub_name_map, volume_size=100_000)
+        assert len(volumes) > 1
+        contents = {}
+        for volume in volumes:
+            contents.update(read_archive(volume))
+        dataset.create_exporter("BIDS").execute_export(tmp_path, "exported", sub_name_map)
+        assert contents == directory_files(tmp_path / "exported")
+
+
+class TestUPENNExportModes:
+    @pytest.fixture
+    def upenn_exporter(self, monkeypatch):
+        """The UPENN dataset exporter with its subject exporter, which needs xltektools, replaced by the BIDS one."""
+        stub = types.ModuleType("ucsfbids.subjects.exporters.subjectupennexporter")
+        stub.SubjectUPENNExporter = SubjectBIDSExporter
+        monkeypatch.setitem(sys.modules, stub.__name__, stub)
+        name = "ucsfbids.datasets.exporters.datasetupennexporter"
+        monkeypatch.delitem(sys.modules, name, raising=False)
+        module = importlib.import_module(name)
+        monkeypatch.setitem(sys.modules, name, module)
+        return module.DatasetUPENNExporter
+
+    @pytest.mark.parametrize("mode", ["view", "sync", "prune", "record_manifest"])
+    def test_rejects_modes(self, upenn_exporter, dataset_path, tmp_path, mode):
+        dataset = Dataset(dataset_path)
+        exporter = upenn_exporter(dataset=dataset, **{mode: True})
+        with pytest.raises(ValueError, match=mode):
+            exporter.execute_export(tmp_path, "exported", {name: name for name in dataset.subjects})
+        assert not (tmp_path / "exported").exists()
+
+    def test_rejects_archive(self, upenn_exporter, dataset_path, tmp_path):
+        exporter = upenn_exporter(dataset=Dataset(dataset_path))
+        with pytest.raises(ValueError, match="archive"):
+            exporter.export_archive(tmp_path / "exported.tar", "exported", {})
+        with pytest.raises(ValueError, match="archive, view"):
+            upenn_exporter(archive=ArchiveWriter(tmp_path / "exported.tar"), view=True).check_modes()
+        assert not (tmp_path / "exported.tar").exists()
@@ -0,0 +1,84 @@
+""" test_benchmarking.py
+Tests of the benchmark recorder and of deselecting the performance benchmarks unless they are requested.
+"""
+# Imports #
+# Standard Libraries #
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Third-Party Packages #
+
+# Local Packages #
+from ..performance.benchmarking import RESULTS_VERSION, BenchmarkRecorder, load_results
+
+
+# Definitions #
+# Constants #
+ROOT = Path(__file__).parents[2]
+
+
+# Functions #
+def collect(*args: str) -> str:
+    """Collects the performance benchmarks in a separate pytest session and returns its output."""
+    command = [sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider", *args]
+    return subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=False).stdout
+
+
+# Classes #
+class TestBenchmarkRecorder:
+    def test_run(self):
+        calls = []
+        recorder = BenchmarkRecorder()
+        result = recorder.run("name", calls.append, setup=lambda: (len(calls),), rounds=4, subjects=10)
+        assert calls == [0, 1, 2, 3]
+        assert result["rounds"] == 4 and len(result["times"]) == 4
+        assert result["seconds"] == min(result["times"]) <= result["mean"]
+        assert result["subjects"] == 10
+        assert recorder.results == {"name": result}
+
+    @pytest.mark.parametrize(
+        "seconds, baseline, regressed",
+        [(1.3, 1.0, True), (1.2, 1.0, False), (0.5, 1.0, False), (0.012, 0.001, True), (0.005, 0.001, False)],
+    )
+    def test_compare(self, seconds, baseline, regressed):
+        recorder = BenchmarkRecorder(baseline={"name": {"seconds": baseline}}, threshold=0.25, min_difference=0.01)
+        recorder.results["name"] = {"seconds": seconds}
+        regression = recorder.compare("name")
+        assert (regression is not None) == regressed
+        if regressed:
+            assert regression.startswith("name took") and "25% threshold" in regression
+
+    def test_compare_without_baseline(self):
+        recorder = BenchmarkRecorder()
+        recorder.run("name", lambda: None, rounds=1)
+        assert recorder.compare("name") is None
+
+    def test_save_and_load(self, tmp_path):
+        recorder = BenchmarkRecorder()
+        recorder.run("name", lambda: None, rounds=2)
+        path = tmp_path / "results" / "results.json"
+        recorder.save(path)
+        data = json.loads(path.read_text())
+        assert data["version"] == RESULTS_VERSION and data["machine"]["cpus"]
+        assert load_results(path) == recorder.results
+
+    def test_load_missing_or_outdated(self, tmp_path):
+        assert load_results(tmp_path / "missing.json") is None
+        (tmp_path / "old.json").write_text(json.dumps({"version": RESULTS_VERSION + 1, "benchmarks": {}}))
+        assert load_results(tmp_path / "old.json") is None
+
+
+class TestBenchmarkSelection:
+    def test_deselected_by_default(self):
+        output = collect("tests/performance")
+        assert "test_datasetperformance.py" not in output
+        assert "deselected" in output
+
+    @pytest.mark.parametrize("options", [["--performance"], ["-m", "performance"]], ids=["option", "marker"])
+    def test_selected_on_request(self, options):
+        output = collect("tests/performance/test_datasetperformance.py", *options)
+        assert "test_datasetperformance.py::TestDatasetPerformance::test_open" in output
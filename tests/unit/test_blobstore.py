@@ -0,0 +1,145 @@
+""" test_blobstore.py
+Tests of the content-addressed store which deduplicates imported and exported files.
+"""
+# Imports #
+# Standard Libraries #
+import os
+import pickle
+
+import pytest
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.datasets import Dataset
+from ucsfbids.transfer import BlobStore, hash_file
+from ucsfbids.transfer.copyengine import HARDLINK
+
+from .test_datasetpiaimporter import import_dataset
+
+
+# Definitions #
+# Functions #
+def blob_count(store: BlobStore) -> int:
+    return sum(1 for p in (store.path / "objects").rglob("*") if p.is_file() and not p.name.startswith(".tmp-"))
+
+
+def links_by_hardlink(store: BlobStore, path) -> bool:
+    """Checks if the store links its blobs into a directory by hardlinks rather than by reflinks or copies."""
+    (path / "probe").write_bytes(b"probe")
+    hash_ = store.add(path / "probe")
+    return store.link(hash_, path / "probe.out").strategy == HARDLINK
+
+
+# Classes #
+class TestBlobStore:
+    def test_store_and_link(self, tmp_path):
+        source = tmp_path / "source"
+        source.write_bytes(b"data")
+        source.chmod(0o644)
+        store = BlobStore(tmp_path / "store")
+        result = store.store(source, tmp_path / "target")
+
+        assert result.hash == hash_file(source, store.algorithm)
+        assert store.contains(result.hash)
+        assert (tmp_path / "target").read_bytes() == b"data"
+        assert store.blob_path(result.hash).stat().st_mode & 0o222 == 0
+        if result.strategy == HARDLINK:
+            assert os.path.samefile(tmp_path / "target", store.blob_path(result.hash))
+        else:
+            assert (tmp_path / "target").stat().st_mode & 0o777 == 0o644
+
+    def test_identical_files_share_a_blob(self, tmp_path):
+        store = BlobStore(tmp_path / "store")
+        for name, data in (("a", b"same"), ("b", b"same"), ("c", b"other")):
+            (tmp_path / name).write_bytes(data)
+            store.store(tmp_path / name, tmp_path / f"{name}.out")
+        assert blob_count(store) == 2
+        if links_by_hardlink(store, tmp_path):
+            assert os.path.samefile(tmp_path / "a.out", tmp_path / "b.out")
+        assert [(tmp_path / f"{n}.out").read_bytes() for n in "abc"] == [b"same", b"same", b"other"]
+
+    def test_lookup_skips_unchanged_sources(self, tmp_path, monkeypatch):
+        source = tmp_path / "source"
+        source.write_bytes(b"data")
+        store = BlobStore(tmp_path / "store", algorithm="md5")
+        assert store.lookup(source) is None
+        hash_ = store.add(source)
+        assert store.lookup(source) == hash_
+
+        def copy(*args, **kwargs):
+            raise AssertionError("An unchanged source was read again.")
+
+        monkeypatch.setattr(store.engine, "copy", copy)
+        assert store.add(source) == hash_
+
+    def test_changed_source_is_stored_again(self, tmp_path):
+        source = tmp_path / "source"
+        source.write_bytes(b"data")
+        store = BlobStore(tmp_path / "store")
+        first = store.add(source)
+        source.write_bytes(b"changed")
+        assert store.lookup(source) is None
+        assert store.add(source) != first
+        assert blob_count(store) == 2
+
+    def test_missing_blob_is_stored_again(self, tmp_path):
+        source = tmp_path / "source"
+        source.write_bytes(b"data")
+        store = BlobStore(tmp_path / "store")
+        hash_ = store.add(source)
+        store.blob_path(hash_).unlink()
+        assert store.lookup(source) is None
+        assert store.add(source) == hash_ and store.contains(hash_)
+
+    def test_link_replaces_destination(self, tmp_path):
+        (tmp_path / "source").write_bytes(b"data")
+        (tmp_path / "target").write_bytes(b"old")
+        store = BlobStore(tmp_path / "store")
+        store.link(store.add(tmp_path / "source"), tmp_path / "target")
+        assert (tmp_path / "target").read_bytes() == b"data"
+        assert not list((tmp_path / "store").rglob(".tmp-*"))
+
+    def test_missing_source(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            BlobStore(tmp_path / "store").add(tmp_path / "missing")
+
+    def test_pickle(self, tmp_path):
+        store = pickle.loads(pickle.dumps(BlobStore(tmp_path / "store", algorithm="md5")))
+        assert (store.path, store.algorithm) == (tmp_path / "store", "md5")
+
+
+class TestDeduplication:
+    def test_deduplicated_import(self, pia_source, tmp_path):
+        src_root, patients = pia_source
+        import_dataset(tmp_path, src_root, patients, deduplicate=True)
+        store = BlobStore(tmp_path / "imported" / BlobStore.default_directory)
+
+        # The synthetic patients have identical CT volumes, which are copied without commands and so share one blob.
+        ct_paths = sorted((tmp_path / "imported").glob("sub-*/ses-*/ct/*_CT.nii"))
+        assert len(ct_paths) == len(patients)
+        assert blob_count(store) == 1
+        if links_by_hardlink(store, tmp_path):
+            blob_path = store.blob_path(hash_file(ct_paths[0], store.algorithm))
+            assert all(os.path.samefile(p, blob_path) for p in ct_paths)
+
+    def test_shared_store(self, pia_source, tmp_path):
+        src_root, patients = pia_source
+        store = BlobStore(tmp_path / "store")
+        for name in ("first", "second"):
+            (tmp_path / name).mkdir()
+            import_dataset(tmp_path / name, src_root, patients, blob_store=store)
+        first = sorted(p.relative_to(tmp_path / "first") for p in (tmp_path / "first").rglob("*.nii*"))
+        second = sorted(p.relative_to(tmp_path / "second") for p in (tmp_path / "second").rglob("*.nii*"))
+        assert first == second and first
+        assert blob_count(store) == 1
+        assert not (tmp_path / "first" / "imported" / BlobStore.default_directory).exists()
+
+    def test_deduplicated_export(self, dataset_path, tmp_path):
+        dataset = Dataset(dataset_path)
+        store = BlobStore(tmp_path / "store")
+        exporter = dataset.create_exporter("BIDS", blob_store=store)
+        exporter.execute_export(tmp_path, "exported", {name: name for name in dataset.subjects})
+        exported = [p for p in (tmp_path / "exported").glob("sub-*/ses-*/*/*") if p.is_file()]
+        assert exported
+        assert all(store.contains(hash_file(p, store.algorithm)) for p in exported)
@@ -0,0 +1,159 @@
+""" test_commandpool.py
+Tests of running external commands in a bounded background pool.
+"""
+# Imports #
+# Standard Libraries #
+import pickle
+import sys
+import threading
+import time
+
+import pytest
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.importspec import FileSpec
+from ucsfbids.modalities.importers.modalityimporter import ModalityImporter
+from ucsfbids.transfer import CommandError, CommandPool, CommandResult, describe_results, run_command, run_commands
+
+
+# Definitions #
+# Constants #
+PYTHON = sys.executable
+
+
+# Classes #
+class TestRunCommand:
+    def test_captures_output(self):
+        result = run_command([PYTHON, "-c", "import sys; print('out'); print('err', file=sys.stderr)"])
+        assert result.returncode == 0
+        assert (result.stdout.strip(), result.stderr.strip()) == ("out", "err")
+
+    def test_timeout(self):
+        result = run_command([PYTHON, "-c", "import time; time.sleep(10)"], timeout=0.2)
+        assert result.returncode is None
+        assert "Timed out" in result.stderr
+
+    def test_missing_command(self):
+        result = run_command(["ucsfbids-missing-command"])
+        assert result.returncode is None
+        assert result.stderr
+
+    def test_stops_at_first_failure(self):
+        results = run_commands([[PYTHON, "-c", "pass"], [PYTHON, "-c", "exit(3)"], [PYTHON, "-c", "pass"]])
+        assert [r.returncode for r in results] == [0, 3]
+
+    def test_describe_results(self):
+        results = [CommandResult(["ok"], 0), CommandResult(["bad", "arg"], 2, "", "message\n")]
+        assert describe_results(results) == "bad arg failed with return code 2.\nmessage"
+        assert describe_results([CommandResult(["quiet"], 1)]) == "quiet failed with return code 1."
+
+
+class TestCommandPool:
+    def test_runs_in_background(self):
+        pool = CommandPool(max_workers=2, timeout=30)
+        try:
+            futures = [pool.submit([[PYTHON, "-c", f"print({i})"]]) for i in range(4)]
+            assert [f.result()[0].stdout.strip() for f in futures] == ["0", "1", "2", "3"]
+            pool.wait()
+        finally:
+            pool.shutdown()
+
+    def test_bounded_workers(self):
+        pool = CommandPool(max_workers=2)
+        running, peak, lock = [0], [0], threading.Lock()
+
+        def callback(results):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+        try:
+            for _ in range(6):
+                pool.submit([[PYTHON, "-c", "pass"]], callback=callback)
+            pool.wait()
+        finally:
+            pool.shutdown()
+        assert peak[0] == 2
+
+    def test_wait_raises_callback_error(self):
+        pool = CommandPool(max_workers=2)
+
+        def callback(results):
+            raise CommandError("failed", results)
+
+        try:
+            pool.submit([[PYTHON, "-c", "pass"]], callback=callback)
+            with pytest.raises(CommandError, match="failed"):
+                pool.wait()
+            pool.wait()
+        finally:
+            pool.shutdown()
+
+    def test_wait_aggregates_errors(self):
+        pool = CommandPool(max_workers=2)
+
+        def callback(results):
+            raise ValueError(results[0].args[-1])
+
+        try:
+            pool.submit([[PYTHON, "-c", "pass", "first"]], callback=callback)
+            pool.submit([[PYTHON, "-c", "pass", "second"]], callback=callback)
+            with pytest.raises(RuntimeError, match="2 background commands failed") as error:
+                pool.wait()
+        finally:
+            pool.shutdown()
+        assert "first" in str(error.value) and "second" in str(error.value)
+        assert isinstance(error.value.__cause__, ValueError)
+
+    def test_pickle(self):
+        pool = CommandPool(max_workers=3, timeout=5)
+        pool.submit([[PYTHON, "-c", "pass"]])
+        copy = pickle.loads(pickle.dumps(pool))
+        pool.shutdown()
+        assert (copy.max_workers, copy.timeout) == (3, 5)
+        try:
+            assert copy.submit([[PYTHON, "-c", "pass"]]).result()[0].returncode == 0
+        finally:
+            copy.shutdown()
+
+
+class TestImportCommands:
+    @pytest.mark.parametrize("pooled", [False, True])
+    def test_post_command(self, tmp_path, pooled):
+        source, target = tmp_path / "source.txt", tmp_path / "target.txt"
+        source.write_text("data")
+        script = tmp_path / "append.py"
+        script.write_text("import sys\nwith open(sys.argv[1], 'a') as f:\n    f.write(' posted')\n")
+        (tmp_path / "append").write_text(f"#!/bin/sh\nexec {PYTHON} {script} \"$@\"\n")
+        (tmp_path / "append").chmod(0o755)
+
+        pool = CommandPool(max_workers=1) if pooled else None
+        importer = ModalityImporter(command_pool=pool)
+        importer._import_file(FileSpec("x", ".txt", [], post_command=str(tmp_path / "append")), source, target)
+        if pool is not None:
+            pool.wait()
+            pool.shutdown()
+        assert target.read_text() == "data posted"
+        assert not list(tmp_path.glob(".tmp-*"))
+
+    @pytest.mark.parametrize("pooled", [False, True])
+    def test_failed_command_raises(self, tmp_path, pooled):
+        source, target = tmp_path / "source.txt", tmp_path / "target.txt"
+        source.write_text("data")
+
+        pool = CommandPool(max_workers=1) if pooled else None
+        importer = ModalityImporter(command_pool=pool)
+        with pytest.raises(CommandError, match="return code 1") as error:
+            importer._import_file(FileSpec("x", ".txt", [], copy_command="false"), source, target)
+            if pool is not None:
+                pool.wait()
+        if pool is not None:
+            pool.shutdown()
+        assert error.value.results[-1].returncode == 1
+        assert not target.exists()
+        assert not list(tmp_path.glob(".tmp-*"))
@@ -0,0 +1,147 @@
+""" test_copyengine.py
+Tests of the copy engine and its reflink, hardlink, symlink, kernel, and buffered strategies.
+"""
+# Imports #
+# Standard Libraries #
+import errno
+import os
+import shutil
+
+import pytest
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.transfer import CopyEngine, hash_file
+from ucsfbids.transfer import copyengine
+from ucsfbids.transfer.copyengine import BUFFERED, HARDLINK, KERNEL, REFLINK, SYMLINK
+
+
+# Definitions #
+# Constants #
+DATA = os.urandom(100_000)
+
+
+# Functions #
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "source.bin"
+    path.write_bytes(DATA)
+    path.chmod(0o640)
+    return path
+
+
+# Classes #
+class ShortWriter:
+    """A raw file which writes at most a few bytes of each write, like a raw write interrupted by a signal."""
+
+    def __init__(self, file, limit: int = 1000) -> None:
+        self.file = file
+        self.limit = limit
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.file.close()
+
+    def write(self, data) -> int:
+        return self.file.write(data[: self.limit])
+
+
+class TestCopyEngine:
+    @pytest.mark.parametrize("strategy", [KERNEL, BUFFERED])
+    def test_copy_strategy(self, source, tmp_path, strategy):
+        destination = tmp_path / "copy.bin"
+        destination.write_bytes(b"replaced")
+        result = CopyEngine(strategies=(strategy,), buffer_size=4096).copy(source, destination)
+        assert result.strategy == strategy and result.hash is None
+        assert destination.read_bytes() == DATA
+        assert destination.stat().st_mode & 0o777 == 0o640
+
+    def test_reflink_falls_back(self, source, tmp_path):
+        result = CopyEngine(strategies=(REFLINK, BUFFERED)).copy(source, tmp_path / "copy.bin")
+        assert result.strategy in (REFLINK, BUFFERED)
+        assert (tmp_path / "copy.bin").read_bytes() == DATA
+
+    def test_hardlink(self, source, tmp_path):
+        engine = CopyEngine(strategies=(HARDLINK, BUFFERED), allow_hardlink=True)
+        assert engine.copy(source, tmp_path / "link.bin").strategy == HARDLINK
+        assert os.path.samefile(source, tmp_path / "link.bin")
+        assert engine.copy(source, tmp_path / "copy.bin", link=False).strategy == BUFFERED
+        assert not os.path.samefile(source, tmp_path / "copy.bin")
+
+    def test_hardlink_needs_permission(self, source, tmp_path):
+        assert CopyEngine(strategies=(HARDLINK, BUFFERED)).copy(source, tmp_path / "copy.bin").strategy == BUFFERED
+
+    def test_symlink(self, source, tmp_path):
+        destination = tmp_path / "link.bin"
+        destination.write_bytes(b"replaced")
+        assert CopyEngine(strategies=(SYMLINK,)).copy(source, destination).strategy == SYMLINK
+        assert destination.is_symlink() and destination.resolve() == source.resolve()
+        with pytest.raises(OSError, match="No copy strategy"):
+            CopyEngine(strategies=(SYMLINK,)).copy(source, destination, link=False)
+
+    @pytest.mark.parametrize("strategy", [REFLINK, KERNEL, BUFFERED])
+    @pytest.mark.parametrize("link", [os.symlink, os.link], ids=["symlink", "hardlink"])
+    def test_replaces_links(self, source, tmp_path, strategy, link):
+        """A destination linked to another file is replaced, so the file it links to keeps its contents."""
+        linked = tmp_path / "linked.bin"
+        linked.write_bytes(b"linked")
+        destination = tmp_path / "copy.bin"
+        link(linked, destination)
+        CopyEngine(strategies=(strategy, BUFFERED)).copy(source, destination)
+        assert destination.read_bytes() == DATA and not destination.is_symlink()
+        assert linked.read_bytes() == b"linked"
+
+    def test_same_file(self, source):
+        with pytest.raises(shutil.SameFileError):
+            CopyEngine().copy(source, source.parent / "." / source.name)
+        assert source.read_bytes() == DATA
+
+    def test_unsupported_strategy_falls_back(self, source, tmp_path, monkeypatch):
+        def link(*args):
+            raise OSError(errno.EXDEV, "cross-device link")
+
+        monkeypatch.setattr(copyengine.os, "link", link)
+        engine = CopyEngine(strategies=(HARDLINK, BUFFERED), allow_hardlink=True)
+        assert engine.copy(source, tmp_path / "copy.bin").strategy == BUFFERED
+
+    def test_other_errors_raise(self, source, tmp_path, monkeypatch):
+        def copy_file_range(*args):
+            raise OSError(errno.ENOSPC, "no space")
+
+        monkeypatch.setattr(copyengine.os, "copy_file_range", copy_file_range, raising=False)
+        with pytest.raises(OSError, match="no space"):
+            CopyEngine(strategies=(KERNEL, BUFFERED)).copy(source, tmp_path / "copy.bin")
+        assert not (tmp_path / "copy.bin").exists()
+
+    def test_kernel_falls_back_to_sendfile(self, source, tmp_path, monkeypatch):
+        def copy_file_range(*args):
+            raise OSError(errno.EXDEV, "cross-device copy")
+
+        monkeypatch.setattr(copyengine.os, "copy_file_range", copy_file_range, raising=False)
+        assert CopyEngine(strategies=(KERNEL,)).copy(source, tmp_path / "copy.bin").strategy == KERNEL
+        assert (tmp_path / "copy.bin").read_bytes() == DATA
+
+    def test_buffered_short_writes(self, source, tmp_path, monkeypatch):
+        def open_short(path, mode="r", *args, **kwargs):
+            file = open(path, mode, *args, **kwargs)
+            return ShortWriter(file) if "w" in mode else file
+
+        monkeypatch.setattr(copyengine, "open", open_short, raising=False)
+        engine = CopyEngine(strategies=(BUFFERED,), buffer_size=8192)
+        result = engine.copy(source, tmp_path / "copy.bin", algorithm="md5")
+        assert (tmp_path / "copy.bin").read_bytes() == DATA
+        assert result.hash == hash_file(source, "md5")
+
+    def test_metadata(self, source, tmp_path):
+        os.utime(source, ns=(1_000_000_000, 2_000_000_000))
+        CopyEngine(strategies=(BUFFERED,)).copy(source, tmp_path / "copy.bin", metadata=True)
+        assert (tmp_path / "copy.bin").stat().st_mtime_ns == 2_000_000_000
+
+    def test_as_copy_command(self, source, tmp_path):
+        engine = CopyEngine()
+        engine(source, tmp_path / "copy.bin")
+        assert (tmp_path / "copy.bin").read_bytes() == DATA
+        assert "strategies=" in repr(engine)
@@ -0,0 +1,161 @@
+""" test_datasetexport.py
+Tests of exporting the subjects of a dataset concurrently under a limit for each destination.
+"""
+# Imports #
+# Standard Libraries #
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.datasets import Dataset
+from ucsfbids.datasets.exporters.datasetbidsexporter import DatasetBIDSExporter
+from ucsfbids.subjects.exporters import SubjectBIDSExporter
+from ucsfbids.transfer import DestinationLimiter, destination_limiter, find_mount_point
+
+
+# Definitions #
+# Functions #
+def exported_files(path: Path) -> list[str]:
+    return sorted(p.relative_to(path).as_posix() for p in path.rglob("*") if p.is_file())
+
+
+def export_dataset(dataset_path: Path, export_path: Path, jobs=None, destination_limit=None, **kwargs) -> list:
+    dataset = Dataset(dataset_path)
+    exporter = dataset.create_exporter("BIDS", **kwargs)
+    sub_name_map = {name: name for name in dataset.subjects}
+    return exporter.execute_export(export_path, "exported", sub_name_map, jobs, destination_limit)
+
+
+def track_subject_exports(monkeypatch, delay: float = 0.05) -> list[int]:
+    """Records the peak number of subjects exported at once, holding each export for a delay."""
+    running, peak, lock = [0], [0], threading.Lock()
+    execute_export = SubjectBIDSExporter.execute_export
+
+    def tracked(self, *args, **kwargs):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(delay)
+        try:
+            return execute_export(self, *args, **kwargs)
+        finally:
+            with lock:
+                running[0] -= 1
+
+    monkeypatch.setattr(SubjectBIDSExporter, "execute_export", tracked)
+    return peak
+
+
+def run_in_slots(limiter: DestinationLimiter, destination: Path, n_threads: int) -> int:
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def transfer():
+        with limiter.slot(destination):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+    threads = [threading.Thread(target=transfer) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return peak[0]
+
+
+# Classes #
+class TestDestinationLimiter:
+    def test_find_mount_point(self, tmp_path):
+        mount_point = find_mount_point(tmp_path / "missing" / "file")
+        assert os.path.ismount(mount_point)
+        assert tmp_path.resolve().is_relative_to(mount_point)
+        assert find_mount_point("/") == Path("/")
+
+    def test_limits(self, tmp_path):
+        limiter = DestinationLimiter({tmp_path: 2}, default_limit=5)
+        assert limiter.get_limit(tmp_path / "other") == 2
+        assert limiter.limits == {find_mount_point(tmp_path): 2}
+        limiter.set_limit(tmp_path, None)
+        assert limiter.get_limit(tmp_path) == 5
+        assert DestinationLimiter().get_limit(tmp_path) is None
+
+    @pytest.mark.parametrize("limit, expected", [(1, 1), (2, 2)])
+    def test_slot_limits_transfers(self, tmp_path, limit, expected):
+        assert run_in_slots(DestinationLimiter({tmp_path: limit}), tmp_path / "a", 5) == expected
+
+    def test_slot_without_limit(self, tmp_path):
+        assert run_in_slots(DestinationLimiter(), tmp_path, 4) == 4
+
+
+class TestParallelExport:
+    def test_parallel_matches_serial(self, dataset_path, subject_names, tmp_path):
+        (tmp_path / "serial").mkdir()
+        (tmp_path / "parallel").mkdir()
+        serial = export_dataset(dataset_path, tmp_path / "serial")
+        parallel = export_dataset(dataset_path, tmp_path / "parallel", jobs=3)
+        assert [(r.name, r.succeeded) for r in parallel] == [(r.name, r.succeeded) for r in serial]
+        assert {r.name: r.succeeded for r in parallel} == {name: True for name in subject_names}
+        files = exported_files(tmp_path / "parallel" / "exported")
+        assert files == exported_files(tmp_path / "serial" / "exported")
+        assert "participants.tsv" in files
+
+    def test_subjects_overlap(self, dataset_path, tmp_path, monkeypatch):
+        peak = track_subject_exports(monkeypatch)
+        export_dataset(dataset_path, tmp_path, jobs=3)
+        assert peak[0] == 3
+
+    def test_destination_limit(self, dataset_path, tmp_path, monkeypatch):
+        peak = track_subject_exports(monkeypatch)
+        export_dataset(dataset_path, tmp_path, jobs=3, destination_limit=1)
+        assert peak[0] == 1
+        assert destination_limiter.limits == {}
+        assert DatasetBIDSExporter.destination_limiter is destination_limiter
+
+    def test_shared_limiter(self, dataset_path, tmp_path, monkeypatch):
+        peak = track_subject_exports(monkeypatch)
+        export_dataset(dataset_path, tmp_path, jobs=3, destination_limiter=DestinationLimiter({tmp_path: 2}))
+        assert peak[0] == 2
+
+    @pytest.mark.parametrize("jobs", [None, 2])
+    def test_failed_subject(self, dataset_path, subject_names, tmp_path, monkeypatch, jobs):
+        execute_export = SubjectBIDSExporter.execute_export
+
+        def fail_second(self, path, name=None):
+            if self.subject.name == subject_names[1]:
+                raise OSError("The share is unavailable.")
+            return execute_export(self, path, name)
+
+        monkeypatch.setattr(SubjectBIDSExporter, "execute_export", fail_second)
+        results = {r.name: r for r in export_dataset(dataset_path, tmp_path, jobs=jobs)}
+        assert {n: r.succeeded for n, r in results.items()} == dict(zip(subject_names, [True, False, True]))
+        assert "The share is unavailable." in results[subject_names[1]].error
+        assert (tmp_path / "exported" / f"sub-{subject_names[2]}").is_dir()
+
+    def test_limit_does_not_replace_limiter(self, dataset_path, tmp_path, monkeypatch):
+        """A limit of one export leaves the limiter of the exporter to the exports which run alongside it."""
+        dataset = Dataset(dataset_path)
+        exporter = dataset.create_exporter("BIDS")
+        limiter = exporter.destination_limiter
+        limiters = []
+        execute_export = SubjectBIDSExporter.execute_export
+
+        def record(self, path, name=None):
+            limiters.append(exporter.destination_limiter)
+            return execute_export(self, path, name)
+
+        monkeypatch.setattr(SubjectBIDSExporter, "execute_export", record)
+        peak = track_subject_exports(monkeypatch)
+        sub_name_map = {name: name for name in dataset.subjects}
+        exporter.execute_export(tmp_path, "exported", sub_name_map, 3, 1)
+        assert peak[0] == 1
+        assert limiters and all(r is limiter for r in limiters)
+        assert exporter.destination_limiter is limiter
@@ -0,0 +1,116 @@
+""" test_datasetindex.py
+Tests of the persistent SQLite index of the dataset tree.
+"""
+# Imports #
+# Standard Libraries #
+import json
+import shutil
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.datasets import Dataset
+from ucsfbids.loading import DatasetIndex, meta_info_cache, scan_directories
+from ucsfbids.loading.datasetindex import MODALITY_LEVEL, SESSION_LEVEL, SUBJECT_LEVEL
+
+
+# Definitions #
+# Constants #
+SESSION = "ses-clinicalintracranial"
+
+
+# Classes #
+class TestDatasetIndex:
+    def test_indexes_tree(self, dataset_path, subject_names):
+        index = DatasetIndex(root=dataset_path)
+        try:
+            assert index.path == dataset_path / ".ucsfbids" / "index.sqlite3"
+            assert index.path.is_file()
+            assert sorted(index.get_children(dataset_path)) == subject_names
+
+            subject_entry = index.get_entry(dataset_path / f"sub-{subject_names[0]}")
+            assert subject_entry.level == SUBJECT_LEVEL
+            assert subject_entry.name == subject_names[0]
+            assert subject_entry.meta_info is not None
+
+            session_path = dataset_path / f"sub-{subject_names[0]}" / SESSION
+            assert index.get_entry(session_path).level == SESSION_LEVEL
+            assert sorted(index.get_children(session_path)) == ["anat", "ct", "ieeg"]
+            modality_entry = index.get_entry(session_path / "ieeg")
+            assert modality_entry.level == MODALITY_LEVEL
+            assert modality_entry.type == modality_entry.meta_info["ModalityType"] == "IEEG"
+        finally:
+            index.close()
+        assert not index.is_open
+
+    def test_reopen_lists_nothing(self, dataset_path, subject_names):
+        DatasetIndex(root=dataset_path).close()
+        index = DatasetIndex(root=dataset_path, refresh=False)
+        try:
+            assert sorted(index.get_children(dataset_path)) == subject_names
+            assert index.refresh() == 0
+        finally:
+            index.close()
+
+    def test_refresh_adds_and_removes(self, dataset_path, subject_names):
+        index = DatasetIndex(root=dataset_path)
+        try:
+            shutil.rmtree(dataset_path / f"sub-{subject_names[0]}")
+            (dataset_path / "sub-NEW").mkdir()
+            assert index.refresh() > 0
+            children = index.get_children(dataset_path)
+            assert subject_names[0] not in children
+            assert "NEW" in children
+            assert index.get_entry(dataset_path / f"sub-{subject_names[0]}" / SESSION) is None
+        finally:
+            index.close()
+
+        index = DatasetIndex(root=dataset_path, refresh=False)
+        try:
+            assert sorted(index.get_children(dataset_path)) == sorted([*subject_names[1:], "NEW"])
+        finally:
+            index.close()
+
+    def test_check_meta(self, dataset_path, subject_names):
+        index = DatasetIndex(root=dataset_path)
+        try:
+            meta_path = dataset_path / f"sub-{subject_names[0]}" / f"sub-{subject_names[0]}_meta.json"
+            meta_info = json.loads(meta_path.read_text())
+            meta_info["SubjectNamespace"] = "changed"
+            meta_path.write_text(json.dumps(meta_info))
+            meta_info_cache.clear()
+
+            index.refresh(check_meta=True)
+            assert index.get_entry(meta_path.parent).namespace == "changed"
+        finally:
+            index.close()
+
+    def test_hidden_directories_match_scan(self, dataset_path):
+        (dataset_path / ".hidden").mkdir()
+        index = DatasetIndex(root=dataset_path)
+        try:
+            indexed = index.get_children(dataset_path)
+            assert ".ucsfbids" not in indexed and "hidden" not in indexed
+            assert indexed == scan_directories(dataset_path, prefix=4)
+        finally:
+            index.close()
+
+    def test_outside_root(self, dataset_path, tmp_path):
+        index = DatasetIndex(root=dataset_path)
+        try:
+            assert index.get_entry(tmp_path) is None
+            assert index.get_children(tmp_path) is None
+            assert index.get_children(dataset_path / "sub-missing") is None
+        finally:
+            index.close()
+
+    def test_dataset_with_index(self, dataset_path, subject_names):
+        dataset = Dataset(dataset_path, use_index=True)
+        try:
+            assert dataset.index is not None
+            assert sorted(dataset.subjects) == subject_names
+            session = dataset.subjects[subject_names[0]].sessions["clinicalintracranial"]
+            assert sorted(session.modalities) == ["anat", "ct", "ieeg"]
+        finally:
+            dataset.close_index()
+        assert dataset.index is None
@@ -0,0 +1,97 @@
+""" test_datasetpiaimporter.py
+Tests of importing a dataset from a Pia source tree serially and in worker processes.
+"""
+# Imports #
+# Standard Libraries #
+from pathlib import Path
+
+import pytest
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.datasets import Dataset
+from ucsfbids.datasets.importers.pia import DatasetPiaImporter
+from ucsfbids.datasets.participantstable import ParticipantsTable
+
+from ..synthetictrees import PIA_DIRECTORY
+
+
+# Definitions #
+# Constants #
+SUBJECTS = ["EC0001", "EC0002", "EC0003"]
+JOBS = [None, 2]
+
+
+# Functions #
+def import_dataset(output_path: Path, src_root: Path, patients: list[str], **kwargs) -> list:
+    dataset = Dataset(parent_path=output_path, name="imported", mode="w", create=True, load=False)
+    dataset.add_importer("Pia", DatasetPiaImporter, overwrite=True)
+    importer = dataset.create_importer("Pia", src_root, subjects=SUBJECTS[: len(patients)])
+    return importer.execute_import(source_patients=patients, **kwargs)
+
+
+def imported_files(path: Path) -> list[str]:
+    return sorted(p.relative_to(path).as_posix() for p in path.rglob("*") if p.is_file() and "/." not in p.as_posix())
+
+
+# Classes #
+class TestDatasetPiaImporter:
+    @pytest.mark.parametrize("jobs", JOBS)
+    def test_import(self, pia_source, tmp_path, jobs):
+        src_root, patients = pia_source
+        results = import_dataset(tmp_path, src_root, patients, jobs=jobs)
+        assert [(r.name, r.succeeded, r.error) for r in results] == [(s, True, None) for s in SUBJECTS]
+
+        path = tmp_path / "imported"
+        participants = ParticipantsTable(path / "participants.tsv")
+        assert all(s in participants for s in SUBJECTS)
+        for subject in SUBJECTS:
+            ieeg_path = path / f"sub-{subject}" / "ses-clinicalintracranial" / "ieeg"
+            assert (ieeg_path / f"sub-{subject}_ses-clinicalintracranial_electrodes.tsv").is_file()
+
+    def test_parallel_matches_serial(self, pia_source, tmp_path):
+        src_root, patients = pia_source
+        (tmp_path / "serial").mkdir()
+        (tmp_path / "parallel").mkdir()
+        import_dataset(tmp_path / "serial", src_root, patients)
+        import_dataset(tmp_path / "parallel", src_root, patients, jobs=2)
+        assert imported_files(tmp_path / "serial" / "imported") == imported_files(tmp_path / "parallel" / "imported")
+
+    @pytest.mark.parametrize("jobs", JOBS)
+    def test_failed_subject(self, pia_source, tmp_path, jobs):
+        src_root, patients = pia_source
+        (src_root / PIA_DIRECTORY / patients[1] / "elecs" / "clinical_elecs_all.mat").write_bytes(b"not a mat file")
+
+        results = import_dataset(tmp_path, src_root, patients, jobs=jobs)
+        assert [(r.name, r.succeeded) for r in results] == list(zip(SUBJECTS, [True, False, True]))
+        assert "Traceback" in results[1].error
+
+        participants = ParticipantsTable(tmp_path / "imported" / "participants.tsv")
+        assert SUBJECTS[0] in participants and SUBJECTS[2] in participants
+        assert SUBJECTS[1] not in participants
+
+    def test_missing_source(self, pia_source, tmp_path, capsys):
+        src_root, patients = pia_source
+        (src_root / PIA_DIRECTORY / patients[1] / "CT" / "CT.nii").unlink()
+
+        results = import_dataset(tmp_path, src_root, patients)
+        assert [(r.name, r.succeeded) for r in results] == list(zip(SUBJECTS, [True, False, True]))
+        assert f"No source file for {tmp_path / 'imported' / f'sub-{SUBJECTS[1]}'}" in results[1].error
+        assert capsys.readouterr().out == ""
+
+    def test_missing_volume(self, pia_source, tmp_path):
+        src_root, patients = pia_source
+        (src_root / PIA_DIRECTORY / patients[1] / "mri" / "brain.mgz").unlink()
+
+        results = import_dataset(tmp_path, src_root, patients)
+        assert [(r.name, r.succeeded) for r in results] == list(zip(SUBJECTS, [True, False, True]))
+        error = results[1].error.strip().splitlines()[-1]
+        assert error.startswith("FileNotFoundError") and "brain.mgz" in error
+        assert not list((tmp_path / "imported" / f"sub-{SUBJECTS[1]}").rglob("*T1w.nii.gz"))
+
+    def test_skips_imported_subjects(self, pia_source, tmp_path):
+        src_root, patients = pia_source
+        import_dataset(tmp_path, src_root, patients)
+        assert import_dataset(tmp_path, src_root, patients) == []
+        assert len(import_dataset(tmp_path, src_root, patients, overwrite=True)) == len(SUBJECTS)
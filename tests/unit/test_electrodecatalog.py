@@ -0,0 +1,124 @@
+""" test_electrodecatalog.py
+Tests of the persistent catalog of the electrodes of a dataset and its spatial queries.
+"""
+# Imports #
+# Standard Libraries #
+import os
+import shutil
+
+import pytest
+
+# Third-Party Packages #
+import numpy as np
+
+# Local Packages #
+from ucsfbids.datasets import Dataset
+from ucsfbids.loading import ElectrodeCatalog, read_electrodes_tsv, write_electrodes_tsv
+from ucsfbids.loading.electrodecatalog import ELECTRODES_PATTERN
+
+from ..synthetictrees import N_ELECTRODES, SESSION_NAME
+
+
+# Definitions #
+# Functions #
+def electrodes_path(dataset_path, subject: str):
+    return next((dataset_path / f"sub-{subject}").glob("ses-*/ieeg/*_electrodes.tsv"))
+
+
+def rewrite_table(path, rows: int) -> None:
+    write_electrodes_tsv(read_electrodes_tsv(path).iloc[:rows], path)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def brute_force_distances(catalog: ElectrodeCatalog, point) -> np.ndarray:
+    xyz = catalog.table[["x", "y", "z"]].to_numpy(dtype=np.float64)
+    return np.linalg.norm(xyz - np.asarray(point), axis=1)
+
+
+# Classes #
+class TestElectrodeCatalog:
+    def test_catalogs_every_table(self, dataset_path, subject_names):
+        catalog = ElectrodeCatalog(dataset_path, jobs=2)
+        assert len(catalog) == len(subject_names) * N_ELECTRODES
+        assert list(catalog.table["subject"].cat.categories) == subject_names
+        assert set(catalog.table["session"]) == {SESSION_NAME}
+        assert set(catalog.table["modality"]) == {"ieeg"}
+        assert catalog.path.is_file()
+        assert len(catalog.sources) == len(subject_names)
+
+    def test_reopens_without_loading(self, dataset_path, monkeypatch):
+        catalog = ElectrodeCatalog(dataset_path)
+
+        def load_source(*args):
+            raise AssertionError("An unchanged table was loaded again.")
+
+        monkeypatch.setattr(ElectrodeCatalog, "_load_source", load_source)
+        reopened = ElectrodeCatalog(dataset_path)
+        assert reopened.refresh() == 0
+        assert reopened.table.equals(catalog.table)
+        assert reopened.sources == catalog.sources
+
+    def test_refresh_changed_added_and_removed(self, dataset_path, subject_names):
+        catalog = ElectrodeCatalog(dataset_path)
+        rewrite_table(electrodes_path(dataset_path, subject_names[0]), 5)
+        assert catalog.refresh() == 1
+        assert (catalog.table["subject"] == subject_names[0]).sum() == 5
+        assert len(catalog) == 5 + (len(subject_names) - 1) * N_ELECTRODES
+
+        shutil.rmtree(dataset_path / f"sub-{subject_names[1]}")
+        assert catalog.refresh() == 1
+        assert subject_names[1] not in set(catalog.table["subject"])
+
+        new_path = dataset_path / "sub-EC9999" / f"ses-{SESSION_NAME}" / "ieeg" / "sub-EC9999_electrodes.tsv"
+        new_path.parent.mkdir(parents=True)
+        shutil.copy(electrodes_path(dataset_path, subject_names[2]), new_path)
+        assert catalog.refresh() == 1
+        assert (catalog.table["subject"] == "EC9999").sum() == N_ELECTRODES
+
+        for relative, source in catalog.sources.items():
+            rows = catalog.table.iloc[source.start : source.stop]
+            assert set(rows["subject"]) == {relative.split("/")[0].removeprefix("sub-")}
+        assert ElectrodeCatalog(dataset_path, refresh=False).sources == catalog.sources
+
+    def test_within(self, dataset_path):
+        catalog = ElectrodeCatalog(dataset_path)
+        point = (5.0, -3.0, 10.0)
+        found = catalog.within(point, 20.0)
+        distances = brute_force_distances(catalog, point)
+        assert sorted(found.index) == sorted(np.flatnonzero(distances <= 20.0))
+        assert found["distance"].is_monotonic_increasing
+        np.testing.assert_allclose(found["distance"], distances[found.index], rtol=1e-6)
+
+    def test_nearest(self, dataset_path):
+        catalog = ElectrodeCatalog(dataset_path)
+        point = (0.0, 0.0, 0.0)
+        found = catalog.nearest(point, k=5)
+        distances = brute_force_distances(catalog, point)
+        assert list(found.index) == list(np.argsort(distances)[:5])
+        assert len(catalog.nearest(point)) == 1
+        assert len(catalog.nearest(point, k=len(catalog) + 10)) == len(catalog)
+
+    def test_skips_missing_coordinates(self, dataset_path, subject_names):
+        path = electrodes_path(dataset_path, subject_names[0])
+        table = read_electrodes_tsv(path)
+        table.loc[0, ["x", "y", "z"]] = np.nan
+        write_electrodes_tsv(table, path)
+        catalog = ElectrodeCatalog(dataset_path)
+        assert len(catalog.nearest((0.0, 0.0, 0.0), k=len(catalog))) == len(catalog) - 1
+        found = catalog.within((0.0, 0.0, 0.0), 1e6)
+        assert len(found) == len(catalog) - 1 and 0 not in found.index
+
+    def test_empty_dataset(self, tmp_path):
+        catalog = ElectrodeCatalog(tmp_path)
+        assert len(catalog) == 0
+        assert catalog.refresh() == 0
+        assert catalog.nearest((0.0, 0.0, 0.0), k=3).empty
+        assert catalog.within((0.0, 0.0, 0.0), 10.0).empty
+
+    def test_open_from_dataset(self, dataset_path):
+        dataset = Dataset(dataset_path)
+        catalog = dataset.open_electrode_catalog(jobs=2)
+        assert dataset.open_electrode_catalog() is catalog
+        assert catalog.root == dataset_path
+        assert len(list(dataset_path.glob(ELECTRODES_PATTERN))) == len(catalog.sources)
@@ -0,0 +1,132 @@
+""" test_electrodeconversion.py
+Tests of converting Pia montages to BIDS electrodes tables one at a time and in batches.
+"""
+# Imports #
+# Standard Libraries #
+import pytest
+
+# Third-Party Packages #
+import numpy as np
+import pandas as pd
+from scipy.io import savemat
+
+# Local Packages #
+from ucsfbids.modalities.importers.pia import ieegpiaimporter
+from ucsfbids.modalities.importers.pia.ieegpiaimporter import (
+    ELECTRODE_COLUMNS,
+    convert_electrodes,
+    convert_electrodes_batch,
+    create_electrodes_table,
+)
+
+
+# Definitions #
+# Constants #
+N_ELECTRODES = 12
+
+
+# Functions #
+def create_montage(n_electrodes: int = N_ELECTRODES, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    xyz = rng.normal(size=(n_electrodes, 3)) * 30
+    xyz[0, 0] = 0.0
+    labels = np.array([[f"E{i}", "grid", f"G{i // 4}"] for i in range(n_electrodes)], dtype=object)
+    return xyz, labels
+
+
+def legacy_table(xyz: np.ndarray, eleclabels: np.ndarray) -> pd.DataFrame:
+    """Builds the table column by column, the way the converter did before it built the table in one construction."""
+    table = pd.DataFrame(columns=ELECTRODE_COLUMNS)
+    table.loc[:, "x"] = xyz[:, 0]
+    table.loc[:, "y"] = xyz[:, 1]
+    table.loc[:, "z"] = xyz[:, 2]
+    table.loc[:, "name"] = eleclabels[:, 0]
+    table.loc[:, "group"] = eleclabels[:, 2]
+    for column in ("size", "material", "manufacturer", "type", "impedance"):
+        table.loc[:, column] = "n/a"
+    table.loc[table["x"] > 0, "hemisphere"] = "r"
+    table.loc[table["x"] <= 0, "hemisphere"] = "l"
+    return table
+
+
+@pytest.fixture
+def montage_path(tmp_path):
+    xyz, labels = create_montage()
+    path = tmp_path / "clinical_elecs_all.mat"
+    savemat(path, {"elecmatrix": xyz, "eleclabels": labels, "unused": np.zeros((100, 100))})
+    return path
+
+
+# Classes #
+class TestCreateElectrodesTable:
+    def test_matches_column_assignment(self):
+        xyz, labels = create_montage()
+        table = create_electrodes_table(xyz, labels)
+        assert list(table.columns) == ELECTRODE_COLUMNS
+        assert table.astype(str).equals(legacy_table(xyz, labels).astype(str))
+        assert table.loc[0, "hemisphere"] == "l"
+
+    def test_single_electrode(self):
+        table = create_electrodes_table(np.array([1.0, 2.0, 3.0]), np.array(["E0", "strip", "S"], dtype=object))
+        assert table.to_dict("records") == [
+            {
+                "name": "E0",
+                "x": 1.0,
+                "y": 2.0,
+                "z": 3.0,
+                "size": "n/a",
+                "material": "n/a",
+                "manufacturer": "n/a",
+                "group": "S",
+                "hemisphere": "r",
+                "type": "n/a",
+                "impedance": "n/a",
+            }
+        ]
+
+    def test_missing_names(self):
+        xyz, labels = create_montage(3)
+        labels[1, 0] = None
+        assert list(create_electrodes_table(xyz, labels)["name"]) == ["E0", "NaN", "E2"]
+
+
+class TestConvertElectrodes:
+    def test_convert(self, montage_path, tmp_path):
+        assert convert_electrodes(montage_path, tmp_path / "electrodes.tsv")
+        table = pd.read_csv(tmp_path / "electrodes.tsv", sep="\t", keep_default_na=False)
+        assert list(table.columns) == ELECTRODE_COLUMNS
+        xyz, labels = create_montage()
+        np.testing.assert_allclose(table[["x", "y", "z"]].to_numpy(), xyz)
+        assert list(table["name"]) == list(labels[:, 0])
+
+    def test_missing_montage(self, tmp_path):
+        assert not convert_electrodes(tmp_path / "missing.mat", tmp_path / "electrodes.tsv")
+        assert not (tmp_path / "electrodes.tsv").exists()
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_batch(self, montage_path, tmp_path, jobs):
+        (tmp_path / "corrupt.mat").write_bytes(b"not a mat file")
+        paths = [
+            (montage_path, tmp_path / "first.tsv"),
+            (tmp_path / "missing.mat", tmp_path / "missing.tsv"),
+            (tmp_path / "corrupt.mat", tmp_path / "corrupt.tsv"),
+            (montage_path, tmp_path / "second.tsv"),
+        ]
+        results = convert_electrodes_batch(paths, jobs=jobs)
+        assert [(r.name, r.succeeded) for r in results] == [
+            (str(paths[0][1]), True),
+            (str(paths[1][1]), False),
+            (str(paths[2][1]), False),
+            (str(paths[3][1]), True),
+        ]
+        assert "does not exist" in results[1].error
+        assert "Traceback" in results[2].error
+        assert (tmp_path / "first.tsv").read_bytes() == (tmp_path / "second.tsv").read_bytes()
+
+    def test_batch_of_one_runs_in_place(self, montage_path, tmp_path, monkeypatch):
+        def executor(*args, **kwargs):
+            raise AssertionError("A single montage was converted in a process pool.")
+
+        monkeypatch.setattr(ieegpiaimporter, "ProcessPoolExecutor", executor)
+        assert convert_electrodes_batch([(montage_path, tmp_path / "electrodes.tsv")])[0].succeeded
+        assert convert_electrodes_batch([]) == []
@@ -0,0 +1,162 @@
+""" test_electrodetables.py
+Tests of the typed loading of electrode tables, their cache, and their binary sidecars.
+"""
+# Imports #
+# Standard Libraries #
+import os
+
+import pytest
+
+# Third-Party Packages #
+import numpy as np
+import pandas as pd
+
+# Local Packages #
+from ucsfbids.datasets import Dataset
+from ucsfbids.loading import ElectrodeTableCache, electrode_table_cache, read_electrodes_tsv, write_electrodes_tsv
+from ucsfbids.loading.electrodetables import (
+    electrodes_sidecar_path,
+    load_electrode_table,
+    load_table_npz,
+    save_table_npz,
+)
+
+from ..synthetictrees import N_ELECTRODES, SESSION_NAME
+
+
+# Definitions #
+# Functions #
+def touch_later(path, ns: int = 1_000_000_000) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + ns))
+
+
+@pytest.fixture
+def ieeg(dataset_path, subject_names):
+    electrode_table_cache.clear()
+    yield Dataset(dataset_path).subjects[subject_names[0]].sessions[SESSION_NAME].modalities["ieeg"]
+    electrode_table_cache.clear()
+
+
+# Classes #
+class TestElectrodeTables:
+    def test_typed_columns(self, ieeg):
+        table = read_electrodes_tsv(ieeg.electrodes_path)
+        assert len(table) == N_ELECTRODES
+        assert table["x"].dtype == np.float32
+        assert table["impedance"].dtype == np.float32 and table["impedance"].isna().all()
+        assert isinstance(table["hemisphere"].dtype, pd.CategoricalDtype)
+        assert set(table["hemisphere"].cat.categories) == {"l", "r"}
+
+    def test_missing_entries_round_trip(self, ieeg, tmp_path):
+        table = read_electrodes_tsv(ieeg.electrodes_path)
+        write_electrodes_tsv(table, tmp_path / "electrodes.tsv")
+        assert (tmp_path / "electrodes.tsv").read_text().splitlines()[1].endswith("\tn/a\tn/a")
+        pd.testing.assert_frame_equal(read_electrodes_tsv(tmp_path / "electrodes.tsv"), table)
+
+    def test_drops_legacy_index(self, ieeg, tmp_path):
+        table = read_electrodes_tsv(ieeg.electrodes_path)
+        table.to_csv(tmp_path / "electrodes.tsv", sep="\t", na_rep="n/a")
+        pd.testing.assert_frame_equal(read_electrodes_tsv(tmp_path / "electrodes.tsv"), table)
+
+    def test_npz_round_trip(self, tmp_path):
+        table = pd.DataFrame(
+            {
+                "name": np.array(["a", "b", "a"], dtype=object),
+                "x": np.array([1.0, np.nan, 3.0], dtype=np.float32),
+                "group": pd.Categorical(["g", "h", "g"]),
+            }
+        )
+        save_table_npz(table, tmp_path / "table.npz", {"key": "value"})
+        loaded, meta = load_table_npz(tmp_path / "table.npz")
+        pd.testing.assert_frame_equal(loaded, table)
+        assert meta["key"] == "value"
+        assert not list(tmp_path.glob(".tmp-*"))
+
+    def test_unreadable_npz(self, tmp_path):
+        assert load_table_npz(tmp_path / "missing.npz") is None
+        (tmp_path / "bad.npz").write_bytes(b"not an npz file")
+        assert load_table_npz(tmp_path / "bad.npz") is None
+
+    def test_sidecar(self, ieeg):
+        path = ieeg.electrodes_path
+        sidecar_path = electrodes_sidecar_path(path)
+        assert sidecar_path.name.endswith("_electrodes-meta.npz")
+
+        table = load_electrode_table(path, sidecar=True)
+        assert sidecar_path.is_file()
+        pd.testing.assert_frame_equal(load_table_npz(sidecar_path)[0], table)
+        pd.testing.assert_frame_equal(load_electrode_table(path), table)
+
+        # A sidecar which no longer matches its table is ignored.
+        changed = table.iloc[:2]
+        write_electrodes_tsv(changed, path)
+        touch_later(path)
+        assert len(load_electrode_table(path)) == 2
+
+    def test_missing_table(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_electrode_table(tmp_path / "missing.tsv")
+
+
+class TestElectrodeTableCache:
+    def test_loads_once(self, ieeg):
+        cache = ElectrodeTableCache()
+        assert cache.get(ieeg.electrodes_path) is cache.get(ieeg.electrodes_path)
+        assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+
+    def test_reloads_changed_table(self, ieeg):
+        cache = ElectrodeTableCache()
+        cache.get(ieeg.electrodes_path)
+        write_electrodes_tsv(read_electrodes_tsv(ieeg.electrodes_path).iloc[:3], ieeg.electrodes_path)
+        touch_later(ieeg.electrodes_path)
+        assert len(cache.get(ieeg.electrodes_path)) == 3
+        assert cache.misses == 2
+
+    def test_evicts_least_recently_used(self, tmp_path, ieeg):
+        paths = []
+        for i in range(3):
+            paths.append(tmp_path / f"{i}.tsv")
+            paths[-1].write_bytes(ieeg.electrodes_path.read_bytes())
+        cache = ElectrodeTableCache(maxsize=2)
+        cache.get(paths[0])
+        cache.get(paths[1])
+        cache.get(paths[0])
+        cache.get(paths[2])
+        assert len(cache) == 2
+        cache.get(paths[0])
+        assert cache.hits == 2
+        cache.get(paths[1])
+        assert cache.misses == 4
+
+    def test_invalidate_and_clear(self, ieeg):
+        cache = ElectrodeTableCache()
+        cache.get(ieeg.electrodes_path)
+        cache.invalidate(ieeg.electrodes_path)
+        assert len(cache) == 0
+        cache.get(ieeg.electrodes_path)
+        cache.clear()
+        assert (len(cache), cache.hits, cache.misses) == (0, 0, 0)
+
+
+class TestIEEGElectrodes:
+    def test_load_returns_copies(self, ieeg):
+        first = ieeg.load_electrodes()
+        first.loc[0, "x"] = 1000.0
+        second = ieeg.load_electrodes()
+        assert second.loc[0, "x"] != 1000.0
+        assert electrode_table_cache.hits == 1
+        pd.testing.assert_frame_equal(ieeg.load_electrodes(cache=False), second)
+
+    def test_load_writes_sidecar(self, ieeg):
+        ieeg.load_electrodes(sidecar=True)
+        assert electrodes_sidecar_path(ieeg.electrodes_path).is_file()
+
+    def test_save_invalidates_cache(self, ieeg):
+        electrodes = ieeg.load_electrodes()
+        electrodes.loc[0, "name"] = "renamed"
+        ieeg.save_electrodes(electrodes)
+        loaded = ieeg.load_electrodes()
+        assert loaded.loc[0, "name"] == "renamed"
+        assert loaded["size"].isna().all()
+        assert "\tn/a\t" in ieeg.electrodes_path.read_text()
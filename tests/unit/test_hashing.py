@@ -0,0 +1,114 @@
+""" test_hashing.py
+Tests of hashing files while they are copied and of recording the digests of imported and exported files.
+"""
+# Imports #
+# Standard Libraries #
+import hashlib
+import os
+
+import pytest
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.datasets import Dataset
+from ucsfbids.modalities.exporters.modalitybidsexporter import ModalityBIDSExporter
+from ucsfbids.transfer import CopyEngine, TransferManifest, hash_file, transfermanifest, verify_manifests
+from ucsfbids.transfer.copyengine import BUFFERED, KERNEL
+
+from .test_datasetpiaimporter import import_dataset
+
+
+# Definitions #
+# Constants #
+DATA = os.urandom(50_000)
+
+
+# Functions #
+def export_dataset(dataset_path, export_path, **kwargs) -> Dataset:
+    dataset = Dataset(dataset_path)
+    exporter = dataset.create_exporter("BIDS", **kwargs)
+    exporter.execute_export(export_path, "exported", {name: name for name in dataset.subjects})
+    return dataset
+
+
+# Classes #
+class TestHashing:
+    @pytest.mark.parametrize("algorithm", ["sha256", "md5", "blake2b"])
+    def test_hash_file(self, tmp_path, algorithm):
+        (tmp_path / "file").write_bytes(DATA)
+        assert hash_file(tmp_path / "file", algorithm) == hashlib.new(algorithm, DATA).hexdigest()
+
+    def test_hash_while_copying(self, tmp_path):
+        (tmp_path / "source").write_bytes(DATA)
+        engine = CopyEngine(buffer_size=4096)
+        result = engine.copy(tmp_path / "source", tmp_path / "copy", algorithm="blake2b")
+        assert result.strategy != KERNEL
+        assert result.hash == hashlib.blake2b(DATA).hexdigest()
+        assert engine.copy(tmp_path / "source", tmp_path / "plain").hash is None
+
+    def test_unknown_algorithm(self, tmp_path):
+        (tmp_path / "source").write_bytes(DATA)
+        with pytest.raises(ValueError):
+            CopyEngine(strategies=(BUFFERED,)).copy(tmp_path / "source", tmp_path / "copy", algorithm="missing")
+
+
+class TestImportDigests:
+    @pytest.mark.parametrize("jobs", [None, 2])
+    def test_imported_files_are_hashed(self, pia_source, tmp_path, jobs):
+        src_root, patients = pia_source
+        import_dataset(tmp_path, src_root, patients[:2], jobs=jobs, record_hashes=True)
+        manifests = [TransferManifest(p) for p in (tmp_path / "imported").rglob("*-import-meta.json")]
+        records = [(m, k, r) for m in manifests for k, r in m.records.items()]
+        assert records
+        for manifest, key, record in records:
+            assert record.hash == hash_file(manifest.target_path(key), manifest.algorithm)
+        assert not any(verify_manifests(manifests).values())
+
+    def test_default_import_is_not_hashed(self, pia_source, tmp_path, monkeypatch):
+        algorithms = []
+        copy = CopyEngine.copy
+
+        def record(self, source, destination, metadata=False, link=True, algorithm=None):
+            algorithms.append(algorithm)
+            return copy(self, source, destination, metadata, link, algorithm)
+
+        def hash_target(*args, **kwargs):
+            raise AssertionError("An import without record_hashes never reads its files again to hash them.")
+
+        monkeypatch.setattr(CopyEngine, "copy", record)
+        monkeypatch.setattr(transfermanifest, "hash_file", hash_target)
+        src_root, patients = pia_source
+        import_dataset(tmp_path, src_root, patients[:1])
+        assert algorithms and all(a is None for a in algorithms)
+        manifests = [TransferManifest(p) for p in (tmp_path / "imported").rglob("*-import-meta.json")]
+        records = [r for m in manifests for r in m.records.values()]
+        assert records and all(r.hash is None for r in records)
+
+
+class TestExportDigests:
+    def test_default_export_has_no_manifest(self, dataset_path, tmp_path):
+        export_dataset(dataset_path, tmp_path)
+        assert list((tmp_path / "exported").rglob("sub-*/ses-*/*/*"))
+        assert not list((tmp_path / "exported").rglob(ModalityBIDSExporter.manifest_name))
+
+    @pytest.mark.parametrize("options", [{"record_manifest": True}, {"sync": True}], ids=["record", "sync"])
+    def test_recorded_export(self, dataset_path, tmp_path, options):
+        export_dataset(dataset_path, tmp_path, **options)
+        manifests = [TransferManifest(p) for p in (tmp_path / "exported").rglob(ModalityBIDSExporter.manifest_name)]
+        assert len(manifests) == len(list((tmp_path / "exported").glob("sub-*/ses-*/*/")))
+        for manifest in manifests:
+            assert manifest.algorithm == ModalityBIDSExporter.hash_algorithm
+            assert all(r.hash == hash_file(manifest.target_path(k)) for k, r in manifest.records.items())
+
+        target = manifests[0].target_path(next(iter(manifests[0].records)))
+        target.write_bytes(b"damaged")
+        failed = verify_manifests(manifests, jobs=2)
+        assert failed[manifests[0].path] == [manifests[0].key(target)]
+        assert not any(failed[m.path] for m in manifests[1:])
+
+    def test_view_export_is_not_hashed(self, dataset_path, tmp_path):
+        export_dataset(dataset_path, tmp_path, view=True, record_manifest=True)
+        manifests = [TransferManifest(p) for p in (tmp_path / "exported").rglob(ModalityBIDSExporter.manifest_name)]
+        assert manifests
+        assert all(r.hash is None for m in manifests for r in m.records.values())
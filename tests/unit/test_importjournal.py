@@ -0,0 +1,114 @@
+""" test_importjournal.py
+Tests of the crash-safe journal of file imports.
+"""
+# Imports #
+# Standard Libraries #
+import pickle
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.datasets import Dataset
+from ucsfbids.transfer import ImportJournal
+
+from .test_datasetpiaimporter import import_dataset
+
+
+# Definitions #
+# Classes #
+class TestImportJournal:
+    def test_begin_and_commit(self, tmp_path):
+        journal = ImportJournal(tmp_path / "journal")
+        target, temporary = tmp_path / "target", tmp_path / ".tmp-target"
+        journal.begin(target, temporary)
+        assert not journal.is_committed(target)
+        journal.commit(target)
+        assert journal.is_committed(target)
+        journal.close()
+
+        resumed = ImportJournal(tmp_path / "journal")
+        assert resumed.is_committed(target)
+        assert not resumed.pending
+
+    def test_recover_uncommitted(self, tmp_path):
+        journal = ImportJournal(tmp_path / "journal")
+        committed, interrupted = tmp_path / "committed", tmp_path / "interrupted"
+        journal.begin(committed, tmp_path / ".tmp-committed")
+        journal.commit(committed)
+        journal.begin(interrupted, tmp_path / ".tmp-interrupted")
+        (tmp_path / ".tmp-interrupted").write_bytes(b"partial")
+        journal.close()
+
+        resumed = ImportJournal(tmp_path / "journal")
+        assert list(resumed.pending) == [str(interrupted)]
+        assert resumed.recover() == [tmp_path / ".tmp-interrupted"]
+        assert not (tmp_path / ".tmp-interrupted").exists()
+        assert not resumed.pending
+
+    def test_ignores_truncated_line(self, tmp_path):
+        journal = ImportJournal(tmp_path / "journal")
+        journal.commit(tmp_path / "target")
+        journal.close()
+        log_path = next((tmp_path / "journal").glob("*.jsonl"))
+        with log_path.open("a") as file:
+            file.write('{"event": "commit", "tar')
+
+        assert ImportJournal(tmp_path / "journal").committed == {str(tmp_path / "target")}
+
+    def test_clear_without_resume(self, tmp_path):
+        journal = ImportJournal(tmp_path / "journal")
+        journal.commit(tmp_path / "target")
+        journal.close()
+
+        cleared = ImportJournal(tmp_path / "journal", resume=False)
+        assert not cleared.committed
+        assert not list((tmp_path / "journal").glob("*.jsonl"))
+
+    def test_pickled_journals_write_separate_logs(self, tmp_path):
+        journal = ImportJournal(tmp_path / "journal")
+        journal.commit(tmp_path / "first")
+        copy = pickle.loads(pickle.dumps(journal))
+        copy.commit(tmp_path / "second")
+        journal.close()
+        copy.close()
+
+        assert len(list((tmp_path / "journal").glob("*.jsonl"))) == 2
+        assert ImportJournal(tmp_path / "journal").committed == {str(tmp_path / "first"), str(tmp_path / "second")}
+
+
+class TestResumedImport:
+    def test_resume_skips_committed_files(self, pia_source, tmp_path):
+        src_root, patients = pia_source
+        import_dataset(tmp_path, src_root, patients)
+        path = tmp_path / "imported"
+        ct_target = next(path.glob("sub-EC0001/ses-*/ct/*_CT.nii"))
+        # A resumed import trusts the journal rather than the manifest, so a damaged committed file is kept.
+        ct_target.write_bytes(b"kept")
+        interrupted = ct_target.with_name("interrupted.nii")
+        partial = interrupted.with_name(f".tmp-{interrupted.name}")
+        journal = ImportJournal(path / ImportJournal.default_directory)
+        journal.begin(interrupted, partial)
+        partial.write_bytes(b"partial")
+        journal.close()
+
+        results = import_dataset(tmp_path, src_root, patients, overwrite=True, resume=True)
+        assert all(r.succeeded for r in results)
+        assert ct_target.read_bytes() == b"kept"
+        assert not partial.exists()
+
+        import_dataset(tmp_path, src_root, patients, overwrite=True)
+        assert ct_target.read_bytes() != b"kept"
+
+    def test_partial_files_are_not_exported(self, pia_source, tmp_path):
+        src_root, patients = pia_source
+        import_dataset(tmp_path, src_root, patients)
+        ieeg_path = next((tmp_path / "imported").glob("sub-*/ses-*/ieeg"))
+        electrodes = next(ieeg_path.glob("*_electrodes.tsv"))
+        partial = electrodes.with_name(f".tmp-{electrodes.name}")
+        partial.write_bytes(b"partial")
+
+        dataset = Dataset(tmp_path / "imported")
+        dataset.create_exporter("BIDS").execute_export(tmp_path, "exported", {n: n for n in dataset.subjects})
+        exported = tmp_path / "exported" / ieeg_path.relative_to(tmp_path / "imported")
+        assert (exported / electrodes.name).read_bytes() == electrodes.read_bytes()
+        assert not [p.name for p in exported.iterdir() if p.name.startswith(".tmp-")]
@@ -0,0 +1,100 @@
+""" test_importplan.py
+Tests of planning imports before running them and of the dry-run mode.
+"""
+# Imports #
+# Standard Libraries #
+from pathlib import Path
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.datasets.importers.pia import DatasetPiaImporter
+from ucsfbids.importspec import FileSpec, ImportAction, create_plan_frame, resolve_import_plan
+from ucsfbids.importspec.importplan import PLAN_COLUMNS
+from ucsfbids.transfer import SourceInventory
+
+from .test_datasetpiaimporter import SUBJECTS, import_dataset
+
+
+# Definitions #
+# Functions #
+def create_action(destination: Path, *candidates: Path, copy_command=None) -> ImportAction:
+    file = FileSpec("T1w", ".nii", list(candidates), copy_command=copy_command)
+    return ImportAction(file=file, destination=destination, candidates=candidates, subject="S1", modality="anat")
+
+
+# Classes #
+class TestResolveImportPlan:
+    def test_resolves_first_existing_file(self, tmp_path):
+        first, second = tmp_path / "first.nii", tmp_path / "second.nii"
+        second.write_bytes(b"data")
+        (tmp_path / "directory.nii").mkdir()
+        actions = [create_action(tmp_path / "out.nii", tmp_path / "directory.nii", first, second)]
+
+        (resolved,) = resolve_import_plan(actions, jobs=2)
+        assert resolved.source == second
+        assert resolved.size == 4
+        assert resolved.mtime_ns == second.stat().st_mtime_ns
+
+    def test_unresolved_keeps_first_candidate(self, tmp_path):
+        missing = [tmp_path / "a.nii", tmp_path / "b.nii"]
+        resolved = resolve_import_plan([create_action(tmp_path / "out", *missing), create_action(tmp_path / "none")])
+        assert (resolved[0].source, resolved[0].size) == (missing[0], None)
+        assert (resolved[1].source, resolved[1].size) == (None, None)
+
+    def test_plan_frame(self, tmp_path):
+        source = tmp_path / "source.nii"
+        source.write_bytes(b"data")
+
+        def generate(old_path: Path, new_path: Path) -> None:
+            pass
+
+        actions = resolve_import_plan(
+            [create_action(tmp_path / "a", source), create_action(tmp_path / "b", copy_command=generate)]
+        )
+        frame = create_plan_frame(actions)
+        assert list(frame.columns) == PLAN_COLUMNS
+        assert frame["size"].tolist()[0] == 4
+        assert frame["size"].isna().tolist() == [False, True]
+        assert frame["copy_command"].isna().tolist() == [True, False]
+        assert frame["copy_command"].tolist()[1] == "generate"
+
+
+class TestDryRun:
+    def test_dry_run_imports_nothing(self, pia_source, tmp_path):
+        src_root, patients = pia_source
+        plan = import_dataset(tmp_path, src_root, patients, dry_run=True)
+        assert sorted(plan["subject"].unique()) == SUBJECTS
+        assert {"anat", "ct", "ieeg"} <= set(plan["modality"])
+        assert plan["size"].notna().any()
+        assert not list((tmp_path / "imported").rglob("*.nii*"))
+
+    def test_plan_matches_import(self, pia_source, tmp_path):
+        src_root, patients = pia_source
+        plan = import_dataset(tmp_path, src_root, patients, dry_run=True)
+        import_dataset(tmp_path, src_root, patients)
+        planned = {Path(p) for p in plan.loc[plan["size"].notna(), "destination"]}
+        assert planned
+        assert all(p.is_file() for p in planned)
+
+    def test_import_does_not_plan(self, pia_source, tmp_path, monkeypatch):
+        def plan_subjects(*args, **kwargs):
+            raise AssertionError("A real import resolves each subject as it imports it.")
+
+        src_root, patients = pia_source
+        monkeypatch.setattr(DatasetPiaImporter, "plan_subjects", plan_subjects)
+        results = import_dataset(tmp_path, src_root, patients, jobs=2)
+        assert all(r.succeeded for r in results)
+
+    def test_stat_jobs(self, pia_source, tmp_path, monkeypatch):
+        calls = []
+        prefetch = SourceInventory.prefetch
+
+        def record(self, paths, jobs=None):
+            calls.append(jobs)
+            return prefetch(self, paths, jobs)
+
+        src_root, patients = pia_source
+        monkeypatch.setattr(SourceInventory, "prefetch", record)
+        import_dataset(tmp_path, src_root, patients, dry_run=True, jobs=2, stat_jobs=4)
+        assert calls == [4]
@@ -0,0 +1,98 @@
+""" test_lazychildmap.py
+Tests of the lazy construction of the children of datasets, subjects, and sessions.
+"""
+# Imports #
+# Standard Libraries #
+from pathlib import Path
+
+import pytest
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.datasets import Dataset
+from ucsfbids.loading import LazyChildMap
+
+
+# Definitions #
+# Classes #
+class TestLazyChildMap:
+    def test_constructs_on_access(self):
+        constructed = []
+
+        def factory(path: Path) -> str:
+            constructed.append(path)
+            return path.name
+
+        children = LazyChildMap(factory=factory, paths={"a": Path("x/a"), "b": Path("x/b")})
+        assert len(children) == 2
+        assert "a" in children
+        assert not constructed
+
+        assert children["a"] == "a"
+        assert children["a"] == "a"
+        assert constructed == [Path("x/a")]
+        assert children.is_loaded("a")
+        assert children.unloaded_names() == ["b"]
+        assert dict(children.loaded_items()) == {"a": "a"}
+
+    def test_set_and_delete(self):
+        children = LazyChildMap(factory=lambda p: p.name, paths={"a": Path("a")})
+        children["b"] = "added"
+        assert list(children) == ["a", "b"]
+        assert children["b"] == "added"
+
+        del children["a"]
+        assert "a" not in children
+        with pytest.raises(KeyError):
+            children["a"]
+
+    def test_missing_without_factory(self):
+        children = LazyChildMap(paths={"a": Path("a")})
+        with pytest.raises(KeyError):
+            children["a"]
+        with pytest.raises(KeyError):
+            children["missing"]
+
+    @pytest.mark.parametrize("jobs", [None, 4])
+    def test_load_all(self, jobs):
+        paths = {f"c{i}": Path(f"c{i}") for i in range(10)}
+        children = LazyChildMap(factory=lambda p: p.name.upper(), paths=paths)
+        children.load_all(jobs=jobs)
+        assert not children.unloaded_names()
+        assert dict(children.loaded_items()) == {n: n.upper() for n in paths}
+        assert "loaded=" in repr(children)
+
+        children.clear()
+        assert len(children) == 0
+
+
+class TestLazyDataset:
+    def test_lazy_dataset(self, dataset_path, subject_names):
+        dataset = Dataset(dataset_path, lazy=True)
+        assert isinstance(dataset.subjects, LazyChildMap)
+        assert sorted(dataset.subjects) == subject_names
+        assert not any(dataset.subjects.is_loaded(n) for n in subject_names)
+
+        subject = dataset.subjects[subject_names[0]]
+        assert dataset.subjects.is_loaded(subject_names[0])
+        assert isinstance(subject.sessions, LazyChildMap)
+        session = subject.sessions["clinicalintracranial"]
+        assert isinstance(session.modalities, LazyChildMap)
+        assert sorted(session.modalities) == ["anat", "ct", "ieeg"]
+
+    def test_matches_eager_dataset(self, dataset_path):
+        lazy = Dataset(dataset_path, lazy=True)
+        eager = Dataset(dataset_path)
+        assert isinstance(eager.subjects, dict)
+        for name, subject in eager.subjects.items():
+            lazy_session = lazy.subjects[name].sessions["clinicalintracranial"]
+            session = subject.sessions["clinicalintracranial"]
+            assert sorted(lazy_session.modalities) == sorted(session.modalities)
+            assert lazy_session.path == session.path
+
+    def test_reload_eagerly(self, dataset_path, subject_names):
+        dataset = Dataset(dataset_path, lazy=True)
+        dataset.load_subjects(lazy=False)
+        assert isinstance(dataset.subjects, dict)
+        assert sorted(dataset.subjects) == subject_names
@@ -0,0 +1,104 @@
+""" test_metainfocache.py
+Tests of the shared cache of parsed meta information files.
+"""
+# Imports #
+# Standard Libraries #
+import json
+import os
+
+import pytest
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.datasets import Dataset
+from ucsfbids.loading import MetaInfoCache, meta_info_cache
+
+
+# Definitions #
+# Functions #
+def write_meta(path, info) -> None:
+    path.write_text(json.dumps(info))
+
+
+# Classes #
+class TestMetaInfoCache:
+    def test_parses_once(self, tmp_path):
+        path = tmp_path / "meta.json"
+        write_meta(path, {"a": 1})
+        cache = MetaInfoCache()
+        assert cache.get(path) == {"a": 1}
+        assert cache.get(path) is cache.get(path)
+        assert (cache.hits, cache.misses) == (2, 1)
+        assert len(cache) == 1
+
+    def test_reparses_changed_file(self, tmp_path):
+        path = tmp_path / "meta.json"
+        write_meta(path, {"a": 1})
+        cache = MetaInfoCache()
+        cache.get(path)
+        write_meta(path, {"a": 22})
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert cache.get(path) == {"a": 22}
+        assert cache.misses == 2
+
+    def test_copy_is_deep(self, tmp_path):
+        path = tmp_path / "meta.json"
+        write_meta(path, {"nested": {"a": 1}})
+        cache = MetaInfoCache()
+        copy = cache.get(path, copy=True)
+        copy["nested"]["a"] = 2
+        assert cache.get(path) == {"nested": {"a": 1}}
+        assert cache.get(path, copy=True) is not cache.get(path)
+
+    def test_put_stores_copy(self, tmp_path):
+        path = tmp_path / "meta.json"
+        info = {"nested": {"a": 1}}
+        write_meta(path, info)
+        cache = MetaInfoCache()
+        cache.put(path, info)
+        info["nested"]["a"] = 2
+        assert cache.get(path) == {"nested": {"a": 1}}
+        assert cache.misses == 0
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = MetaInfoCache(maxsize=2)
+        paths = [tmp_path / f"meta{i}.json" for i in range(3)]
+        for i, path in enumerate(paths):
+            write_meta(path, {"i": i})
+        cache.get(paths[0])
+        cache.get(paths[1])
+        cache.get(paths[0])
+        cache.get(paths[2])
+        assert len(cache) == 2
+        cache.get(paths[1])
+        assert cache.misses == 4
+
+    def test_invalidate_and_clear(self, tmp_path):
+        path = tmp_path / "meta.json"
+        write_meta(path, {})
+        cache = MetaInfoCache()
+        cache.get(path)
+        cache.invalidate(path)
+        assert len(cache) == 0
+        cache.get(path)
+        cache.clear()
+        assert (len(cache), cache.hits, cache.misses) == (0, 0, 0)
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            MetaInfoCache().get(tmp_path / "missing.json")
+
+
+class TestLoadMetaInfo:
+    def test_modalities_do_not_share_meta_info(self, dataset_path, subject_names):
+        meta_info_cache.clear()
+        first = Dataset(dataset_path).subjects[subject_names[0]].sessions["clinicalintracranial"].modalities["ieeg"]
+        second = Dataset(dataset_path).subjects[subject_names[0]].sessions["clinicalintracranial"].modalities["ieeg"]
+        write_meta(first.meta_info_path, {**json.loads(first.meta_info_path.read_text()), "Nested": {"a": 1}})
+
+        first.load_meta_info()["Nested"]["a"] = 2
+        assert second.load_meta_info()["Nested"] == {"a": 1}
+        assert meta_info_cache.get(first.meta_info_path)["Nested"] == {"a": 1}
+        assert meta_info_cache.hits > 0
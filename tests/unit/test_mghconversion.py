@@ -0,0 +1,113 @@
+""" test_mghconversion.py
+Tests of the in-process conversion of MGH/MGZ volumes to NIfTI.
+"""
+# Imports #
+# Standard Libraries #
+import gzip
+import struct
+
+import pytest
+
+# Third-Party Packages #
+import nibabel as nib
+import numpy as np
+
+# Local Packages #
+from ucsfbids.transfer import CommandError, MGHConverter, convert_mgh_to_nifti
+from ucsfbids.transfer.mghconversion import MGH_HEADER_FORMAT, MGH_HEADER_SIZE
+
+from ..synthetictrees import create_mgz
+
+
+# Definitions #
+# Functions #
+def write_mgh(path, data: np.ndarray, data_type: int, zooms=(1.0, 1.5, 2.0), version: int = 1) -> None:
+    """Writes an uncompressed MGH volume with a rotated direction matrix."""
+    mdc = np.array([[0.0, 1.0, 0.0], [-1.0, 0.0, 0.0], [0.0, 0.0, 1.0]])
+    fields = (version, *data.shape, 1, data_type, 0, 1, *zooms, *mdc.T.ravel(), 10.0, -5.0, 3.0)
+    header = struct.pack(MGH_HEADER_FORMAT, *fields).ljust(MGH_HEADER_SIZE, b"\0")
+    path.write_bytes(header + data.astype(data.dtype.newbyteorder(">")).tobytes(order="F"))
+
+
+# Classes #
+class TestConvertMGHToNifti:
+    @pytest.mark.parametrize("name", ["brain.nii", "brain.nii.gz"])
+    def test_matches_nibabel(self, tmp_path, name):
+        mgz_path = tmp_path / "brain.mgz"
+        create_mgz(mgz_path)
+        convert_mgh_to_nifti(mgz_path, tmp_path / name, threads=2)
+
+        expected = nib.load(mgz_path)
+        converted = nib.load(tmp_path / name)
+        np.testing.assert_array_equal(np.asanyarray(converted.dataobj), np.asanyarray(expected.dataobj))
+        np.testing.assert_allclose(converted.affine, expected.affine, atol=1e-4)
+        np.testing.assert_allclose(converted.header.get_zooms(), expected.header.get_zooms())
+
+    @pytest.mark.parametrize("data_type, dtype", [(3, np.float32), (4, np.int16), (1, np.int32)])
+    def test_data_types(self, tmp_path, data_type, dtype):
+        data = np.arange(4 * 5 * 6, dtype=dtype).reshape(4, 5, 6) - 7
+        write_mgh(tmp_path / "volume.mgh", data, data_type)
+        convert_mgh_to_nifti(tmp_path / "volume.mgh", tmp_path / "volume.nii")
+
+        expected = nib.load(tmp_path / "volume.mgh")
+        converted = nib.load(tmp_path / "volume.nii")
+        assert converted.get_data_dtype() == np.dtype(dtype)
+        np.testing.assert_array_equal(np.asanyarray(converted.dataobj), data)
+        np.testing.assert_allclose(converted.affine, expected.affine, atol=1e-4)
+
+    def test_unsupported_version(self, tmp_path):
+        write_mgh(tmp_path / "volume.mgh", np.zeros((2, 2, 2), dtype=np.uint8), 0, version=2)
+        with pytest.raises(ValueError, match="version"):
+            convert_mgh_to_nifti(tmp_path / "volume.mgh", tmp_path / "volume.nii")
+
+    def test_unsupported_data_type(self, tmp_path):
+        write_mgh(tmp_path / "volume.mgh", np.zeros((2, 2, 2), dtype=np.uint8), 99)
+        with pytest.raises(ValueError, match="data type"):
+            convert_mgh_to_nifti(tmp_path / "volume.mgh", tmp_path / "volume.nii")
+
+    def test_too_short(self, tmp_path):
+        (tmp_path / "volume.mgz").write_bytes(gzip.compress(b"short"))
+        with pytest.raises(ValueError, match="too short"):
+            convert_mgh_to_nifti(tmp_path / "volume.mgz", tmp_path / "volume.nii")
+
+    def test_truncated_volume(self, tmp_path):
+        write_mgh(tmp_path / "volume.mgh", np.zeros((8, 8, 8), dtype=np.uint8), 0)
+        data = (tmp_path / "volume.mgh").read_bytes()
+        (tmp_path / "volume.mgh").write_bytes(data[: MGH_HEADER_SIZE + 10])
+        with pytest.raises(EOFError):
+            convert_mgh_to_nifti(tmp_path / "volume.mgh", tmp_path / "volume.nii")
+
+
+class TestMGHConverter:
+    def test_converts_in_process(self, tmp_path):
+        create_mgz(tmp_path / "brain.mgz")
+        MGHConverter(fallback="false")(tmp_path / "brain.mgz", tmp_path / "brain.nii")
+        assert nib.load(tmp_path / "brain.nii").shape == (32, 32, 32)
+
+    def test_raises_without_fallback(self, tmp_path):
+        (tmp_path / "bad.mgz").write_bytes(gzip.compress(b"short"))
+        with pytest.raises(ValueError):
+            MGHConverter(fallback=None)(tmp_path / "bad.mgz", tmp_path / "bad.nii")
+
+    def test_runs_fallback(self, tmp_path):
+        (tmp_path / "bad.mgz").write_bytes(b"not a volume")
+        MGHConverter(fallback="cp")(tmp_path / "bad.mgz", tmp_path / "bad.nii")
+        assert (tmp_path / "bad.nii").read_bytes() == b"not a volume"
+
+    def test_failed_fallback(self, tmp_path):
+        (tmp_path / "bad.mgz").write_bytes(b"not a volume")
+        with pytest.raises(CommandError, match="return code 1") as error:
+            MGHConverter(fallback="false")(tmp_path / "bad.mgz", tmp_path / "bad.nii")
+        assert error.value.results[0].returncode == 1
+        assert not (tmp_path / "bad.nii").exists()
+
+    def test_missing_fallback(self, tmp_path):
+        (tmp_path / "bad.mgz").write_bytes(b"not a volume")
+        with pytest.raises(CommandError):
+            MGHConverter(fallback="ucsfbids-missing-command")(tmp_path / "bad.mgz", tmp_path / "bad.nii")
+        assert "fallback='ucsfbids-missing-command'" in repr(MGHConverter(fallback="ucsfbids-missing-command"))
+
+    def test_missing_volume(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            MGHConverter(fallback="touch")(tmp_path / "missing.mgz", tmp_path / "missing.nii")
+        assert not (tmp_path / "missing.nii").exists()
@@ -0,0 +1,71 @@
+""" test_modalityimports.py
+Tests of importing the modalities of a session concurrently and reporting their failures together.
+"""
+# Imports #
+# Standard Libraries #
+import threading
+import time
+
+import pytest
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.modalities.importers.pia import AnatomyPiaImporter, CTPiaImporter, IEEGPiaImporter
+
+from ..synthetictrees import PIA_DIRECTORY
+from .test_datasetpiaimporter import SUBJECTS, import_dataset, imported_files
+
+
+# Definitions #
+# Constants #
+IMPORTERS = (AnatomyPiaImporter, CTPiaImporter, IEEGPiaImporter)
+
+
+# Classes #
+class TestModalityImports:
+    def test_concurrent_matches_serial(self, pia_source, tmp_path):
+        src_root, patients = pia_source
+        (tmp_path / "serial").mkdir()
+        (tmp_path / "concurrent").mkdir()
+        import_dataset(tmp_path / "serial", src_root, patients)
+        results = import_dataset(tmp_path / "concurrent", src_root, patients, modality_jobs=3)
+        assert all(r.succeeded for r in results)
+        assert imported_files(tmp_path / "serial" / "imported") == imported_files(tmp_path / "concurrent" / "imported")
+
+    @pytest.mark.parametrize("modality_jobs, expected", [(None, 1), (3, 3)])
+    def test_modalities_overlap(self, pia_source, tmp_path, monkeypatch, modality_jobs, expected):
+        src_root, patients = pia_source
+        running, peak, lock = [0], [0], threading.Lock()
+
+        def track(execute_import):
+            def tracked(self, *args, **kwargs):
+                with lock:
+                    running[0] += 1
+                    peak[0] = max(peak[0], running[0])
+                time.sleep(0.1)
+                try:
+                    return execute_import(self, *args, **kwargs)
+                finally:
+                    with lock:
+                        running[0] -= 1
+
+            return tracked
+
+        for importer in IMPORTERS:
+            monkeypatch.setattr(importer, "execute_import", track(importer.execute_import))
+        import_dataset(tmp_path, src_root, patients[:1], modality_jobs=modality_jobs)
+        assert peak[0] == expected
+
+    @pytest.mark.parametrize("modality_jobs", [None, 3])
+    def test_failed_modality_does_not_stop_others(self, pia_source, tmp_path, modality_jobs):
+        src_root, patients = pia_source
+        (src_root / PIA_DIRECTORY / patients[0] / "elecs" / "clinical_elecs_all.mat").write_bytes(b"not a mat file")
+
+        results = import_dataset(tmp_path, src_root, patients[:1], modality_jobs=modality_jobs)
+        assert [(r.name, r.succeeded) for r in results] == [(SUBJECTS[0], False)]
+        assert "Failed to import the modalities ['ieeg']" in results[0].error
+
+        session_path = tmp_path / "imported" / f"sub-{SUBJECTS[0]}" / "ses-clinicalintracranial"
+        assert list((session_path / "anat").glob("*_T1w.nii.gz"))
+        assert list((session_path / "ct").glob("*_CT.nii"))
@@ -0,0 +1,138 @@
+""" test_namematcher.py
+Tests of the compiled include and exclude file name rules of the exporters and importers.
+"""
+# Imports #
+# Standard Libraries #
+import pytest
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.datasets import Dataset
+from ucsfbids.transfer import NameMatcher, compile_name_matcher
+from ucsfbids.transfer.namematcher import compile_rule, compile_rules
+
+from ..synthetictrees import SESSION_NAME
+
+
+# Definitions #
+# Constants #
+NAMES = [
+    "sub-1_ses-1_ieeg.json",
+    "sub-1_ses-1_ieeg-meta.json",
+    "sub-1_ses-1_electrodes.tsv",
+    "sub-1_ses-1_coordsystem.json",
+    "sub-1_ses-1_acq-photo_photo.jpg",
+    "sub-1_ses-1_acq-photos_photo.jpg",
+    "sub-1_ses-1_CT.nii",
+]
+
+
+# Functions #
+@pytest.fixture
+def ieeg(dataset_path, subject_names):
+    return Dataset(dataset_path).subjects[subject_names[0]].sessions[SESSION_NAME].modalities["ieeg"]
+
+
+# Classes #
+class TestCompileRule:
+    @pytest.mark.parametrize(
+        "rule, name, matches",
+        [
+            ("ieeg", "sub-1_ieeg.json", True),
+            ("ieeg", "sub-1_CT.nii", False),
+            ("a.b", "a.b", True),
+            ("a.b", "axb", False),
+            ("glob:*_ieeg.json", "sub-1_ieeg.json", True),
+            ("glob:*_ieeg.json", "sub-1_ieeg.json.gz", False),
+            ("glob:sub-?_CT.nii", "sub-1_CT.nii", True),
+            ("glob:sub-?_CT.nii", "xsub-1_CT.nii", False),
+            ("entity:acq-photo", "sub-1_acq-photo_photo.jpg", True),
+            ("entity:acq-photo", "sub-1_acq-photos_photo.jpg", False),
+            ("entity:ieeg", "sub-1_ieeg.json", True),
+            ("entity:ieeg", "sub-1_ieeg-meta.json", False),
+            ("entity:sub-1", "sub-1_CT.nii", True),
+            ("entity:sub-1", "xsub-1_CT.nii", False),
+        ],
+    )
+    def test_rule(self, rule, name, matches):
+        assert NameMatcher([rule]).match(name) == matches
+
+    def test_compile_rule(self):
+        assert compile_rule("a.b") == r"a\.b"
+        assert compile_rule("glob:*.json").startswith("^")
+
+    def test_compile_rules(self):
+        assert compile_rules([]) is None
+        pattern = compile_rules(["ieeg", "ieeg-meta", "CT"])
+        assert pattern.search("sub-1_ieeg-meta.json").group() == "ieeg-meta"
+        assert pattern.search("sub-1_electrodes.tsv") is None
+
+
+class TestNameMatcher:
+    @pytest.mark.parametrize(
+        "include, exclude",
+        [
+            (None, []),
+            (None, ["-meta"]),
+            (["ieeg", "electrodes", "photo"], []),
+            (["ieeg", "electrodes", "photo"], ["-meta"]),
+            (["ieeg", "ieeg-meta"], ["photos", "CT"]),
+            ([], []),
+        ],
+    )
+    def test_matches_substring_rules(self, include, exclude):
+        """The compiled substring rules match exactly the names the rules matched one by one."""
+        matcher = NameMatcher(include, exclude)
+        expected = [
+            n
+            for n in NAMES
+            if (include is None or any(r in n for r in include)) and not any(r in n for r in exclude)
+        ]
+        assert [n for n in NAMES if matcher.match(n)] == expected
+        assert list(matcher.filter(NAMES)) == expected
+
+    def test_mixed_rules(self):
+        matcher = NameMatcher(["glob:*.json", "entity:acq-photo"], ["-meta"])
+        assert list(matcher.filter(NAMES)) == [
+            "sub-1_ses-1_ieeg.json",
+            "sub-1_ses-1_coordsystem.json",
+            "sub-1_ses-1_acq-photo_photo.jpg",
+        ]
+
+    def test_empty_include_matches_nothing(self):
+        assert list(NameMatcher([]).filter(NAMES)) == []
+        assert list(NameMatcher().filter(NAMES)) == NAMES
+
+    def test_rules_are_frozen(self):
+        include = ["ieeg"]
+        matcher = NameMatcher(include, {"-meta"})
+        include.append("CT")
+        assert matcher.include == frozenset({"ieeg"}) and matcher.exclude == frozenset({"-meta"})
+        assert not matcher.match("sub-1_CT.nii")
+
+
+class TestCompileNameMatcher:
+    def test_cached_by_rules(self):
+        matcher = compile_name_matcher(["ieeg", "photo"], {"-meta"})
+        assert compile_name_matcher({"photo", "ieeg"}, ["-meta", "-meta"]) is matcher
+        assert compile_name_matcher(["ieeg"], {"-meta"}) is not matcher
+        assert compile_name_matcher(None, {"-meta"}) is not compile_name_matcher([], {"-meta"})
+        assert compile_name_matcher().include is None
+
+
+class TestModalityExporterNames:
+    def test_list_files(self, ieeg):
+        exporter = ieeg.create_exporter("BIDS")
+        names = sorted(p.name for p in ieeg.path.iterdir())
+        assert any(n.endswith("-meta.json") for n in names)
+        assert sorted(p.name for p in exporter.list_files()) == [n for n in names if "-meta" not in n]
+        assert exporter.create_name_matcher() is exporter.create_name_matcher()
+
+    def test_list_select_files(self, ieeg):
+        exporter = ieeg.create_exporter("BIDS")
+        (ieeg.path / "notes.txt").write_text("notes")
+        assert "notes.txt" in [p.name for p in exporter.list_files()]
+        selected = [p.name for p in exporter.list_files(select=True)]
+        assert selected and "notes.txt" not in selected
+        assert not any("-meta" in n for n in selected)
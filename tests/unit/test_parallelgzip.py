@@ -0,0 +1,52 @@
+""" test_parallelgzip.py
+Tests of the gzip writer which compresses blocks across a pool of threads.
+"""
+# Imports #
+# Standard Libraries #
+import gzip
+import io
+import os
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.transfer import ParallelGzipWriter
+from ucsfbids.transfer.parallelgzip import compress_member
+
+
+# Definitions #
+# Classes #
+class TestParallelGzipWriter:
+    def test_round_trip(self, tmp_path):
+        data = os.urandom(100_000) + bytes(100_000)
+        path = tmp_path / "data.gz"
+        with ParallelGzipWriter(path, level=1, block_size=16_384, threads=4) as writer:
+            for start in range(0, len(data), 7_000):
+                assert writer.write(memoryview(data)[start : start + 7_000]) == len(data[start : start + 7_000])
+        assert gzip.decompress(path.read_bytes()) == data
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.gz"
+        ParallelGzipWriter(path).close()
+        assert gzip.decompress(path.read_bytes()) == b""
+
+    def test_file_object_is_left_open(self):
+        file = io.BytesIO()
+        writer = ParallelGzipWriter(file, block_size=4, threads=2)
+        writer.write(b"0123456789")
+        writer.close()
+        writer.close()
+        assert not file.closed
+        assert gzip.decompress(file.getvalue()) == b"0123456789"
+
+    def test_flush_writes_buffered_data(self):
+        file = io.BytesIO()
+        with ParallelGzipWriter(file, block_size=1024) as writer:
+            writer.write(b"partial")
+            writer.flush()
+            assert gzip.decompress(file.getvalue()) == b"partial"
+            writer.write(b" more")
+        assert gzip.decompress(file.getvalue()) == b"partial more"
+
+    def test_compress_member(self):
+        assert gzip.decompress(compress_member(b"data" * 10, level=9)) == b"data" * 10
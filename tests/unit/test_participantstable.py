@@ -0,0 +1,83 @@
+""" test_participantstable.py
+Tests of the buffered participants table and of adding imported subjects to it.
+"""
+# Imports #
+# Standard Libraries #
+from types import SimpleNamespace
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.datasets import ParticipantsTable
+from ucsfbids.datasets.importers.pia import DatasetPiaImporter
+
+from .test_datasetpiaimporter import SUBJECTS, import_dataset
+
+
+# Definitions #
+# Classes #
+class TestParticipantsTable:
+    def test_upsert_and_save(self, tmp_path):
+        table = ParticipantsTable(tmp_path / "participants.tsv")
+        table.upsert("EC0001", age=30)
+        table.upsert("EC0002", sex="F")
+        table.upsert("EC0001", sex="M")
+        assert len(table) == 2 and "EC0001" in table
+        assert table.get("EC0001") == {"age": 30, "sex": "M"}
+        assert table.get("missing") is None
+        table.save()
+
+        lines = (tmp_path / "participants.tsv").read_text().splitlines()
+        assert lines == ["participant_id\tage\tsex", "EC0001\t30\tM", "EC0002\tn/a\tF"]
+        assert not list(tmp_path.glob(".*.tmp"))
+
+    def test_load(self, tmp_path):
+        (tmp_path / "participants.tsv").write_text("participant_id\tage\nEC0001\t30\nEC0002\tn/a\n")
+        table = ParticipantsTable(tmp_path / "participants.tsv")
+        assert table.columns == ["participant_id", "age"]
+        assert table.rows == {"EC0001": {"age": "30"}, "EC0002": {}}
+
+    def test_load_merges_legacy_rows(self, tmp_path):
+        # Older imports wrote a pandas index and listed a participant again each time it was imported.
+        (tmp_path / "participants.tsv").write_text("\tparticipant_id\tage\n0\tEC0001\t\n1\tEC0002\t40\n2\tEC0001\t30\n")
+        table = ParticipantsTable(tmp_path / "participants.tsv")
+        assert table.columns == ["participant_id", "age"]
+        assert table.rows == {"EC0001": {"age": "30"}, "EC0002": {"age": "40"}}
+        table.save()
+        assert (tmp_path / "participants.tsv").read_text() == "participant_id\tage\nEC0001\t30\nEC0002\t40\n"
+
+    def test_missing_file(self, tmp_path):
+        table = ParticipantsTable(tmp_path / "participants.tsv")
+        assert len(table) == 0 and table.columns == ["participant_id"]
+
+    def test_remove_and_frame(self, tmp_path):
+        table = ParticipantsTable(tmp_path / "participants.tsv")
+        table.upsert("EC0001", age=30)
+        table.upsert("EC0002")
+        assert table.remove("EC0002") == {}
+        assert table.remove("EC0002") is None
+        assert table.to_frame().to_dict("records") == [{"participant_id": "EC0001", "age": 30}]
+
+    def test_upsert_subject(self, tmp_path):
+        subject = SimpleNamespace(name="EC0001", meta_info={"Age": 30, "Sex": "F", "Other": 1})
+        table = ParticipantsTable(tmp_path / "participants.tsv")
+        table.upsert_subject(subject, {"Age": "age", "Missing": "missing"})
+        table.upsert_subject(subject, ["Sex"])
+        assert table.columns == ["participant_id", "age", "Sex"]
+        assert table.get("EC0001") == {"age": 30, "Sex": "F"}
+
+
+class TestImportedParticipants:
+    def test_imported_subjects_are_listed_once(self, pia_source, tmp_path):
+        src_root, patients = pia_source
+        import_dataset(tmp_path, src_root, patients)
+        import_dataset(tmp_path, src_root, patients, overwrite=True)
+        lines = (tmp_path / "imported" / "participants.tsv").read_text().splitlines()
+        assert lines == ["participant_id", *SUBJECTS]
+
+    def test_meta_columns(self, pia_source, tmp_path, monkeypatch):
+        src_root, patients = pia_source
+        monkeypatch.setattr(DatasetPiaImporter, "participant_meta_columns", {"SubjectNamespace": "namespace"})
+        import_dataset(tmp_path, src_root, patients[:1])
+        path = tmp_path / "imported" / "participants.tsv"
+        assert path.read_text() == f"participant_id\tnamespace\n{SUBJECTS[0]}\tn/a\n"
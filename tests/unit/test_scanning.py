@@ -0,0 +1,70 @@
+""" test_scanning.py
+Tests of the directory scanning and concurrent construction of the dataset tree.
+"""
+# Imports #
+# Standard Libraries #
+import os
+from pathlib import Path
+
+import pytest
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.datasets import Dataset
+from ucsfbids.loading import construct_children, is_child_directory, scan_directories, stat_paths
+
+
+# Definitions #
+# Classes #
+class TestScanning:
+    def test_scan_directories(self, tmp_path):
+        for name in ("sub-A", "sub-B.d", ".hidden"):
+            (tmp_path / name).mkdir()
+        (tmp_path / "sub-file.txt").write_text("")
+
+        assert scan_directories(tmp_path, prefix=4) == {"A": tmp_path / "sub-A", "B": tmp_path / "sub-B.d"}
+        assert set(scan_directories(tmp_path, hidden=True)) == {"sub-A", "sub-B", ".hidden"}
+
+    def test_is_child_directory(self, tmp_path):
+        (tmp_path / ".hidden").mkdir()
+        (tmp_path / "file").write_text("")
+        with os.scandir(tmp_path) as it:
+            entries = {e.name: e for e in it}
+        assert not is_child_directory(entries[".hidden"])
+        assert is_child_directory(entries[".hidden"], hidden=True)
+        assert not is_child_directory(entries["file"], hidden=True)
+
+    @pytest.mark.parametrize("jobs", [None, 1, 4])
+    def test_construct_children(self, jobs):
+        paths = {f"c{i}": Path(f"c{i}") for i in range(8)}
+        children = construct_children(lambda p: p.name * 2, paths, jobs=jobs)
+        assert list(children) == list(paths)
+        assert children == {n: n * 2 for n in paths}
+
+    def test_construct_children_raises(self):
+        def factory(path: Path) -> None:
+            raise ValueError(path)
+
+        with pytest.raises(ValueError):
+            construct_children(factory, {"a": Path("a"), "b": Path("b")}, jobs=2)
+
+    @pytest.mark.parametrize("jobs", [None, 4])
+    def test_stat_paths(self, tmp_path, jobs):
+        existing = tmp_path / "file"
+        existing.write_text("data")
+        missing = tmp_path / "missing"
+        stats = stat_paths([existing, missing, existing, existing / "child"], jobs=jobs)
+        assert list(stats) == [existing, missing, existing / "child"]
+        assert stats[existing].st_size == 4
+        assert stats[missing] is None and stats[existing / "child"] is None
+
+
+class TestParallelLoading:
+    def test_parallel_load_matches_serial(self, dataset_path, subject_names):
+        serial = Dataset(dataset_path)
+        parallel = Dataset(dataset_path, jobs=4)
+        assert list(parallel.subjects) == list(serial.subjects)
+        assert sorted(parallel.subjects) == subject_names
+        for name, subject in parallel.subjects.items():
+            assert list(subject.sessions) == list(serial.subjects[name].sessions)
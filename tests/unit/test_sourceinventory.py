@@ -0,0 +1,94 @@
+""" test_sourceinventory.py
+Tests of the inventory of a Pia source tree which is listed once instead of stated file by file.
+"""
+# Imports #
+# Standard Libraries #
+import pickle
+
+import pytest
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.importspec import FileSpec, ImportAction, resolve_import_plan
+from ucsfbids.transfer import InventoryEntry, SourceInventory
+
+from ..synthetictrees import PIA_DIRECTORY
+
+
+# Definitions #
+# Classes #
+class TestSourceInventory:
+    def test_list_patients(self, pia_source):
+        src_root, patients = pia_source
+        (src_root / PIA_DIRECTORY / ".hidden").mkdir()
+        (src_root / PIA_DIRECTORY / "file").write_text("")
+        assert sorted(SourceInventory(src_root / PIA_DIRECTORY).list_patients()) == patients
+
+    @pytest.mark.parametrize("jobs", [None, 4])
+    def test_crawl(self, pia_source, jobs):
+        src_root, patients = pia_source
+        root = src_root / PIA_DIRECTORY
+        inventory = SourceInventory(root)
+        assert inventory.crawl(recursive=True, jobs=jobs) == len(patients) * 5
+        assert len(inventory) == len(patients) * 5
+
+        ct_path = root / patients[0] / "CT" / "CT.nii"
+        stat = ct_path.stat()
+        assert inventory.stat(ct_path) == InventoryEntry(stat.st_size, stat.st_mtime_ns)
+        assert inventory.get(patients[0], "CT/CT.nii") == inventory.stat(ct_path)
+
+    def test_crawl_directories(self, pia_source):
+        src_root, patients = pia_source
+        inventory = SourceInventory(src_root / PIA_DIRECTORY)
+        assert inventory.crawl(patients=patients[:1], directories=["CT", "missing"]) == 2
+        assert inventory.listings[src_root / PIA_DIRECTORY / patients[0] / "missing"] is None
+        assert len(inventory) == 2
+
+    def test_lookups_list_on_demand(self, pia_source):
+        src_root, patients = pia_source
+        inventory = SourceInventory(src_root / PIA_DIRECTORY)
+        assert inventory.get(patients[0], "CT/CT.json") is not None
+        assert inventory.get(patients[0], "CT/missing.nii") is None
+        assert inventory.get(patients[0], "missing/CT.nii") is None
+        assert inventory.get(patients[0], "CT") is None
+        patient_path = src_root / PIA_DIRECTORY / patients[0]
+        assert set(inventory.listings) == {patient_path / "CT", patient_path / "missing", patient_path}
+
+    def test_paths_outside_patients(self, pia_source, tmp_path):
+        src_root, _ = pia_source
+        inventory = SourceInventory(src_root / PIA_DIRECTORY)
+        outside = tmp_path / "outside"
+        outside.write_bytes(b"data")
+        assert not inventory.covers(outside)
+        assert inventory.stat(outside).size == 4
+        assert inventory.stat(tmp_path) is None
+        assert inventory.stat(tmp_path / "missing") is None
+
+    def test_inventory_is_a_snapshot(self, pia_source):
+        src_root, patients = pia_source
+        inventory = SourceInventory(src_root / PIA_DIRECTORY)
+        inventory.crawl(recursive=True)
+        (src_root / PIA_DIRECTORY / patients[0] / "CT" / "new.nii").write_bytes(b"")
+        assert inventory.get(patients[0], "CT/new.nii") is None
+
+    def test_select_and_pickle(self, pia_source):
+        src_root, patients = pia_source
+        inventory = SourceInventory(src_root / PIA_DIRECTORY)
+        inventory.crawl(recursive=True)
+        selected = pickle.loads(pickle.dumps(inventory.select(patients[:1])))
+        assert 0 < len(selected) < len(inventory)
+        assert selected.get(patients[0], "CT/CT.nii") == inventory.get(patients[0], "CT/CT.nii")
+
+    def test_prefetch_resolves_plan(self, pia_source):
+        src_root, patients = pia_source
+        root = src_root / PIA_DIRECTORY
+        candidates = (root / patients[0] / "CT" / "missing.nii", root / patients[0] / "CT" / "CT.nii")
+        action = ImportAction(FileSpec("CT", ".nii", list(candidates)), root / "out", candidates)
+
+        inventory = SourceInventory(root)
+        assert inventory.prefetch(candidates, jobs=2) == 1
+        assert inventory.prefetch(candidates) == 0
+        (resolved,) = resolve_import_plan([action], inventory=inventory)
+        assert resolved == resolve_import_plan([action])[0]
+        assert resolved.source == candidates[1]
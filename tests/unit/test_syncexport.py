@@ -0,0 +1,125 @@
+""" test_syncexport.py
+Tests of syncing an export with only the files which changed and pruning the files which are no longer exported.
+"""
+# Imports #
+# Standard Libraries #
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.datasets import Dataset
+from ucsfbids.modalities.exporters.modalitybidsexporter import ModalityBIDSExporter
+
+
+# Definitions #
+# Functions #
+def export_dataset(dataset_path: Path, export_path: Path, sub_name_map: dict | None = None, **kwargs) -> Path:
+    dataset = Dataset(dataset_path)
+    if sub_name_map is None:
+        sub_name_map = {name: name for name in dataset.subjects}
+    dataset.create_exporter("BIDS", **kwargs).execute_export(export_path, "exported", sub_name_map)
+    return export_path / "exported"
+
+
+def touch_later(path: Path, ns: int = 1_000_000_000) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + ns))
+
+
+@pytest.fixture
+def exported_names(monkeypatch) -> list[str]:
+    """Records the names of the files which the modality exporters export."""
+    names = []
+    export_file = ModalityBIDSExporter._export_file
+
+    def record(self, old_path, new_path, manifest):
+        names.append(new_path.name)
+        return export_file(self, old_path, new_path, manifest)
+
+    monkeypatch.setattr(ModalityBIDSExporter, "_export_file", record)
+    return names
+
+
+# Classes #
+class TestSyncExport:
+    def test_unchanged_export_is_skipped(self, dataset_path, tmp_path, exported_names):
+        export_dataset(dataset_path, tmp_path, sync=True)
+        assert exported_names
+        exported_names.clear()
+        export_dataset(dataset_path, tmp_path, sync=True)
+        assert exported_names == []
+
+    def test_changed_sources_are_exported(self, dataset_path, tmp_path, exported_names):
+        export_path = export_dataset(dataset_path, tmp_path, sync=True)
+        source = next(dataset_path.glob("sub-*/ses-*/ct/*_CT.nii"))
+        target = export_path / source.relative_to(dataset_path)
+        source.write_bytes(b"changed")
+        touch_later(source)
+        exported_names.clear()
+
+        export_dataset(dataset_path, tmp_path)
+        assert exported_names == [] and target.read_bytes() != b"changed"
+        export_dataset(dataset_path, tmp_path, sync=True)
+        assert exported_names == [target.name]
+        assert target.read_bytes() == b"changed"
+
+    def test_damaged_targets_are_exported(self, dataset_path, tmp_path, exported_names):
+        export_path = export_dataset(dataset_path, tmp_path, sync=True)
+        target = next(export_path.glob("sub-*/ses-*/ct/*_CT.nii"))
+        size = target.stat().st_size
+        with target.open("r+b") as file:
+            file.truncate(size // 2)
+        exported_names.clear()
+        export_dataset(dataset_path, tmp_path, sync=True)
+        assert exported_names == [target.name]
+        assert target.stat().st_size == size
+
+    def test_dataset_files_are_synced(self, dataset_path, tmp_path):
+        export_path = export_dataset(dataset_path, tmp_path, sync=True)
+        participants = export_path / "participants.tsv"
+        assert participants.stat().st_mtime_ns == (dataset_path / "participants.tsv").stat().st_mtime_ns
+
+        (dataset_path / "participants.tsv").write_text("participant_id\nchanged\n")
+        touch_later(dataset_path / "participants.tsv")
+        export_dataset(dataset_path, tmp_path, sync=True)
+        assert participants.read_text() == "participant_id\nchanged\n"
+
+
+class TestPruneExport:
+    def test_removed_sources_are_pruned(self, dataset_path, tmp_path):
+        export_path = export_dataset(dataset_path, tmp_path, sync=True, prune=True)
+        source = next(dataset_path.glob("sub-*/ses-*/ct/*_CT.json"))
+        target = export_path / source.relative_to(dataset_path)
+        unrecorded = target.with_name("notes.txt")
+        unrecorded.write_text("kept")
+        source.unlink()
+
+        export_dataset(dataset_path, tmp_path, sync=True)
+        assert target.is_file()
+        export_dataset(dataset_path, tmp_path, sync=True, prune=True)
+        assert not target.exists()
+        assert unrecorded.is_file()
+        assert target.name not in (target.parent / ModalityBIDSExporter.manifest_name).read_text()
+
+    def test_removed_subjects_are_pruned(self, dataset_path, subject_names, tmp_path):
+        export_path = export_dataset(dataset_path, tmp_path, sync=True, prune=True)
+        removed = export_path / f"sub-{subject_names[0]}"
+        (removed / "notes.txt").write_text("kept")
+        shutil.rmtree(dataset_path / f"sub-{subject_names[0]}")
+
+        export_dataset(dataset_path, tmp_path, sync=True, prune=True)
+        assert [p.name for p in removed.rglob("*")] == ["notes.txt"]
+        assert all((export_path / f"sub-{name}").is_dir() for name in subject_names[1:])
+
+    def test_renamed_subjects_are_pruned(self, dataset_path, subject_names, tmp_path):
+        export_path = export_dataset(dataset_path, tmp_path, sync=True, prune=True)
+        sub_name_map = {name: name for name in subject_names}
+        sub_name_map[subject_names[0]] = "renamed"
+        export_dataset(dataset_path, tmp_path, sub_name_map, sync=True, prune=True)
+        assert not (export_path / f"sub-{subject_names[0]}").exists()
+        assert list((export_path / "sub-renamed").glob("ses-*/ct/sub-renamed_*_CT.nii"))
@@ -0,0 +1,133 @@
+""" test_transfermanifest.py
+Tests of the manifests which record transferred files and of re-importing only the files which changed.
+"""
+# Imports #
+# Standard Libraries #
+import os
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.transfer import TransferManifest, hash_file, prune_manifests, verify_manifests
+
+from ..synthetictrees import PIA_DIRECTORY
+from .test_datasetpiaimporter import import_dataset
+
+
+# Definitions #
+# Functions #
+def touch_later(path, ns: int = 1_000_000_000) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + ns))
+
+
+# Classes #
+class TestTransferManifest:
+    def test_record_and_reload(self, tmp_path):
+        source, target = tmp_path / "source", tmp_path / "out" / "target"
+        target.parent.mkdir()
+        source.write_bytes(b"data")
+        target.write_bytes(b"data")
+
+        manifest = TransferManifest(target.parent / "manifest.json")
+        record = manifest.record(source, target)
+        assert record.hash == hash_file(target, manifest.algorithm)
+        assert manifest.key(target) == "target"
+        assert manifest.is_current(source, target)
+        manifest.save()
+
+        loaded = TransferManifest(manifest.path)
+        assert loaded.records == manifest.records
+        assert loaded.target_path("target") == target
+
+    def test_record_without_hash(self, tmp_path):
+        source = tmp_path / "source"
+        source.write_bytes(b"data")
+        manifest = TransferManifest(tmp_path / "manifest.json")
+        assert manifest.record(source, source, hash_target=False).hash is None
+        assert manifest.record(source, source, hash_="given").hash == "given"
+
+    def test_is_current_detects_changes(self, tmp_path):
+        source, target = tmp_path / "source", tmp_path / "target"
+        source.write_bytes(b"data")
+        target.write_bytes(b"data")
+        manifest = TransferManifest(tmp_path / "manifest.json")
+        assert not manifest.is_current(source, target)
+        manifest.record(source, target)
+
+        stat = source.stat()
+        assert manifest.is_current(source, target, stat.st_size, stat.st_mtime_ns)
+        assert not manifest.is_current(source, target, stat.st_size + 1, stat.st_mtime_ns)
+
+        target.write_bytes(b"da")
+        assert not manifest.is_current(source, target)
+        target.write_bytes(b"data")
+        touch_later(source)
+        assert not manifest.is_current(source, target)
+        target.unlink()
+        assert not manifest.is_current(source, target)
+
+    def test_remove(self, tmp_path):
+        source = tmp_path / "source"
+        source.write_bytes(b"data")
+        manifest = TransferManifest(tmp_path / "manifest.json")
+        manifest.record(source, source)
+        assert manifest.remove(source) is not None
+        assert manifest.remove(source) is None
+
+    def test_verify(self, tmp_path):
+        files = {name: tmp_path / name for name in ("a", "b", "c", "unhashed")}
+        manifest = TransferManifest(tmp_path / "manifest.json")
+        for name, path in files.items():
+            path.write_bytes(name.encode())
+            manifest.record(path, path, hash_target=name != "unhashed")
+        files["a"].write_bytes(b"changed")
+        files["b"].unlink()
+        files["unhashed"].write_bytes(b"changed")
+        assert sorted(manifest.verify(jobs=2)) == ["a", "b"]
+        assert verify_manifests([manifest])[manifest.path] == manifest.verify()
+
+    def test_prune_manifests(self, tmp_path):
+        directory = tmp_path / "export" / "sub"
+        directory.mkdir(parents=True)
+        recorded, kept = directory / "recorded", tmp_path / "export" / "kept"
+        recorded.write_bytes(b"data")
+        kept.write_bytes(b"data")
+        manifest = TransferManifest(directory / "manifest.json")
+        manifest.record(recorded, recorded)
+        manifest.save()
+
+        assert prune_manifests(tmp_path / "export", "manifest.json") == [recorded]
+        assert not directory.exists()
+        assert kept.is_file()
+
+
+class TestIncrementalImport:
+    def test_reimports_changed_files(self, pia_source, tmp_path):
+        src_root, patients = pia_source
+        import_dataset(tmp_path, src_root, patients)
+        ct_source = src_root / PIA_DIRECTORY / patients[0] / "CT" / "CT.nii"
+        ct_path = tmp_path / "imported" / "sub-EC0001" / "ses-clinicalintracranial" / "ct"
+        ct_target = next(ct_path.glob("*_CT.nii"))
+        manifests = list(ct_path.glob("*-import-meta.json"))
+        assert len(manifests) == 1
+
+        anat_targets = sorted((tmp_path / "imported").glob("sub-*/ses-*/anat/*.nii.gz"))
+        anat_times = [p.stat().st_mtime_ns for p in anat_targets]
+        ct_source.write_bytes(b"changed")
+        results = import_dataset(tmp_path, src_root, patients, overwrite=True)
+
+        assert all(r.succeeded for r in results)
+        assert ct_target.read_bytes() == b"changed"
+        assert [p.stat().st_mtime_ns for p in anat_targets] == anat_times
+
+    def test_reimports_damaged_files(self, pia_source, tmp_path):
+        src_root, patients = pia_source
+        import_dataset(tmp_path, src_root, patients)
+        ct_target = next((tmp_path / "imported").glob("sub-EC0001/ses-*/ct/*_CT.nii"))
+        size = ct_target.stat().st_size
+        with ct_target.open("r+b") as file:
+            file.truncate(size // 2)
+
+        import_dataset(tmp_path, src_root, patients, overwrite=True)
+        assert ct_target.stat().st_size == size
@@ -0,0 +1,83 @@
+""" test_viewexport.py
+Tests of exporting a dataset as a view of links to its files instead of copies.
+"""
+# Imports #
+# Standard Libraries #
+import errno
+import os
+from pathlib import Path
+
+# Third-Party Packages #
+
+# Local Packages #
+from ucsfbids.datasets import Dataset
+from ucsfbids.transfer import copyengine
+
+from ..synthetictrees import SESSION_NAME
+
+
+# Definitions #
+# Functions #
+def export_view(dataset_path: Path, export_path: Path, **kwargs) -> Path:
+    dataset = Dataset(dataset_path)
+    exporter = dataset.create_exporter("BIDS", view=True, **kwargs)
+    exporter.execute_export(export_path, "view", {name: name for name in dataset.subjects})
+    return export_path / "view"
+
+
+def modality_files(path: Path) -> list[Path]:
+    return sorted(p for p in path.glob("sub-*/ses-*/*/*") if not p.name.startswith("."))
+
+
+# Classes #
+class TestViewExport:
+    def test_hardlinks_files(self, dataset_path, tmp_path):
+        view_path = export_view(dataset_path, tmp_path)
+        files = modality_files(view_path)
+        assert files
+        for path in files:
+            source = dataset_path / path.relative_to(view_path)
+            assert os.path.samefile(path, source)
+            assert not path.is_symlink()
+
+    def test_copies_dataset_files(self, dataset_path, tmp_path):
+        view_path = export_view(dataset_path, tmp_path)
+        participants = view_path / "participants.tsv"
+        assert participants.read_bytes() == (dataset_path / "participants.tsv").read_bytes()
+        assert not os.path.samefile(participants, dataset_path / "participants.tsv")
+
+    def test_sidecars_are_linked_unchanged(self, dataset_path, tmp_path):
+        view_path = export_view(dataset_path, tmp_path)
+        sidecar = next(view_path.glob(f"sub-*/ses-{SESSION_NAME}/anat/*_T1w.json"))
+        assert sidecar.read_bytes() == (dataset_path / sidecar.relative_to(view_path)).read_bytes()
+
+    def test_symlinks_across_file_systems(self, dataset_path, tmp_path, monkeypatch):
+        def link(*args):
+            raise OSError(errno.EXDEV, "cross-device link")
+
+        monkeypatch.setattr(copyengine.os, "link", link)
+        view_path = export_view(dataset_path, tmp_path)
+        files = modality_files(view_path)
+        assert files and all(p.is_symlink() for p in files)
+        assert all(p.resolve() == (dataset_path / p.relative_to(view_path)).resolve() for p in files)
+
+    def test_sync_replaces_links(self, dataset_path, tmp_path):
+        view_path = export_view(dataset_path, tmp_path, sync=True)
+        source = next(dataset_path.glob("sub-*/ses-*/ct/*_CT.nii"))
+        target = view_path / source.relative_to(dataset_path)
+        assert os.path.samefile(source, target)
+
+        # A source replaced by a new file is linked again rather than written through the old link.
+        replacement = source.with_name("replacement")
+        replacement.write_bytes(b"changed")
+        os.replace(replacement, source)
+        export_view(dataset_path, tmp_path, sync=True)
+        assert os.path.samefile(source, target)
+        assert target.read_bytes() == b"changed"
+
+    def test_copy_export_is_not_linked(self, dataset_path, tmp_path):
+        dataset = Dataset(dataset_path)
+        dataset.create_exporter("BIDS").execute_export(tmp_path, "copy", {name: name for name in dataset.subjects})
+        files = modality_files(tmp_path / "copy")
+        assert files
+        assert not any(os.path.samefile(p, dataset_path / p.relative_to(tmp_path / "copy")) for p in files)